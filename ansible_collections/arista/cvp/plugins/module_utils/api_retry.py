@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import os
+import re
+import time
+import random
+import threading
+from collections import Counter
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+try:
+    from requests.exceptions import ConnectTimeout, Timeout
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+    from cvprac.cvp_client_errors import CvpRequestError
+    HAS_CVPRAC = True
+except ImportError:
+    HAS_CVPRAC = False
+    CVPRAC_IMP_ERR = traceback.format_exc()
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.api_retry')
+MODULE_LOGGER.info('Start api_retry module execution')
+
+# Environment variable defining how many times a failed call is sent again, 0 disables retries
+RETRIES_ENV = 'ANSIBLE_CVP_API_RETRIES'
+# Environment variable defining wait time in seconds before first retry
+RETRY_BACKOFF_ENV = 'ANSIBLE_CVP_API_RETRY_BACKOFF'
+API_RETRIES = 3
+RETRY_BACKOFF = 1
+RETRY_BACKOFF_MAX = 30
+# cv_client.api calls without side effect
+SAFE_PREFIXES = ('get_', 'check_', 'filter_', 'search_')
+# cv_client.api calls with side effects giving the same result when sent twice
+IDEMPOTENT_CALLS = ['update_configlet', 'add_note_to_configlet', 'add_note_to_task']
+# Error reasons proving Cloudvision did not process the request (HTTP 429)
+UNSENT_REASONS = ['Too Many Requests']
+# Error reasons of transient failures, request may have been processed (HTTP 502, 503 and 504)
+TRANSIENT_REASONS = ['Bad Gateway', 'Service Unavailable', 'Gateway Timeout']
+# HTTP reason in cvprac error message, followed by response body
+REASON_PATTERN = re.compile(r'Request Error: (.+?) - ')
+
+
+def get_error_reason(error: Exception):
+    """
+    get_error_reason Extract HTTP reason of a cvprac request error
+
+    cvprac reports HTTP errors as CvpRequestError with a message built as
+    "<prefix>: Request Error: <reason> - <response body>". Only the reason is
+    returned so a response body quoting a reason is not taken for a status.
+
+    Parameters
+    ----------
+    error : Exception
+        Error raised by a cv_client.api call
+
+    Returns
+    -------
+    str
+        HTTP reason, None if error is not an HTTP error
+    """
+    if not isinstance(error, CvpRequestError):
+        return None
+    match = REASON_PATTERN.search(str(error))
+    return match.group(1) if match else None
+
+
+def is_idempotent(method: str):
+    """
+    is_idempotent Check if a cv_client.api call can be sent twice safely
+
+    Parameters
+    ----------
+    method : str
+        Name of the cv_client.api method
+
+    Returns
+    -------
+    bool
+        True for read-only and idempotent update calls
+    """
+    return method.startswith(SAFE_PREFIXES) or method in IDEMPOTENT_CALLS
+
+
+def is_retryable(error: Exception, idempotent: bool):
+    """
+    is_retryable Check if a failed call can be sent again
+
+    Calls failing before reaching Cloudvision are always retried. Other
+    transient failures are only retried for idempotent calls as Cloudvision
+    may have processed the request.
+
+    Parameters
+    ----------
+    error : Exception
+        Error raised by the call
+    idempotent : bool
+        True if call can be sent twice safely
+
+    Returns
+    -------
+    bool
+        True if call can be sent again
+    """
+    reason = get_error_reason(error)
+    if isinstance(error, ConnectTimeout) or reason in UNSENT_REASONS:
+        return True
+    if not idempotent:
+        return False
+    # Builtin connection errors are raised for requests errors forwarded by session broker
+    if isinstance(error, (RequestsConnectionError, Timeout, ConnectionError, TimeoutError)):
+        return True
+    return reason in TRANSIENT_REASONS
+
+
+class CvApiRetry():
+    """
+    CvApiRetry Retry transient failures of cv_client.api calls
+
+    Calls are sent again after an exponential backoff with full jitter, so
+    concurrent calls failing together are not sent again at the same time.
+    Number of retries is kept per API method to be reported in module output.
+
+    Example
+    -------
+
+    >>> retry = CvApiRetry(retries=3)
+    >>> retry.attach(client)
+    >>> client.api.get_inventory()
+    >>> retry.summary
+    {'retries': 1, 'calls': {'get_inventory': 1}, 'failed': 0}
+    """
+
+    def __init__(self, retries: int = API_RETRIES, backoff: float = RETRY_BACKOFF,
+                 backoff_max: float = RETRY_BACKOFF_MAX):
+        self.__retries = max(retries, 0)
+        self.__backoff = backoff
+        self.__backoff_max = backoff_max
+        self.__calls = Counter()
+        self.__failed = 0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        from_env Build retry configured with environment variables
+
+        Returns
+        -------
+        CvApiRetry
+            Retry layer, None when ANSIBLE_CVP_API_RETRIES is set to 0
+        """
+        try:
+            retries = int(os.environ.get(RETRIES_ENV, API_RETRIES))
+            backoff = float(os.environ.get(RETRY_BACKOFF_ENV, RETRY_BACKOFF))
+        except ValueError:
+            MODULE_LOGGER.warning('Invalid %s or %s value, use default values',
+                                  RETRIES_ENV, RETRY_BACKOFF_ENV)
+            retries, backoff = API_RETRIES, RETRY_BACKOFF
+        if retries <= 0:
+            return None
+        return cls(retries=retries, backoff=backoff)
+
+    @property
+    def summary(self):
+        """
+        summary Getter for retries summary
+
+        Returns
+        -------
+        dict
+            Total number of retries, retries per API method and number of calls failed after retries
+        """
+        with self.__lock:
+            return {'retries': sum(self.__calls.values()), 'calls': dict(self.__calls),
+                    'failed': self.__failed}
+
+    def call(self, method: str, function, *args, **kwargs):
+        """
+        call Run an API call and retry its transient failures
+
+        Parameters
+        ----------
+        method : str
+            Name of the cv_client.api method
+        function : callable
+            cv_client.api method to call
+
+        Returns
+        -------
+        any
+            Result of the API call
+        """
+        idempotent = is_idempotent(method)
+        attempt = 0
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:
+                if not is_retryable(error, idempotent=idempotent):
+                    raise
+                if attempt >= self.__retries:
+                    with self.__lock:
+                        self.__failed += 1
+                    raise
+                wait = random.uniform(0, min(self.__backoff * (2 ** attempt), self.__backoff_max))
+                MODULE_LOGGER.warning('%s failed with %s, retry %s/%s in %.2f seconds',
+                                      method, str(error), attempt + 1, self.__retries, wait)
+                with self.__lock:
+                    self.__calls[method] += 1
+                time.sleep(wait)
+                attempt += 1
+
+    def attach(self, client):
+        """
+        attach Retry every API call sent with client
+
+        Parameters
+        ----------
+        client : CvpClient
+            Connected client
+        """
+        client.api = CvRetryApi(api=client.api, retry=self)
+
+
+class CvRetryApi():
+    """
+    CvRetryApi Proxy of cv_client.api sending calls through a retry layer
+    """
+
+    def __init__(self, api, retry: CvApiRetry):
+        self.__api = api
+        self.retry = retry
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.__api, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            return self.retry.call(name, attribute, *args, **kwargs)
+        return call
+
+    def __setattr__(self, name: str, value):
+        # Settings such as request_timeout are applied to proxied cv_client.api
+        if name.startswith('_') or name == 'retry':
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.__api, name, value)
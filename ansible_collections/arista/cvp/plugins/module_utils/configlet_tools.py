@@ -27,6 +27,7 @@ import re
 from typing import List
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
@@ -55,6 +56,9 @@ except ImportError:
 MODULE_LOGGER = logging.getLogger('arista.cvp.configlet_tools_v3')
 MODULE_LOGGER.info('Start cv_container_v3 module execution')
 
+# Number of configlets above which configlets are loaded with a single bulk call
+CONFIGLET_BULK_THRESHOLD = 10
+
 
 class ConfigletInput(object):
 
@@ -82,9 +86,11 @@ class ConfigletInput(object):
 
 
 class CvConfigletTools(object):
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, snapshot: CvSnapshot = None, diff_budget: int = None):
         self._cvp_client = cv_connection
         self._ansible = ansible_module
+        self._diff_budget = diff_budget
+        self._snapshot = snapshot if snapshot is not None else CvSnapshot(cv_connection=cv_connection)
         self.WINDOWS_LINE_ENDING = '\r\n'
         self.UNIX_LINE_ENDING = '\n'
 
@@ -108,31 +114,54 @@ class CvConfigletTools(object):
             return content.replace(self.WINDOWS_LINE_ENDING, self.UNIX_LINE_ENDING)
         return None
 
-    def _compare(self, fromText: List[str], toText: List[str], fromName: str = 'CVP', toName: str = 'Ansible', lines: int = 10):
+    def _compare(self, fromText: List[str], toText: List[str], fromName: str = 'CVP', toName: str = 'Ansible', lines: int = 10,
+                 with_diff: bool = True):
         """
         _compare - Compare text string in 'fromText' with 'toText' and produce
             a boolean to indicate if there is a diff between them, along with
             a unified diff list.
             Boolean - False if the sequences are identical, True if they are not.
-            unified diff list
+            unified diff list, only generated when sequences are different and
+            with_diff is True, otherwise an empty list.
             Code	Meaning
             '- '	line unique to sequence 1
             '+ '	line unique to sequence 2
             '  '	line common to both sequences
             '? '	line not present in either input sequence
         """
-        fromlines = self._str_cleanup_line_ending(content=fromText).splitlines(1)
-        tolines = self._str_cleanup_line_ending(content=toText).splitlines(1)
-        diff = list(difflib.unified_diff(
-            fromlines, tolines, fromName, toName, n=lines))
         # Calculate and compare hash values to produce the boolean.
         fromHash = hashlib.sha1(fromText.encode()).hexdigest()
         toHash = hashlib.sha1(toText.encode()).hexdigest()
         if fromHash == toHash:
-            cfglet_changed = False
-        else:
-            cfglet_changed = True
-        return [cfglet_changed, diff]
+            return [False, list()]
+        diff = list()
+        if with_diff:
+            fromlines = self._str_cleanup_line_ending(content=fromText).splitlines(1)
+            tolines = self._str_cleanup_line_ending(content=toText).splitlines(1)
+            diff = list(difflib.unified_diff(
+                fromlines, tolines, fromName, toName, n=lines))
+        return [True, diff]
+
+    def _is_diff_required(self):
+        """
+        _is_diff_required Test if a unified diff must be generated for a changed configlet
+
+        Diff is always generated when Ansible runs in diff mode. Otherwise, it is generated
+        until diff budget is consumed. Diff budget set to None means no limit.
+
+        Returns
+        -------
+        bool
+            True if unified diff must be generated
+        """
+        if self._ansible is not None and getattr(self._ansible, '_diff', False):
+            return True
+        if self._diff_budget is None:
+            return True
+        if self._diff_budget > 0:
+            self._diff_budget -= 1
+            return True
+        return False
 
     def is_present(self, configlet_name: str):
         """
@@ -177,6 +206,39 @@ class CvConfigletTools(object):
             return None
         return data
 
+    def get_configlets_data_cv(self, configlet_names: List[str]):
+        """
+        get_configlets_data_cv Get information for a list of configlets from Cloudvision
+
+        When more than CONFIGLET_BULK_THRESHOLD configlets are requested, all configlets are loaded
+        with a single bulk call and served from snapshot. Otherwise, each configlet is fetched by name.
+
+        Parameters
+        ----------
+        configlet_names : List[str]
+            List of configlet names
+
+        Returns
+        -------
+        dict
+            Configlet information indexed by configlet name. Configlets not present on Cloudvision are not listed.
+        """
+        configlets_data = dict()
+        if len(configlet_names) > CONFIGLET_BULK_THRESHOLD:
+            MODULE_LOGGER.debug('Loading %s configlets from snapshot', str(len(configlet_names)))
+            for configlet_name in configlet_names:
+                data = self._snapshot.get_configlet_by_name(configlet_name=configlet_name)
+                if data is not None:
+                    configlets_data[configlet_name] = data
+            return configlets_data
+        for configlet_name in configlet_names:
+            data = self.get_configlet_data_cv(configlet_name=configlet_name)
+            if data is None:
+                MODULE_LOGGER.debug('Configlet %s not found on Cloudvision', str(configlet_name))
+            else:
+                configlets_data[configlet_name] = data
+        return configlets_data
+
     def apply(self, configlet_list: list, present: bool = True, note: str = 'Managed by Ansible AVD'):
         """
         apply Worker to configure configlets on Cloudvision
@@ -196,31 +258,31 @@ class CvConfigletTools(object):
         to_create = list()
         to_update = list()
         to_delete = list()
-        if present:
-            for configlet in configlet_list:
-                cv_data = self.get_configlet_data_cv(
-                    configlet_name=configlet['name'])
-                if self.is_present(configlet_name=configlet['name']):
-                    configlet['key'] = cv_data['key']
-                    configlet['diff'] = self._compare(
-                        fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible')
-                    configlet['notediff'] = self._compare(
-                        fromText=cv_data['note'], toText=note, fromName='CVP', toName='Ansible')
-                    MODULE_LOGGER.debug("configlet note diff: %s", str(configlet['notediff']))
-                    if (configlet['diff'][0]) is True or (configlet['notediff'][0] is True):
-                        to_update.append(configlet)
-
-                else:
-                    to_create.append(configlet)
-        elif present is False:
-            for configlet in configlet_list:
-                cv_data = self.get_configlet_data_cv(
-                    configlet_name=configlet['name'])
-                if self.is_present(configlet_name=configlet['name']):
-                    configlet['key'] = cv_data['key']
-                    configlet['diff'] = self._compare(
-                        fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible')
-                    to_delete.append(configlet)
+        cv_configlets = self.get_configlets_data_cv(configlet_names=[x['name'] for x in configlet_list])
+        for configlet in configlet_list:
+            cv_data = cv_configlets.get(configlet['name'])
+            if present and cv_data is None:
+                to_create.append(configlet)
+            elif present:
+                configlet['key'] = cv_data['key']
+                configlet['diff'] = self._compare(
+                    fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible', with_diff=False)
+                configlet['notediff'] = self._compare(
+                    fromText=cv_data['note'], toText=note, fromName='CVP', toName='Ansible', with_diff=False)
+                MODULE_LOGGER.debug("configlet note diff: %s", str(configlet['notediff']))
+                if (configlet['diff'][0]) is True or (configlet['notediff'][0] is True):
+                    # Unified diff is only generated for changed configlets
+                    if self._is_diff_required():
+                        configlet['diff'] = self._compare(
+                            fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible')
+                        configlet['notediff'] = self._compare(
+                            fromText=cv_data['note'], toText=note, fromName='CVP', toName='Ansible')
+                    to_update.append(configlet)
+            elif cv_data is not None:
+                configlet['key'] = cv_data['key']
+                configlet['diff'] = self._compare(
+                    fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible', with_diff=False)
+                to_delete.append(configlet)
         ###
         # Structure Ansible Message output
         ###
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import os
+from ansible.module_utils.parsing.convert_bool import boolean
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+try:
+    from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    REQUESTS_IMP_ERR = traceback.format_exc()
+    DEFAULT_POOLSIZE = 10
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.connection_pool')
+MODULE_LOGGER.info('Start connection_pool module execution')
+
+# Environment variables configuring HTTP connection pool, with their type
+POOL_ENV = {
+    'pool_connections': ('ANSIBLE_CVP_POOL_CONNECTIONS', int),
+    'pool_maxsize': ('ANSIBLE_CVP_POOL_MAXSIZE', int),
+    'pool_block': ('ANSIBLE_CVP_POOL_BLOCK', boolean),
+    'keepalive': ('ANSIBLE_CVP_KEEPALIVE', boolean),
+}
+
+
+class CvConnectionPool():
+    """
+    CvConnectionPool HTTP connection pool settings of a CvpClient session
+
+    cvprac creates a new requests session for every login, including logins
+    triggered by an expired session, so settings are applied to the session
+    before each login.
+
+    Example
+    -------
+
+    >>> pool = CvConnectionPool(pool_maxsize=32)
+    >>> client = CvpClient()
+    >>> pool.attach(client)
+    >>> client.connect(nodes=['cvp.lab'], username='ansible', password='ansible')
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOLSIZE, pool_maxsize: int = DEFAULT_POOLSIZE, pool_block: bool = False, keepalive: bool = True):
+        self.pool_connections = max(pool_connections, 1)
+        self.pool_maxsize = max(pool_maxsize, 1)
+        self.pool_block = pool_block
+        self.keepalive = keepalive
+
+    @classmethod
+    def from_env(cls):
+        """
+        from_env Build pool settings configured with environment variables
+
+        Invalid values are ignored with a warning and default value is used.
+
+        Returns
+        -------
+        CvConnectionPool
+            Pool settings, None when no pool environment variable is set
+        """
+        settings = dict()
+        for option, (variable, option_type) in POOL_ENV.items():
+            if os.environ.get(variable) is None:
+                continue
+            try:
+                settings[option] = option_type(os.environ[variable])
+            except (TypeError, ValueError):
+                MODULE_LOGGER.warning('Invalid %s value %s, use default value', variable, os.environ[variable])
+        if not settings:
+            return None
+        return cls(**settings)
+
+    def mount(self, session):
+        """
+        mount Apply pool settings to a requests session
+
+        Parameters
+        ----------
+        session : requests.Session
+            Session used to connect to Cloudvision
+        """
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keepalive:
+            session.headers['Connection'] = 'close'
+        MODULE_LOGGER.debug('HTTP pool configured with %s pools of %s connections, keepalive is %s',
+                            self.pool_connections, self.pool_maxsize, self.keepalive)
+
+    def attach(self, client):
+        """
+        attach Apply pool settings to every session created by a CvpClient
+
+        Parameters
+        ----------
+        client : CvpClient
+            Client not yet connected
+        """
+        login = client._login  # pylint: disable=protected-access
+
+        def pooled_login():
+            if client.session is not None:
+                self.mount(client.session)
+            return login()
+
+        client._login = pooled_login  # pylint: disable=protected-access
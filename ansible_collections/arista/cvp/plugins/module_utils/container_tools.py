@@ -35,6 +35,10 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_CONFIGLETS
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import WorkerError
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
+from ansible_collections.arista.cvp.plugins.module_utils.topology_tools import SortedTopology, CvTopologyStager
+from ansible_collections.arista.cvp.plugins.module_utils.topology_tools import OPERATION_ADD, OPERATION_DELETE
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
     from cvprac.cvp_client_errors import CvpClientError  # noqa # pylint: disable=unused-import
@@ -66,7 +70,7 @@ FIELD_CONFIGLETS = 'configlets'
 FIELD_CONTAINER_ID = 'containerId'
 
 
-class ContainerInput(object):
+class ContainerInput(SortedTopology):
     """
     ContainerInput Object to manage Container Topology in context of arista.cvp collection.
 
@@ -74,9 +78,9 @@ class ContainerInput(object):
     """
 
     def __init__(self, user_topology: dict, container_root_name: str = 'Tenant', schema=schema.SCHEMA_CV_CONTAINER):
+        super(ContainerInput, self).__init__(topology=user_topology, parent_field=FIELD_PARENT_NAME,
+                                             root_name=container_root_name)
         self.__topology = user_topology
-        self.__parent_field: str = FIELD_PARENT_NAME
-        self.__root_name = container_root_name
         self.__schema = schema
         self.__normalize()
 
@@ -125,40 +129,6 @@ class ContainerInput(object):
             return False
         return True
 
-    @property
-    def ordered_list_containers(self):
-        """
-        ordered_list_containers List of container from root to the bottom
-
-        Returns
-        -------
-        list
-            List of containers
-        """
-        result_list = list()
-        MODULE_LOGGER.info("Build list of container to create from %s", str(self.__topology))
-
-        while(len(result_list) < len(self.__topology)):
-            container_added = False
-            for container in self.__topology:
-                if self.__topology[container][self.__parent_field] == self.__root_name and container not in result_list:
-                    container_added = True
-                    result_list.append(container)
-                if (any(element == self.__topology[container][self.__parent_field] for element in result_list)
-                        and container not in result_list):
-                    container_added = True
-                    result_list.append(container)
-            if container_added is False:
-                containerWithoutParent = [item for item in self.__topology.keys() if item not in result_list]
-                MODULE_LOGGER.warning(
-                    'Breaking the while loop as the following containers dont have a parent present in the topology %s',
-                    str(containerWithoutParent))
-                result_list = result_list + containerWithoutParent
-                break
-
-        MODULE_LOGGER.info('List of containers to apply on CV: %s', str(result_list))
-        return result_list
-
     def get_parent(self, container_name: str, parent_key: str = FIELD_PARENT_NAME):
         """
         get_parent Expose name of parent container for the given container
@@ -221,10 +191,26 @@ class CvContainerTools(object):
     CvContainerTools Class to manage container actions for arista.cvp.cv_container module
     """
 
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False, snapshot: CvSnapshot = None,
+                 parallelism: int = 1):
         self.__cvp_client = cv_connection
         self.__ansible = ansible_module
         self.__check_mode = ansible_module.check_mode if ansible_module is not None else check_mode
+        self.__snapshot = snapshot if snapshot is not None else CvSnapshot(cv_connection=cv_connection)
+        self.__topology_stager = CvTopologyStager(cv_connection=cv_connection, snapshot=self.__snapshot,
+                                                  parallelism=parallelism)
+
+    @property
+    def snapshot(self):
+        """
+        snapshot Getter for Cloudvision indexed snapshot used for lookups
+
+        Returns
+        -------
+        CvSnapshot
+            Snapshot instance shared with other tool classes
+        """
+        return self.__snapshot
 
     #############################################
     #   Private functions
@@ -331,7 +317,7 @@ class CvContainerTools(object):
             Configlet information in a filtered maner
         """
         MODULE_LOGGER.info('Getting information for configlet %s', str(configlet_name))
-        data = self.__cvp_client.api.get_configlet_by_name(name=configlet_name)
+        data = self.__snapshot.get_configlet_by_name(configlet_name=configlet_name)
         if data is not None:
             return self.__standard_output(source=data)
         return None
@@ -397,7 +383,11 @@ class CvContainerTools(object):
                     MODULE_LOGGER.error(message)
                     self.__ansible.fail_json(msg=message)
                 else:
-                    if 'data' in resp and resp['data']['status'] == 'success':
+                    if not save_topology:
+                        # Change is staged and committed by a later save-topology
+                        change_response.success = True
+                        change_response.changed = True
+                    elif 'data' in resp and resp['data']['status'] == 'success':
                         # We assume there is a change as API does not provide information
                         # resp = {'data': {'taskIds': [], 'status': 'success'}}
                         change_response.taskIds = resp['data']['taskIds']
@@ -460,7 +450,11 @@ class CvContainerTools(object):
                 MODULE_LOGGER.error(message)
                 self.__ansible.fail_json(msg=message)
             else:
-                if 'data' in resp and resp['data']['status'] == 'success':
+                if not save_topology:
+                    # Change is staged and committed by a later save-topology
+                    change_response.success = True
+                    change_response.changed = True
+                elif 'data' in resp and resp['data']['status'] == 'success':
                     change_response.taskIds = resp['data']['taskIds']
                     # We assume there is a change as API does not provide information
                     # resp = {'data': {'taskIds': [], 'status': 'success'}}
@@ -501,8 +495,7 @@ class CvContainerTools(object):
         dict
             A standard dictionary with Key, Name, ParentID, Number of children and devices.
         """
-        cv_response = self.__cvp_client.api.get_container_by_name(
-            name=container_name)
+        cv_response = self.__snapshot.get_container_by_name(container_name=container_name)
         MODULE_LOGGER.debug('Get container ID (%s) response from cv for container %s', str(cv_response), str(container_name))
         if cv_response is not None and FIELD_KEY in cv_response:
             container_id = cv_response[FIELD_KEY]
@@ -553,17 +546,8 @@ class CvContainerTools(object):
             List of configlets configured on container
         """
         container_id = self.get_container_id(container_name=container_name)
-        configlets_and_mappers = self.__cvp_client.api.get_configlets_and_mappers()
-        configlets_list = configlets_and_mappers['data']['configlets']
-        mappers = configlets_and_mappers['data']['configletMappers']
-        configlets_configured = list()
         MODULE_LOGGER.info('container %s has id %s', str(container_name), str(container_id))
-        for mapper in mappers:
-            if mapper['objectId'] == container_id:
-                MODULE_LOGGER.info(
-                    'Found 1 mappers for container %s : %s', str(container_name), str(mapper))
-                configlets_configured.append(
-                    next((x for x in configlets_list if x['key'] == mapper['configletId'])))
+        configlets_configured = self.__snapshot.get_configlets_by_object_id(object_id=container_id)
         MODULE_LOGGER.debug('List of configlets from CV is: %s', str(
             [x['name'] for x in configlets_configured]))
         return configlets_configured
@@ -586,9 +570,8 @@ class CvContainerTools(object):
         str
             Container ID sent by CV
         """
-        container_info = self.__cvp_client.api.get_container_by_name(
-            name=container_name)
-        if FIELD_KEY in container_info:
+        container_info = self.__snapshot.get_container_by_name(container_name=container_name)
+        if container_info is not None and FIELD_KEY in container_info:
             return container_info[FIELD_KEY]
         return None
 
@@ -641,7 +624,7 @@ class CvContainerTools(object):
             True if container exists, False if not
         """
         try:
-            cv_data = self.__cvp_client.api.get_container_by_name(name=container_name)
+            cv_data = self.__snapshot.get_container_by_name(container_name=container_name)
         except (CvpApiError, CvpClientError) as error:
             message = "Error getting information for container " + \
                 str(container_name) + \
@@ -657,7 +640,7 @@ class CvContainerTools(object):
     #   Public API
     #############################################
 
-    def create_container(self, container: str, parent: str):
+    def create_container(self, container: str, parent: str, stager: CvTopologyStager = None):
         """
         create_container Worker to send container creation API call to CV
 
@@ -676,6 +659,8 @@ class CvContainerTools(object):
             Name of the container to create
         parent : str
             Container name where new container will be created
+        stager : CvTopologyStager, optional
+            Stage creation to save it with its topology level, by default None
 
         Returns
         -------
@@ -685,14 +670,19 @@ class CvContainerTools(object):
         resp = dict()
         change_result = CvApiResult(action_name=container)
         if self.is_container_exists(container_name=parent):
-            parent_id = self.__cvp_client.api.get_container_by_name(name=parent)[
-                FIELD_KEY]
+            parent_id = self.__snapshot.get_container_by_name(container_name=parent)[FIELD_KEY]
             MODULE_LOGGER.debug('Parent container (%s) for container %s exists', str(parent), str(container))
             if self.is_container_exists(container_name=container) is False:
                 if self.__check_mode:
                     change_result.success = True
                     change_result.changed = True
                     change_result.add_entry(container['name'])
+                elif stager is not None:
+                    stager.stage_container(operation=OPERATION_ADD, container_name=container,
+                                           parent_name=parent, parent_key=parent_id)
+                    change_result.success = True
+                    change_result.changed = True
+                    change_result.count += 1
                 else:
                     try:
                         resp = self.__cvp_client.api.add_container(
@@ -701,7 +691,7 @@ class CvContainerTools(object):
                         # Add Ansible error management
                         message = "Error creating container " + str(container) + " on CV. Exception: " + str(e)
                         MODULE_LOGGER.error(message)
-                        self.__ansible.fail_json(msg=message)
+                        raise WorkerError(message)
                     else:
                         if resp['data']['status'] == "success":
                             change_result.taskIds = resp['data']['taskIds']
@@ -712,11 +702,11 @@ class CvContainerTools(object):
             message = "Parent container (" + str(
                 parent) + ") is missing for container " + str(container)
             MODULE_LOGGER.error(message)
-            self.__ansible.fail_json(msg=message)
+            raise WorkerError(message)
         MODULE_LOGGER.info('Container creation result is %s', str(change_result.results))
         return change_result
 
-    def delete_container(self, container: str, parent: str):
+    def delete_container(self, container: str, parent: str, stager: CvTopologyStager = None):
         """
         delete_container Worker to send container deletion API call to CV
 
@@ -735,6 +725,8 @@ class CvContainerTools(object):
             Name of the container to delete
         parent : str
             Container name where container will be deleted
+        stager : CvTopologyStager, optional
+            Stage deletion to save it with its topology level, by default None
 
         Returns
         -------
@@ -747,12 +739,12 @@ class CvContainerTools(object):
             message = "Unable to delete container " + \
                 str(container) + ": container does not exist on CVP"
             MODULE_LOGGER.error(message)
-            self.__ansible.fail_json(msg=message)
+            raise WorkerError(message)
         elif self.is_empty(container_name=container) is False:
             message = "Unable to delete container " + str(container) + ": container not empty - either it has child container(s) or \
                 some device(s) are attached to it on CVP"
             MODULE_LOGGER.error(message)
-            self.__ansible.fail_json(msg=message)
+            raise WorkerError(message)
         else:
             parent_id = self.get_container_id(container_name=parent)
             container_id = self.get_container_id(container_name=container)
@@ -765,6 +757,12 @@ class CvContainerTools(object):
                 change_result.success = True
                 change_result.add_entry(container['name'])
 
+            elif stager is not None:
+                stager.stage_container(operation=OPERATION_DELETE, container_name=container,
+                                       parent_name=parent, parent_key=parent_id, container_key=container_id)
+                change_result.success = True
+                change_result.changed = True
+                change_result.count += 1
             else:
                 try:
                     resp = self.__cvp_client.api.delete_container(
@@ -773,16 +771,17 @@ class CvContainerTools(object):
                     # Add Ansible error management
                     message = "Error deleting container " + str(container) + " on CV. Exception: " + str(e)
                     MODULE_LOGGER.error(message)
-                    self.__ansible.fail_json(msg=message)
+                    raise WorkerError(message)
                 else:
                     if resp['data']['status'] == "success":
                         change_result.taskIds = resp['data']['taskIds']
                         change_result.success = True
                         change_result.changed = True
                         change_result.count += 1
+                        self.__snapshot.remove_container(container_name=container)
         return change_result
 
-    def configlets_attach(self, container: str, configlets: List[str], strict: bool = False):
+    def configlets_attach(self, container: str, configlets: List[str], strict: bool = False, save_topology: bool = True):
         """
         configlets_attach Worker to send configlet attach to container API call
 
@@ -804,6 +803,8 @@ class CvContainerTools(object):
             List of configlets to attach
         strict : bool, optional
             Remove configlet not listed in configlets var -- NOT SUPPORTED -- , by default False
+        save_topology : bool, optional
+            Send a save-topology, by default True
 
         Returns
         -------
@@ -816,9 +817,9 @@ class CvContainerTools(object):
             data = self.__get_configlet_info(configlet_name=configlet)
             if data is not None:
                 attach_configlets.append(data)
-        return self.__configlet_add(container=container_info, configlets=attach_configlets)
+        return self.__configlet_add(container=container_info, configlets=attach_configlets, save_topology=save_topology)
 
-    def configlets_detach(self, container: str, configlets: List[str]):
+    def configlets_detach(self, container: str, configlets: List[str], save_topology: bool = True):
         """
         configlets_attach Worker to send configlet detach from container API call
 
@@ -838,6 +839,8 @@ class CvContainerTools(object):
             Name of the container
         configlets : List[str]
             List of configlets to detach
+        save_topology : bool, optional
+            Send a save-topology, by default True
 
         Returns
         -------
@@ -852,9 +855,21 @@ class CvContainerTools(object):
             if data is not None:
                 detach_configlets.append(data)
         MODULE_LOGGER.info('Sending data to self.__configlet_del: %s', str(detach_configlets))
-        return self.__configlet_del(container=container_info, configlets=detach_configlets)
+        return self.__configlet_del(container=container_info, configlets=detach_configlets, save_topology=save_topology)
 
-    def build_topology(self, user_topology: ContainerInput, present: bool = True, apply_mode: str = 'loose'):
+    def __fail_on_errors(self, errors: list):
+        """
+        __fail_on_errors Report errors raised by container workers from main thread
+
+        Parameters
+        ----------
+        errors : list
+            Error messages of failed workers
+        """
+        if len(errors) > 0:
+            self.__ansible.fail_json(msg='\n'.join(errors))
+
+    def build_topology(self, user_topology: ContainerInput, present: bool = True, apply_mode: str = 'loose', batch_mode: bool = False):
         """
         build_topology Class entry point to build container topology on Cloudvision
 
@@ -872,6 +887,14 @@ class CvContainerTools(object):
             Enable creation or deletion process, by default True
         apply_mode: str, optional
             Define how builder will apply configlets to container: loose (only attach listed configlets) or strict (attach listed configlets, remove others)
+        batch_mode: bool, optional
+            Stage configlets changes for all containers and commit them with a single save-topology, by default False.
+            Only the last changed configlet action reports taskIds. In strict mode, containers with configlets
+            to attach and to detach are not staged and are saved immediately.
+
+        Containers are created level by level from root and deleted level by level from leaves.
+        When parallelism is greater than 1, containers of the same level are staged concurrently
+        and each level is committed with a single save-topology.
 
         Returns
         -------
@@ -887,37 +910,61 @@ class CvContainerTools(object):
         cv_configlets_detach = CvManagerResult(
             builder_name='configlets_detached', default_success=True)
 
+        configlet_actions = list()
+
+        # Containers in the same level are staged concurrently and saved together
+        if self.__topology_stager.parallelism > 1:
+            levels = user_topology.levels_containers
+        else:
+            levels = [[x] for x in user_topology.ordered_list_containers]
+
         # Create containers topology in Cloudvision
         if present is True:
-            for user_container in user_topology.ordered_list_containers:
-                MODULE_LOGGER.info('Start creation process for container %s under %s', str(
-                    user_container), str(user_topology.get_parent(container_name=user_container)))
-                resp = self.create_container(
-                    container=user_container, parent=user_topology.get_parent(container_name=user_container))
-                container_add_manager.add_change(resp)
-
-                if user_topology.has_configlets(container_name=user_container):
-                    resp = self.configlets_attach(
-                        container=user_container, configlets=user_topology.get_configlets(container_name=user_container))
-                    cv_configlets_attach.add_change(resp)
-                    if apply_mode == 'strict':
-                        attached_configlets = self.get_configlets(container_name=user_container)
-                        configlet_to_remove = list()
-                        for attach_configlet in attached_configlets:
-                            if attach_configlet['name'] not in user_topology.get_configlets(container_name=user_container):
-                                configlet_to_remove.append(attach_configlet)
-                        if len(configlet_to_remove) > 0:
-                            resp = self.configlets_detach(container=user_container, configlets=configlet_to_remove)
-                            cv_configlets_detach.add_change(resp)
-
-        # Remove containers topology from Cloudvision
+            for level in levels:
+                MODULE_LOGGER.info('Start creation process for containers %s', str(level))
+                results, errors = self.__topology_stager.run_level(
+                    worker=lambda container, stager: self.create_container(
+                        container=container, parent=user_topology.get_parent(container_name=container), stager=stager),
+                    containers=level)
+                self.__fail_on_errors(errors=errors)
+                for resp in results:
+                    container_add_manager.add_change(resp)
+
+                for user_container in level:
+                    container_actions = list()
+                    if user_topology.has_configlets(container_name=user_container):
+                        container_actions.append((cv_configlets_attach, self.configlets_attach,
+                                                  {'container': user_container,
+                                                   'configlets': user_topology.get_configlets(container_name=user_container)}))
+                        if apply_mode == 'strict':
+                            attached_configlets = self.get_configlets(container_name=user_container)
+                            configlet_to_remove = list()
+                            for attach_configlet in attached_configlets:
+                                if attach_configlet['name'] not in user_topology.get_configlets(container_name=user_container):
+                                    configlet_to_remove.append(attach_configlet)
+                            if len(configlet_to_remove) > 0:
+                                container_actions.append((cv_configlets_detach, self.configlets_detach,
+                                                          {'container': user_container, 'configlets': configlet_to_remove}))
+                    # Attach and detach staged for the same container would override each other
+                    if batch_mode and len(container_actions) < 2:
+                        configlet_actions.extend(container_actions)
+                    else:
+                        self.__fail_on_errors(errors=self.__topology_stager.run_actions(actions=container_actions))
+            # Commit all staged configlets changes with a single save-topology
+            if batch_mode:
+                self.__fail_on_errors(errors=self.__topology_stager.run_actions(actions=configlet_actions, batch_mode=True))
+
+        # Remove containers topology from Cloudvision: leaves first
         else:
-            for user_container in reversed(user_topology.ordered_list_containers):
-                MODULE_LOGGER.info('Start deletion process for container %s under %s', str(
-                    user_container), str(user_topology.get_parent(container_name=user_container)))
-                resp = self.delete_container(
-                    container=user_container, parent=user_topology.get_parent(container_name=user_container))
-                container_delete_manager.add_change(resp)
+            for level in reversed(levels):
+                MODULE_LOGGER.info('Start deletion process for containers %s', str(level))
+                results, errors = self.__topology_stager.run_level(
+                    worker=lambda container, stager: self.delete_container(
+                        container=container, parent=user_topology.get_parent(container_name=container), stager=stager),
+                    containers=list(reversed(level)))
+                self.__fail_on_errors(errors=errors)
+                for resp in results:
+                    container_delete_manager.add_change(resp)
 
         # Create ansible message
         response.add_manager(container_add_manager)
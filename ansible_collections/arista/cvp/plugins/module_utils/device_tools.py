@@ -28,7 +28,8 @@ import logging
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
-from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import CvElement
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import CvElement, parallel_map_until_error, WorkerError
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v3 as schema
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
@@ -177,6 +178,18 @@ class DeviceElement(object):
         """
         return self.__serial
 
+    @serial_number.setter
+    def serial_number(self, serial: str):
+        """
+        serial_number Setter for device serial number
+
+        Parameters
+        ----------
+        serial : str
+            Serial number to configure on device
+        """
+        self.__serial = serial
+
     @property
     def container(self):
         """
@@ -325,12 +338,14 @@ class CvDeviceTools(object):
     CvDeviceTools Object to operate Device operation on Cloudvision
     """
     # Updated as per issue #365 to set default search with hostname field
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, search_by: str = FIELD_HOSTNAME, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, search_by: str = FIELD_HOSTNAME, check_mode: bool = False,
+                 snapshot: CvSnapshot = None, parallelism: int = 1):
         self.__cv_client = cv_connection
         self.__ansible = ansible_module
         self.__search_by = search_by
-        self.__configlets_and_mappers_cache = None
         self.__check_mode = check_mode
+        self.__parallelism = parallelism
+        self.__snapshot = snapshot if snapshot is not None else CvSnapshot(cv_connection=cv_connection)
 
     # ------------------------------------------ #
     # Getters & Setters
@@ -376,10 +391,56 @@ class CvDeviceTools(object):
     def check_mode(self, mode: str):
         self.__check_mode = mode
 
+    @property
+    def snapshot(self):
+        """
+        snapshot Getter for Cloudvision indexed snapshot used for lookups
+
+        Returns
+        -------
+        CvSnapshot
+            Snapshot instance shared with other tool classes
+        """
+        return self.__snapshot
+
+    @property
+    def parallelism(self):
+        """
+        parallelism Getter for number of devices configured concurrently
+
+        Returns
+        -------
+        int
+            Maximum number of concurrent workers
+        """
+        return self.__parallelism
+
+    @parallelism.setter
+    def parallelism(self, workers: int):
+        """
+        parallelism Setter for number of devices configured concurrently
+
+        Parameters
+        ----------
+        workers : int
+            Maximum number of concurrent workers
+        """
+        self.__parallelism = workers
+
     # ------------------------------------------ #
     # Private functions
     # ------------------------------------------ #
 
+    def __preload_snapshot(self):
+        """
+        __preload_snapshot Load inventory and configlets snapshot before running workers
+
+        Snapshot is always loaded, so lookups done by workers use bulk data
+        instead of one API call per device, whatever the parallelism is.
+        """
+        MODULE_LOGGER.debug('Snapshot loaded with %s devices and %s configlets',
+                            str(len(self.__snapshot.devices)), str(len(self.__snapshot.configlets)))
+
     # Updated as per issue #365 to set default search with hostname field
     def __get_device(self, search_value: str, search_by: str = FIELD_HOSTNAME):
         """
@@ -401,14 +462,7 @@ class CvDeviceTools(object):
         """
         cv_data: dict = dict()
         MODULE_LOGGER.debug('Looking for device using %s as search_by', str(search_by))
-        if search_by == FIELD_FQDN:
-            cv_data = self.__cv_client.api.get_device_by_name(fqdn=search_value, search_by_hostname=False)
-        elif search_by == FIELD_HOSTNAME:
-            cv_data = self.__cv_client.api.get_device_by_name(fqdn=search_value, search_by_hostname=True)
-        elif search_by == FIELD_SYSMAC:
-            cv_data = self.__cv_client.api.get_device_by_mac(device_mac=search_value)
-        elif search_by == FIELD_SERIAL:
-            cv_data = self.__cv_client.api.get_device_by_serial(device_serial=search_value)
+        cv_data = self.__snapshot.get_device(search_value=search_value, search_by=search_by)
         MODULE_LOGGER.debug('Got following data for %s using %s: %s', str(search_value), str(search_by), str(cv_data))
         return cv_data
 
@@ -416,7 +470,7 @@ class CvDeviceTools(object):
         """
         __get_configlet_info Provides mechanism to get information about a configlet.
 
-        Extract information from CV configlet mapper and save as a cache in instance.
+        Extract information from CV configlet snapshot.
 
         Parameters
         ----------
@@ -428,18 +482,15 @@ class CvDeviceTools(object):
         dict
             Configlet data
         """
-        if self.__configlets_and_mappers_cache is None:
-            self.__configlets_and_mappers_cache = self.__cv_client.api.get_configlets_and_mappers()
-        for configlet in self.__configlets_and_mappers_cache['data']['configlets']:
-            if configlet_name == configlet['name']:
-                return configlet
-        return None
+        return self.__snapshot.get_configlet_by_name(configlet_name=configlet_name)
 
     def __get_reordered_configlets_list(self, configlet_applied_to_device_list, configlet_playbook_list):
         """
         __get_reordered_configlets_list Provides mechanism to reoder the configlet lists.
 
-        Extract information from CV configlet mapper and save as a cache in instance.
+        Configlets already attached but not listed in playbook are kept first in their current order,
+        followed by configlets listed in playbook in the order defined by user.
+        Configlet data are extracted from snapshot name index.
 
         Parameters
         ----------
@@ -456,22 +507,15 @@ class CvDeviceTools(object):
         for configlet in configlet_playbook_list:
             new_configlet = self.__get_configlet_info(configlet_name=configlet)
             if new_configlet is None:
-                error_message = "The configlet \'%s\' defined to be applied on the device does not exist on CVP.", str(configlet)
+                error_message = "The configlet '{}' defined to be applied on the device does not exist on CVP.".format(configlet)
                 MODULE_LOGGER.error(error_message)
-                self.__ansible.fail_json(msg=error_message)
-
-            # If the configlet is not applied, add it to the new list
-            if configlet not in [x.name for x in configlet_applied_to_device_list]:
-                new_configlets_list.append(new_configlet)
-
-            # If the confilet is already applied, remove it from the main list and add it to the end of the new list
-            else:
-                MODULE_LOGGER.debug("Removing the configlet %s from the current configlet list and adding it to the new list.", str(configlet))
-                for x in configlet_applied_to_device_list:
-                    if x.name == configlet:
-                        configlet_applied_to_device_list.remove(x)
-                        new_configlets_list.append(new_configlet)
-        configlets_attached_get_configlet_info = [self.__get_configlet_info(configlet_name=x.name) for x in configlet_applied_to_device_list]
+                raise WorkerError(error_message)
+            new_configlets_list.append(new_configlet)
+        # Configlets already attached and listed in playbook are moved to their playbook position
+        playbook_configlets = set(configlet_playbook_list)
+        configlets_attached_get_configlet_info = [self.__get_configlet_info(configlet_name=x.name)
+                                                  for x in configlet_applied_to_device_list
+                                                  if x.name not in playbook_configlets]
         # Joining the 2 new list (configlets already present + new configlet in right order)
         return configlets_attached_get_configlet_info + new_configlets_list
 
@@ -581,7 +625,7 @@ class CvDeviceTools(object):
             Data from Cloudvision
         """
         try:
-            resp = self.__cv_client.api.get_container_by_name(name=str(container_name))
+            resp = self.__snapshot.get_container_by_name(container_name=str(container_name))
         except CvpApiError:
             MODULE_LOGGER.debug(
                 'Error getting container ID from Cloudvision')
@@ -604,7 +648,7 @@ class CvDeviceTools(object):
             A dict with key and name
         """
         MODULE_LOGGER.debug("Get container for device %s", str(device_mac))
-        container_id = self.__cv_client.api.get_device_by_mac(device_mac=device_mac)
+        container_id = self.__get_device(search_value=device_mac, search_by=FIELD_SYSMAC)
         if FIELD_PARENT_ID in container_id:
             return {'name': container_id[FIELD_CONTAINER_NAME], 'key': container_id[FIELD_PARENT_ID]}
         else:
@@ -682,6 +726,53 @@ class CvDeviceTools(object):
         MODULE_LOGGER.warning('Update list is: %s', str(user_result))
         return DeviceInventory(data=user_result)
 
+    def resolve_inventory(self, user_inventory: DeviceInventory):
+        """
+        resolve_inventory Resolve all devices of user inventory against Cloudvision in a single pass
+
+        Inventory is loaded once from Cloudvision and every device is searched
+        in the index of the active search_by field. Missing fqdn, systemMacAddress
+        and serialNumber are completed with Cloudvision data.
+
+        Parameters
+        ----------
+        user_inventory : DeviceInventory
+            Inventory provided by user
+
+        Returns
+        -------
+        tuple
+            Updated DeviceInventory and list of devices not present in CVP
+        """
+        device: DeviceElement = None
+        user_result: list = list()
+        device_not_present: list = list()
+        # Preload Cloudvision inventory in a single API call
+        MODULE_LOGGER.info('Resolving %s devices using %s index', str(len(user_inventory.devices)), str(self.__search_by))
+        MODULE_LOGGER.debug('Cloudvision inventory has %s devices', str(len(self.__snapshot.devices)))
+        for device in user_inventory.devices:
+            if self.__search_by == FIELD_SERIAL:
+                lookup = device.serial_number
+            elif self.__search_by == FIELD_SYSMAC:
+                lookup = device.system_mac
+            else:
+                lookup = device.fqdn
+            cv_data = self.__get_device(search_value=lookup, search_by=self.__search_by)
+            if cv_data is None or len(cv_data) == 0:
+                MODULE_LOGGER.error('Device not present in CVP but in the user_inventory: %s', str(lookup))
+                device_not_present.append(lookup)
+                continue
+            if device.fqdn is None or self.__search_by == FIELD_SERIAL:
+                device.fqdn = cv_data[FIELD_FQDN]
+            if device.system_mac is None:
+                device.system_mac = cv_data[FIELD_SYSMAC]
+            if device.serial_number is None and FIELD_SERIAL in cv_data:
+                device.serial_number = cv_data[FIELD_SERIAL]
+            if device.system_mac is not None:
+                user_result.append(device.info)
+        MODULE_LOGGER.debug('Update list is: %s', str(user_result))
+        return DeviceInventory(data=user_result), device_not_present
+
     def check_device_exist(self, user_inventory: DeviceInventory, search_mode: str = FIELD_FQDN):
         """
         check_device_exist Check if the devices specified in the user_inventory exist in CVP.
@@ -759,8 +850,9 @@ class CvDeviceTools(object):
         cv_configlets_attach = CvManagerResult(builder_name='configlets_attached')
         cv_configlets_detach = CvManagerResult(builder_name='configlets_detached')
 
-        # Check if the devices defined exist in CVP
-        list_non_existing_devices = self.check_device_exist(user_inventory=user_inventory, search_mode=search_mode)
+        # Check if the devices defined exist in CVP and collect all missing device systemMacAddress
+        # deploy needs to locate devices by mac-address
+        user_inventory, list_non_existing_devices = self.resolve_inventory(user_inventory=user_inventory)
         if list_non_existing_devices is not None and len(list_non_existing_devices) > 0:
             error_message = 'Error - the following devices do not exist in CVP {0} but are defined in the playbook. \
                 \nMake sure that the devices are provisioned and defined with the full fqdn name \
@@ -768,18 +860,6 @@ class CvDeviceTools(object):
             MODULE_LOGGER.error(error_message)
             self.__ansible.fail_json(msg=error_message)
 
-        # Need to collect all missing device systemMacAddress
-        # deploy needs to locate devices by mac-address
-        if self.__search_by == FIELD_FQDN:
-            user_inventory = self.refresh_systemMacAddress(user_inventory=user_inventory)
-
-        elif self.__search_by == FIELD_HOSTNAME:
-            user_inventory = self.refresh_systemMacAddress(user_inventory=user_inventory)
-
-        elif self.__search_by == FIELD_SERIAL:
-            user_inventory = self.refresh_fqdn(user_inventory=user_inventory)
-            user_inventory = self.refresh_systemMacAddress(user_inventory=user_inventory)
-
         action_result = self.deploy_device(user_inventory=user_inventory)
         if action_result is not None:
             for update in action_result:
@@ -864,11 +944,83 @@ class CvDeviceTools(object):
                                 result_data.changed = True
                                 result_data.success = True
                                 result_data.taskIds = resp['data']['taskIds']
+                                self.__snapshot.set_device_container(system_mac=device.system_mac, container=new_container_info)
 
                     result_data.add_entry('{}-{}'.format(device.fqdn, *device.container))
             results.append(result_data)
         return results
 
+    def __apply_configlets_device(self, device: DeviceElement):
+        """
+        __apply_configlets_device Worker to attach configlets to a single device
+
+        Parameters
+        ----------
+        device : DeviceElement
+            Device to configure on Cloudvision
+
+        Returns
+        -------
+        CvApiResult
+            Result of API calls, None if device has nothing to change
+        """
+        MODULE_LOGGER.debug("Applying configlet for device: %s", str(device.fqdn))
+        result_data = CvApiResult(action_name=device.fqdn + '_configlet_attached')
+        current_container_info = self.get_container_current(device_mac=device.system_mac)
+        if (device.configlets is None or current_container_info['name'] == UNDEFINED_CONTAINER):
+            return None
+        # get configlet information from CV
+        configlets_attached = list()
+        if self.__search_by == FIELD_SERIAL:
+            configlets_attached = self.get_device_configlets(device_lookup=device.serial_number)
+        else:
+            configlets_attached = self.get_device_configlets(device_lookup=device.fqdn)
+        configlets_attached_before_changes = [x.name for x in configlets_attached]
+
+        configlets_reordered_list = self.__get_reordered_configlets_list(configlets_attached, device.configlets)
+
+        # Check if changes have been made
+        MODULE_LOGGER.debug("[%s] - Old configlet list: %s", str(device.fqdn), str(configlets_attached_before_changes))
+        MODULE_LOGGER.debug("[%s] - New configlet list: %s", str(device.fqdn), str([x['name'] for x in configlets_reordered_list]))
+        if str(configlets_attached_before_changes) == str([x['name'] for x in configlets_reordered_list]):
+            MODULE_LOGGER.info("[%s] - There was no changes detected in the configlets list, skipping task creation for the device.", str(device.fqdn))
+            return None
+
+        MODULE_LOGGER.info("Creating task for device [%s] configlet list is: %s", str(device.fqdn), str([x['name'] for x in configlets_reordered_list]))
+        # get device facts from CV
+        device_facts = dict()
+        if self.__search_by in [FIELD_FQDN, FIELD_HOSTNAME]:
+            device_facts = self.__get_device(search_value=device.fqdn, search_by=self.__search_by)
+        elif self.__search_by == FIELD_SERIAL:
+            device_facts = self.__get_device(search_value=device.serial_number, search_by=FIELD_SERIAL)
+        # Attach configlets to device
+        if len(configlets_reordered_list) > 0:
+            try:
+                resp = self.__cv_client.api.apply_configlets_to_device(app_name='CvDeviceTools.apply_configlets',
+                                                                       dev=device_facts,
+                                                                       new_configlets=configlets_reordered_list,
+                                                                       create_task=True,
+                                                                       reorder_configlets=True)
+            except TypeError:
+                error_message = 'The function to reorder the configlet is not present. Please, check your cvprac version (>= 1.0.7 required).'
+                MODULE_LOGGER.error(error_message)
+                raise WorkerError(error_message)
+            except CvpApiError:
+                MODULE_LOGGER.error('Error applying configlets to device')
+                raise WorkerError('Error applying configlets to device')
+            else:
+                if resp['data']['status'] == 'success':
+                    result_data.changed = True
+                    result_data.success = True
+                    result_data.taskIds = resp['data']['taskIds']
+                    result_data.add_entry('{} adds {}'.format(device.fqdn, *device.configlets))
+                    MODULE_LOGGER.debug('CVP response is: %s', str(resp))
+                    MODULE_LOGGER.info('Reponse data is: %s', str(result_data.results))
+            result_data.add_entry('{} to {}'.format(device.fqdn, *device.container))
+        else:
+            result_data.name = result_data.name + ' - nothing attached'
+        return result_data
+
     def apply_configlets(self, user_inventory: DeviceInventory):
         """
         apply_configlets Entry point to a list of configlets to device
@@ -888,115 +1040,96 @@ class CvDeviceTools(object):
         """
         results = list()
         MODULE_LOGGER.debug('Apply configlets to following inventory: %s', str([x.info for x in user_inventory.devices]))
-        for device in user_inventory.devices:
-            MODULE_LOGGER.debug("Applying configlet for device: %s", str(device.fqdn))
-            result_data = CvApiResult(action_name=device.fqdn + '_configlet_attached')
-            current_container_info = self.get_container_current(device_mac=device.system_mac)
-            if (device.configlets is None or current_container_info['name'] == UNDEFINED_CONTAINER):
-                continue
-            # get configlet information from CV
-            configlets_attached = list()
-            if self.__search_by == FIELD_SERIAL:
-                configlets_attached = self.get_device_configlets(device_lookup=device.serial_number)
-            else:
-                configlets_attached = self.get_device_configlets(device_lookup=device.fqdn)
-            configlets_attached_before_changes = [x.name for x in configlets_attached]
+        # Load snapshot before starting workers
+        self.__preload_snapshot()
+        workers_results, errors = parallel_map_until_error(function=self.__apply_configlets_device,
+                                                           items=user_inventory.devices,
+                                                           max_workers=self.__parallelism)
+        if len(errors) > 0:
+            self.__ansible.fail_json(msg='\n'.join(errors))
+        for result_data in workers_results:
+            if result_data is not None:
+                results.append(result_data)
+        return results
 
-            configlets_reordered_list = self.__get_reordered_configlets_list(configlets_attached, device.configlets)
+    def __detach_configlets_device(self, device: DeviceElement):
+        """
+        __detach_configlets_device Worker to detach configlets not listed in user inventory from a single device
 
-            # Check if changes have been made
-            MODULE_LOGGER.debug("[%s] - Old configlet list: %s", str(device.fqdn), str(configlets_attached_before_changes))
-            MODULE_LOGGER.debug("[%s] - New configlet list: %s", str(device.fqdn), str([x['name'] for x in configlets_reordered_list]))
-            if str(configlets_attached_before_changes) == str([x['name'] for x in configlets_reordered_list]):
-                MODULE_LOGGER.info("[%s] - There was no changes detected in the configlets list, skipping task creation for the device.", str(device.fqdn))
-                continue
+        Parameters
+        ----------
+        device : DeviceElement
+            Device to configure on Cloudvision
 
-            MODULE_LOGGER.info("Creating task for device [%s] configlet list is: %s", str(device.fqdn), str([x['name'] for x in configlets_reordered_list]))
-            # get device facts from CV
+        Returns
+        -------
+        CvApiResult
+            Result of API calls, None if device has no configlets defined
+        """
+        result_data = CvApiResult(
+            action_name=device.fqdn + '_configlet_removed')
+        # FIXME: Should we ignore devices listed with no configlets ?
+        if device.configlets is not None:
             device_facts = dict()
-            if self.__search_by == FIELD_FQDN:
-                device_facts = self.__cv_client.api.get_device_by_name(
-                    fqdn=device.fqdn, search_by_hostname=False)
-            elif self.__search_by == FIELD_HOSTNAME:
-                device_facts = self.__cv_client.api.get_device_by_name(
-                    fqdn=device.fqdn, search_by_hostname=True)
+            if self.__search_by in [FIELD_FQDN, FIELD_HOSTNAME]:
+                device_facts = self.__get_device(search_value=device.fqdn, search_by=self.__search_by)
             elif self.__search_by == FIELD_SERIAL:
-                    device_facts = self.__cv_client.api.get_device_by_serial(
-                        device_serial=device.serial_number)
-            # Attach configlets to device
-            if len(configlets_reordered_list) > 0:
+                device_facts = self.__get_device(search_value=device.serial_number, search_by=FIELD_SERIAL)
+            configlets_to_remove = list()
+            # get list of configured configlets
+            configlets_attached = self.get_device_configlets(device_lookup=device.info[self.__search_by])
+            # Pour chaque configlet not in the list, add to list of configlets to remove
+            for configlet in configlets_attached:
+                if configlet.name not in device.configlets:
+                    MODULE_LOGGER.info('Configlet %s is added to detach list', str(configlet.name))
+                    result_data.name = result_data.name + ' - ' + configlet.name
+                    configlets_to_remove.append(configlet.data)
+            # Detach configlets to device
+            if len(configlets_to_remove) > 0:
                 try:
-                    resp = self.__cv_client.api.apply_configlets_to_device(app_name='CvDeviceTools.apply_configlets',
-                                                                           dev=device_facts,
-                                                                           new_configlets=configlets_reordered_list,
-                                                                           create_task=True,
-                                                                           reorder_configlets=True)
-                except TypeError:
-                    error_message = 'The function to reorder the configlet is not present. Please, check your cvprac version (>= 1.0.7 required).'
-                    MODULE_LOGGER.error(error_message)
-                    self.__ansible.fail_json(msg=error_message)
-                except CvpApiError:
-                    MODULE_LOGGER.error('Error applying configlets to device')
-                    self.__ansible.fail_json(msg='Error applying configlets to device')
+                    resp = self.__cv_client.api.remove_configlets_from_device(app_name='CvDeviceTools.detach_configlets',
+                                                                              dev=device_facts,
+                                                                              del_configlets=configlets_to_remove,
+                                                                              create_task=True)
+                except CvpApiError as catch_error:
+                    MODULE_LOGGER.error('Error applying configlets to device: %s', str(catch_error))
+                    raise WorkerError('Error detaching configlets from device ' + device.fqdn + ': ' + str(catch_error))
                 else:
                     if resp['data']['status'] == 'success':
                         result_data.changed = True
                         result_data.success = True
                         result_data.taskIds = resp['data']['taskIds']
-                        result_data.add_entry('{} adds {}'.format(device.fqdn, *device.configlets))
-                        MODULE_LOGGER.debug('CVP response is: %s', str(resp))
-                        MODULE_LOGGER.info('Reponse data is: %s', str(result_data.results))
-                result_data.add_entry('{} to {}'.format(device.fqdn, *device.container))
+                        result_data.add_entry('{} removes {}'.format(
+                            device.fqdn, *device.configlets))
             else:
-                result_data.name = result_data.name + ' - nothing attached'
-            results.append(result_data)
-        return results
+                result_data.name = result_data.name + ' - nothing detached'
+            return result_data
+        return None
 
     def detach_configlets(self, user_inventory: DeviceInventory):
+        """
+        detach_configlets Entry point to detach configlets not listed in user inventory from devices
+
+        Parameters
+        ----------
+        user_inventory : DeviceInventory
+            Ansible inventory to configure on Cloudvision
+
+        Returns
+        -------
+        list
+            List of CvApiResult for all API calls
+        """
         results = list()
-        for device in user_inventory.devices:
-            result_data = CvApiResult(
-                action_name=device.fqdn + '_configlet_removed')
-            # FIXME: Should we ignore devices listed with no configlets ?
-            if device.configlets is not None:
-                device_facts = dict()
-                if self.__search_by == FIELD_FQDN:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn, search_by_hostname=False)
-                elif self.__search_by == FIELD_HOSTNAME:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn, search_by_hostname=True)
-                elif self.__search_by == FIELD_SERIAL:
-                    device_facts = self.__cv_client.api.get_device_by_serial(
-                        device_serial=device.serial_number)
-                configlets_to_remove = list()
-                # get list of configured configlets
-                configlets_attached = self.get_device_configlets(device_lookup=device.info[self.__search_by])
-                # Pour chaque configlet not in the list, add to list of configlets to remove
-                for configlet in configlets_attached:
-                    if configlet.name not in device.configlets:
-                        MODULE_LOGGER.info('Configlet %s is added to detach list', str(configlet.name))
-                        result_data.name = result_data.name + ' - ' + configlet.name
-                        configlets_to_remove.append(configlet.data)
-                # Detach configlets to device
-                if len(configlets_to_remove) > 0:
-                    try:
-                        resp = self.__cv_client.api.remove_configlets_from_device(app_name='CvDeviceTools.detach_configlets',
-                                                                                  dev=device_facts,
-                                                                                  del_configlets=configlets_to_remove,
-                                                                                  create_task=True)
-                    except CvpApiError as catch_error:
-                        MODULE_LOGGER.error('Error applying configlets to device: %s', str(catch_error))
-                        self.__ansible.fail_json(msg='Error detaching configlets from device ' + device.fqdn + ': ' + catch_error)
-                    else:
-                        if resp['data']['status'] == 'success':
-                            result_data.changed = True
-                            result_data.success = True
-                            result_data.taskIds = resp['data']['taskIds']
-                            result_data.add_entry('{} removes {}'.format(
-                                device.fqdn, *device.configlets))
-                else:
-                    result_data.name = result_data.name + ' - nothing detached'
+        # Load snapshot before starting workers
+        self.__preload_snapshot()
+        workers_results, errors = parallel_map_until_error(function=self.__detach_configlets_device,
+                                                           items=user_inventory.devices,
+                                                           max_workers=self.__parallelism)
+        if len(errors) > 0:
+            self.__ansible.fail_json(msg='\n'.join(errors))
+        for result_data in workers_results:
+            if result_data is not None:
                 results.append(result_data)
         return results
 
@@ -1015,12 +1148,8 @@ class CvDeviceTools(object):
                         self.__get_configlet_info(configlet_name=configlet))
                 # get device facts from CV
                 device_facts = dict()
-                if self.__search_by == FIELD_FQDN:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn, search_by_hostname=False)
-                elif self.__search_by == FIELD_HOSTNAME:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn, search_by_hostname=True)
+                if self.__search_by in [FIELD_FQDN, FIELD_HOSTNAME]:
+                    device_facts = self.__get_device(search_value=device.fqdn, search_by=self.__search_by)
                 # Attach configlets to device
                 try:
                     resp = self.__cv_client.api.remove_configlets_from_device(app_name='CvDeviceTools.remove_configlets',
@@ -1109,6 +1238,7 @@ class CvDeviceTools(object):
                                 result_data.changed = True
                                 result_data.success = True
                                 result_data.taskIds = resp['data']['taskIds']
+                                self.__snapshot.set_device_container(system_mac=device.system_mac, container=target_container_info)
 
                     result_data.add_entry('{1} deployed to {2}'.format(
                         device.info[self.__search_by], device.container))
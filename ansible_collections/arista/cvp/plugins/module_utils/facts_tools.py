@@ -0,0 +1,883 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import os
+import re
+import json
+import gzip
+import hashlib
+import tempfile
+from contextlib import contextmanager
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
+try:
+    from cvprac.cvp_client_errors import CvpApiError, CvpRequestError  # noqa # pylint: disable=unused-import
+    HAS_CVPRAC = True
+except ImportError:
+    HAS_CVPRAC = False
+    CVPRAC_IMP_ERR = traceback.format_exc()
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.facts_tools')
+MODULE_LOGGER.info('Start facts_tools module execution')
+
+# Version of the cache file structure, cache is dropped when it changes
+FACTS_CACHE_VERSION = 2
+# Fields added by facts_devices to inventory data
+DEVICE_FACTS_FIELDS = ['name', 'config', 'parentContainerName', 'deviceSpecificConfiglets', 'imageBundle', 'parentContainerId']
+# Fields collected per device with dedicated API calls
+DEVICE_DETAILS_FIELDS = ['config', 'deviceSpecificConfiglets', 'imageBundle']
+# Fields reused from cache when device is not changed
+# Designed configuration is not cached: it includes running-config changes made outside of Cloudvision
+DEVICE_CACHED_FIELDS = ['deviceSpecificConfiglets', 'imageBundle']
+# Inventory fields changing without any provisioning change
+DEVICE_VOLATILE_FIELDS = ['lastSyncUp', 'memFree', 'memTotal', 'bootupTimeStamp']
+# Fact types supporting projection and filtering, with field used to filter entries by name
+FACTS_NAME_FIELDS = {'devices': 'hostname', 'containers': 'name', 'configlets': 'name', 'tasks': 'workOrderId'}
+
+
+def facts_to_file(facts: dict, path: str):
+    """
+    facts_to_file Stream facts to a local file instead of module output
+
+    Format depends on file extension:
+    - .json: a single JSON document
+    - .jsonl: one {"fact": name, "value": value} line per fact, list facts
+      being written empty and followed by one {"fact": name, "item": entry}
+      line per entry
+    A .gz suffix enables gzip compression (.json.gz or .jsonl.gz).
+
+    File is written with owner only permissions and renamed once complete.
+
+    Parameters
+    ----------
+    facts : dict
+        Facts collected by cv_facts
+    path : str
+        Path of the file to write
+
+    Returns
+    -------
+    dict
+        Number of entries per fact
+    """
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.facts_')
+    os.close(handle)
+    base_path = path[:-3] if path.endswith('.gz') else path
+    try:
+        with (gzip.open(temp_path, 'wt', encoding='utf-8') if path.endswith('.gz') else open(temp_path, 'w', encoding='utf-8')) as facts_file:
+            if base_path.endswith('.jsonl'):
+                for name, value in facts.items():
+                    if isinstance(value, list):
+                        # Empty list first so facts without entries are still defined
+                        facts_file.write(json.dumps({'fact': name, 'value': list()}) + '\n')
+                        for item in value:
+                            facts_file.write(json.dumps({'fact': name, 'item': item}) + '\n')
+                    else:
+                        facts_file.write(json.dumps({'fact': name, 'value': value}) + '\n')
+            else:
+                json.dump(facts, facts_file)
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {name: len(value) if isinstance(value, list) else 1 for name, value in facts.items()}
+
+
+def facts_from_file(path: str):
+    """
+    facts_from_file Read facts written by facts_to_file
+
+    Parameters
+    ----------
+    path : str
+        Path of the facts file (.json, .jsonl, .json.gz or .jsonl.gz)
+
+    Returns
+    -------
+    dict
+        Facts with the same structure as cv_facts ansible_facts
+    """
+    path = os.path.expanduser(path)
+    base_path = path[:-3] if path.endswith('.gz') else path
+    with (gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') else open(path, 'r', encoding='utf-8')) as facts_file:
+        if not base_path.endswith('.jsonl'):
+            return json.load(facts_file)
+        facts = dict()
+        for line in facts_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'item' in record:
+                facts.setdefault(record['fact'], list()).append(record['item'])
+            else:
+                facts[record['fact']] = record['value']
+        return facts
+
+
+def load_cvp_facts(module):
+    """
+    load_cvp_facts Load cvp_facts module option from cvp_facts_file when set
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with cvp_facts and cvp_facts_file options
+    """
+    if module.params.get('cvp_facts_file') is None:
+        return
+    try:
+        module.params['cvp_facts'] = facts_from_file(path=module.params['cvp_facts_file'])
+    except (OSError, ValueError, KeyError) as error:
+        module.fail_json(msg='Cannot read facts from {0}: {1}'.format(module.params['cvp_facts_file'], str(error)))
+
+
+class CvFactsCache():
+    """
+    CvFactsCache Persistent cache of devices facts stored in a local directory
+
+    One JSON file is used per Cloudvision host. Each device entry is stored
+    with a signature built from its inventory fields and the last change date
+    of every configlet applied to it, so cached data is only reused when none
+    of them changed.
+
+    Example
+    -------
+
+    >>> cache = CvFactsCache(cache_dir='~/.cache/arista_cvp', cache_key='cvp.lab')
+    >>> cache.get_device(key='50:8d:00:e3:78:aa', signature='0f2c...')
+    {'deviceSpecificConfiglets': ['LEAF1'], 'imageBundle': ''}
+    """
+
+    def __init__(self, cache_dir: str, cache_key: str):
+        self.__path = os.path.join(os.path.expanduser(cache_dir), re.sub(r'[^A-Za-z0-9_.-]', '_', cache_key) + '.json')
+        self.__devices = None
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def path(self):
+        """
+        path Getter for cache file path
+
+        Returns
+        -------
+        str
+            Path of the cache file
+        """
+        return self.__path
+
+    @property
+    def summary(self):
+        """
+        summary Getter for cache usage summary
+
+        Returns
+        -------
+        dict
+            Number of devices served from cache and refreshed from Cloudvision
+        """
+        return {'path': self.__path, 'devices_cached': self.__hits, 'devices_refreshed': self.__misses}
+
+    def __load(self):
+        """
+        __load Read cache file, an unreadable cache is ignored
+        """
+        if self.__devices is not None:
+            return
+        self.__devices = dict()
+        if not os.path.exists(self.__path):
+            return
+        try:
+            with open(self.__path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+            if data.get('version') == FACTS_CACHE_VERSION:
+                self.__devices = data.get('devices', dict())
+        except (OSError, ValueError, AttributeError) as error:
+            MODULE_LOGGER.warning('Facts cache %s cannot be read and is ignored: %s', self.__path, str(error))
+
+    def get_device(self, key: str, signature: str):
+        """
+        get_device Get cached facts of a device
+
+        Parameters
+        ----------
+        key : str
+            Device key
+        signature : str
+            Current signature of the device
+
+        Returns
+        -------
+        dict
+            Cached device fields, None if device is not cached or changed
+        """
+        self.__load()
+        entry = self.__devices.get(key)
+        if entry is not None and entry.get('signature') == signature:
+            self.__hits += 1
+            return entry['facts']
+        self.__misses += 1
+        return None
+
+    def save(self, devices: dict):
+        """
+        save Replace cache content with devices facts
+
+        File is written with owner only permissions and renamed, so a
+        concurrent run never reads a partial file.
+
+        Parameters
+        ----------
+        devices : dict
+            Devices as {key: {'signature': str, 'facts': dict}}
+        """
+        self.__devices = devices
+        directory = os.path.dirname(self.__path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.facts_')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as cache_file:
+                json.dump({'version': FACTS_CACHE_VERSION, 'devices': devices}, cache_file)
+            os.replace(temp_path, self.__path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class CvFactsTools():
+    """
+    CvFactsTools Class to collect facts from Cloudvision
+
+    Objects shared by all entries (inventory, containers) are loaded once with
+    bulk API calls. Remaining per-object data is fetched by a bounded pool of
+    workers, each object being abandoned if it takes more than timeout seconds.
+
+    Example
+    -------
+
+    Output can be limited to a set of fields and to entries with a name
+    matching regular expressions. Data only used by excluded fields or
+    entries is not requested from Cloudvision.
+
+    Example
+    -------
+
+    >>> facts_tools = CvFactsTools(cv_connection=cv_client, parallelism=10, timeout=30)
+    >>> devices = facts_tools.facts_devices(gather_config=False)
+    >>> facts_tools.timed_out
+    []
+    >>> facts_tools = CvFactsTools(cv_connection=cv_client, fields={'devices': ['hostname', 'parentContainerName']},
+    ...                            filters={'devices': ['leaf.*']})
+    >>> facts_tools.facts_devices()
+    [{'hostname': 'leaf1', 'parentContainerName': 'LEAFS'}]
+    """
+
+    def __init__(self, cv_connection, parallelism: int = 1, timeout: float = None, snapshot: CvSnapshot = None,
+                 cache: CvFactsCache = None, fields: dict = None, exclude_fields: dict = None, filters: dict = None,
+                 config_dir: str = None, config_compress: bool = False):
+        self.__cv_client = cv_connection
+        self.__parallelism = parallelism
+        self.__timeout = timeout if timeout else None
+        self.__snapshot = snapshot if snapshot is not None else CvSnapshot(cv_connection=cv_connection)
+        self.__cache = cache
+        self.__fields = fields if fields is not None else dict()
+        self.__exclude_fields = exclude_fields if exclude_fields is not None else dict()
+        self.__filters = {fact: [re.compile(pattern) for pattern in patterns]
+                          for fact, patterns in (filters if filters is not None else dict()).items()}
+        self.__config_dir = os.path.expanduser(config_dir) if config_dir is not None else None
+        self.__config_compress = config_compress
+        self.__timed_out = list()
+        self.__config_timed_out = list()
+        self.__image_bundles = None
+
+    # ------------------------------------------ #
+    # Getters & Setters
+    # ------------------------------------------ #
+
+    @property
+    def timed_out(self):
+        """
+        timed_out Getter for objects abandoned after timeout
+
+        Returns
+        -------
+        list
+            List of object names
+        """
+        return self.__timed_out
+
+    @property
+    def config_timed_out(self):
+        """
+        config_timed_out Getter for devices with configuration not saved before timeout
+
+        Returns
+        -------
+        list
+            List of device hostnames
+        """
+        return self.__config_timed_out
+
+    # ------------------------------------------ #
+    # Private functions
+    # ------------------------------------------ #
+
+    def __get_container_name(self, container_key: str):
+        """
+        __get_container_name Get name of a container using containers index
+
+        Parameters
+        ----------
+        container_key : str
+            Key of the container
+
+        Returns
+        -------
+        str
+            Name of the container
+        """
+        container = self.__snapshot.get_container_by_key(container_key=container_key)
+        if container is None:
+            MODULE_LOGGER.warning('Container %s not found in containers list, using API', str(container_key))
+            container = self.__cv_client.api.get_container_by_id(container_key)
+        return container['name']
+
+    def __device_details(self, device: dict, details: list):
+        """
+        __device_details Worker to collect device specific data
+
+        Device data is only read, collected fields are merged by main thread
+        so a worker abandoned after timeout never changes facts.
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision inventory
+        details : list
+            Fields to collect: config, deviceSpecificConfiglets and/or imageBundle
+
+        Returns
+        -------
+        dict
+            Collected configuration, configlets and image bundle
+        """
+        MODULE_LOGGER.info('  -> Working on %s', device['hostname'])
+        facts = dict()
+        # Add designed config for device
+        if 'config' in details and device['streamingStatus'] == "active":
+            facts['config'] = self.__cv_client.api.get_device_configuration(device['key'])
+
+        # Add Device Specific Configlets
+        if 'deviceSpecificConfiglets' in details:
+            configlets = self.__cv_client.api.get_configlets_by_device_id(device['key'])
+            facts['deviceSpecificConfiglets'] = []
+            for configlet in configlets:
+                if int(configlet['containerCount']) == 0:
+                    facts['deviceSpecificConfiglets'].append(configlet['name'])
+
+        # Add ImageBundle Info
+        if 'imageBundle' in details:
+            facts['imageBundle'] = ""
+            deviceInfo = self.__cv_client.api.get_device_image_info(device['key'])  # get_device_image_info() from cvprac
+            if "imageBundleMapper" in deviceInfo:
+                # There should only be one ImageBudle but its id is not decernable
+                # If the Image is applied directly to the device its type will be 'netelement'
+                if len(list(deviceInfo['imageBundleMapper'].values())) > 0:
+                    if list(deviceInfo['imageBundleMapper'].values())[0]['type'] == 'netelement':
+                        facts['imageBundle'] = deviceInfo['bundleName']
+        return facts
+
+    @contextmanager
+    def __request_timeout(self):
+        """
+        __request_timeout Limit HTTP requests sent by per-device workers to the device timeout
+
+        parallel_map timeout only stops waiting for a worker, request_timeout
+        of cv_client.api makes the HTTP layer stop the request itself.
+        """
+        api = self.__cv_client.api
+        request_timeout = getattr(api, 'request_timeout', None)
+        if self.__timeout is None or not isinstance(request_timeout, (int, float)) or request_timeout <= self.__timeout:
+            yield
+            return
+        api.request_timeout = self.__timeout
+        try:
+            yield
+        finally:
+            api.request_timeout = request_timeout
+
+    def __device_timeout(self, device: dict):
+        """
+        __device_timeout Register a device abandoned after timeout
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision inventory
+
+        Returns
+        -------
+        None
+            Device is removed from facts
+        """
+        MODULE_LOGGER.error('    ! Device %s not collected in %s seconds ... skipped', device['hostname'], str(self.__timeout))
+        self.__timed_out.append(device['hostname'])
+        return None
+
+    def __save_device_config(self, device: dict):
+        """
+        __save_device_config Worker to write designed configuration of a device to its own file
+
+        Configuration is written to a temporary file with owner only permissions
+        renamed once complete, only file path is kept in device facts.
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision inventory
+
+        Returns
+        -------
+        str
+            Path of the configuration file
+        """
+        config = self.__cv_client.api.get_device_configuration(device['key'])
+        path = os.path.join(self.__config_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', device['hostname']) + '.cfg')
+        if self.__config_compress:
+            path += '.gz'
+        handle, temp_path = tempfile.mkstemp(dir=self.__config_dir, prefix='.config_')
+        os.close(handle)
+        try:
+            with (gzip.open(temp_path, 'wt', encoding='utf-8') if self.__config_compress else open(temp_path, 'w', encoding='utf-8')) as config_file:
+                config_file.write(config)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return path
+
+    def __config_timeout(self, device: dict):
+        """
+        __config_timeout Register a device with configuration not saved before timeout
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision inventory
+
+        Returns
+        -------
+        None
+            Device facts are kept without configFile
+        """
+        MODULE_LOGGER.error('    ! Configuration of %s not saved in %s seconds ... skipped', device['hostname'], str(self.__timeout))
+        self.__config_timed_out.append(device['hostname'])
+        return None
+
+    def __save_configs(self, devices: list):
+        """
+        __save_configs Collect designed configuration of devices and stream each one to a file
+
+        Parameters
+        ----------
+        devices : list
+            List of devices data
+        """
+        os.makedirs(self.__config_dir, mode=0o700, exist_ok=True)
+        streaming = [device for device in devices if device['streamingStatus'] == "active"]
+        MODULE_LOGGER.info('Saving configuration of %s devices in %s', str(len(streaming)), self.__config_dir)
+        with self.__request_timeout():
+            paths = parallel_map(function=self.__save_device_config,
+                                 items=streaming,
+                                 max_workers=self.__parallelism,
+                                 timeout=self.__timeout,
+                                 on_timeout=self.__config_timeout)
+        for device, path in zip(streaming, paths):
+            if path is not None:
+                device['configFile'] = path
+
+    @staticmethod
+    def __index_hostnames(inventory: list):
+        """
+        __index_hostnames Build a System MAC address to hostname index
+
+        Parameters
+        ----------
+        inventory : list
+            List of devices from Cloudvision or from devices facts
+
+        Returns
+        -------
+        dict
+            Hostnames indexed by System MAC address
+        """
+        hostnames = dict()
+        for device in inventory:
+            hostname = device.get('name', device.get('hostname'))
+            if 'systemMacAddress' in device and hostname is not None:
+                # Keep first device like tools_inventory.find_hostname_by_mac
+                hostnames.setdefault(device['systemMacAddress'], hostname)
+        return hostnames
+
+    @staticmethod
+    def __index_container_names(containers: list):
+        """
+        __index_container_names Build a container ID to container name index
+
+        Parameters
+        ----------
+        containers : list
+            List of containers from Cloudvision or from containers facts
+
+        Returns
+        -------
+        dict
+            Container names indexed by container ID
+        """
+        names = dict()
+        for container in containers:
+            key = container.get('Key', container.get('key'))
+            if key is not None:
+                names.setdefault(key, container.get('Name', container.get('name')))
+        return names
+
+    def __get_image_bundles(self):
+        """
+        __get_image_bundles Get list of image bundles with a single call
+
+        Returns
+        -------
+        list
+            List of image bundles, None if not available
+        """
+        if self.__image_bundles is None:
+            try:
+                self.__image_bundles = self.__cv_client.api.get_image_bundles()['data']
+            except (CvpApiError, CvpRequestError, KeyError, TypeError):
+                MODULE_LOGGER.warning('Image bundles list not available')
+                self.__image_bundles = list()
+                return None
+        return self.__image_bundles
+
+    def __containers_with_image(self):
+        """
+        __containers_with_image Check with a single call if image bundles are applied to containers
+
+        Returns
+        -------
+        bool
+            False if no image bundle is applied to any container, True otherwise or if not known
+        """
+        bundles = self.__get_image_bundles()
+        if bundles is None:
+            MODULE_LOGGER.warning('Image bundles list not available, using per container calls')
+            return True
+        try:
+            return sum(int(bundle.get('appliedContainersCount', 1)) for bundle in bundles) > 0
+        except (TypeError, ValueError, AttributeError):
+            return True
+
+    def __device_signature(self, device: dict, details: list):
+        """
+        __device_signature Build a signature of everything device facts depend on
+
+        Signature covers inventory fields (except volatile ones), configlets
+        applied to device and to its parent containers with their last change
+        date and number of containers, and image bundles assignment counters.
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision inventory
+        details : list
+            Fields collected for the device
+
+        Returns
+        -------
+        str
+            Signature of the device
+        """
+        inventory = {field: value for field, value in device.items()
+                     if field not in DEVICE_FACTS_FIELDS and field not in DEVICE_VOLATILE_FIELDS}
+        object_ids = [device['key']]
+        container = self.__snapshot.get_container_by_key(container_key=device.get('parentContainerKey'))
+        while container is not None and container['key'] not in object_ids:
+            object_ids.append(container['key'])
+            container = self.__snapshot.get_container_by_name(container_name=container['parentName']) if container.get('parentName') else None
+        # Device specific configlets depend on the number of containers a configlet is applied to
+        configlets = [[configlet['key'], configlet.get('dateTimeInLongFormat'), configlet.get('containerCount')]
+                      for object_id in object_ids
+                      for configlet in self.__snapshot.get_configlets_by_object_id(object_id=object_id)]
+        bundles = [[bundle.get('name'), bundle.get('appliedDevicesCount'), bundle.get('appliedContainersCount')]
+                   for bundle in (self.__get_image_bundles() or list())]
+        data = json.dumps([inventory, configlets, bundles, sorted(details)], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def __get_container_image(self, container: dict):
+        """
+        __get_container_image Worker to get name of image bundle applied to a container
+
+        Parameters
+        ----------
+        container : dict
+            Container data from Cloudvision
+
+        Returns
+        -------
+        str
+            Name of the image bundle, empty string if none
+        """
+        response = self.__cv_client.api.get_image_bundle_by_container_id(container['key'])
+        if response is not None and len(response.get('imageBundleList', list())) > 0:
+            return response['imageBundleList'][0]['name']
+        return ""
+
+    def __is_wanted(self, fact: str, field: str):
+        """
+        __is_wanted Check if a field is part of facts output
+
+        Parameters
+        ----------
+        fact : str
+            Fact type: devices, containers, configlets or tasks
+        field : str
+            Name of the field
+
+        Returns
+        -------
+        bool
+            True if field is not removed by fields/exclude_fields
+        """
+        if fact in self.__fields and field not in self.__fields[fact]:
+            return False
+        return field not in self.__exclude_fields.get(fact, list())
+
+    # ------------------------------------------ #
+    # Public functions
+    # ------------------------------------------ #
+
+    def is_selected(self, fact: str, entry: dict):
+        """
+        is_selected Check if an entry name matches filters of its fact type
+
+        Parameters
+        ----------
+        fact : str
+            Fact type: devices, containers, configlets or tasks
+        entry : dict
+            Entry data from Cloudvision
+
+        Returns
+        -------
+        bool
+            True if there is no filter or if one of the filters matches the whole name
+        """
+        if fact not in self.__filters:
+            return True
+        name = str(entry.get(FACTS_NAME_FIELDS[fact]))
+        return any(pattern.fullmatch(name) for pattern in self.__filters[fact])
+
+    def project(self, fact: str, entries: list):
+        """
+        project Apply fields and exclude_fields to a list of entries
+
+        Parameters
+        ----------
+        fact : str
+            Fact type: devices, containers, configlets or tasks
+        entries : list
+            List of entries data
+
+        Returns
+        -------
+        list
+            List of entries with requested fields only
+        """
+        if fact not in self.__fields and fact not in self.__exclude_fields:
+            return entries
+        return [{field: value for field, value in entry.items() if self.__is_wanted(fact=fact, field=field)} for entry in entries]
+
+    def facts_devices(self, gather_config: bool = False):
+        """
+        facts_devices Collect facts of all devices
+
+        Parameters
+        ----------
+        gather_config : bool, optional
+            Collect designed configuration of devices, by default False
+
+        Returns
+        -------
+        list
+            List of devices facts
+        """
+        devices = list()
+        for device in self.__snapshot.devices:
+            if 'systemMacAddress' in device and len(device['systemMacAddress']) > 0:
+                if self.is_selected(fact='devices', entry=device):
+                    # Facts fields are added to a copy, snapshot inventory is left unchanged
+                    devices.append(dict(device))
+            else:
+                MODULE_LOGGER.error('    ! Device is on Cloudvision but System Mac Address is missing ... skipped')
+        # Only request data for fields part of facts output
+        # Configuration is saved to files instead of facts when config_dir is set
+        details = [field for field in DEVICE_DETAILS_FIELDS
+                   if self.__is_wanted(fact='devices', field=field) and (field != 'config' or (gather_config and self.__config_dir is None))]
+        cached_details = [field for field in details if field in DEVICE_CACHED_FIELDS]
+        for device in devices:
+            device['name'] = device['hostname']
+            device['parentContainerName'] = self.__get_container_name(container_key=device['parentContainerKey'])
+        signatures = dict()
+        # Devices to collect, with fields to collect for each one
+        to_refresh = list()
+        if len(details) == 0:
+            MODULE_LOGGER.info('No device specific data requested')
+        elif self.__cache is not None and len(cached_details) > 0:
+            for device in devices:
+                signatures[device['key']] = self.__device_signature(device=device, details=cached_details)
+                cached = self.__cache.get_device(key=device['key'], signature=signatures[device['key']])
+                if cached is not None:
+                    device.update(cached)
+                    fields = [field for field in details if field not in cached_details]
+                else:
+                    fields = details
+                if len(fields) > 0:
+                    to_refresh.append((device, fields))
+        else:
+            to_refresh = [(device, details) for device in devices]
+        MODULE_LOGGER.info('Collecting details for %s devices out of %s', str(len(to_refresh)), str(len(devices)))
+        with self.__request_timeout():
+            collected = parallel_map(function=lambda item: self.__device_details(device=item[0], details=item[1]),
+                                     items=to_refresh,
+                                     max_workers=self.__parallelism,
+                                     timeout=self.__timeout,
+                                     on_timeout=lambda item: self.__device_timeout(device=item[0]))
+        for (device, _), facts in zip(to_refresh, collected):
+            if facts is not None:
+                device.update(facts)
+        results = [device for device in devices if device['hostname'] not in self.__timed_out]
+        if gather_config and self.__config_dir is not None and self.__is_wanted(fact='devices', field='configFile'):
+            self.__save_configs(devices=results)
+        if self.__cache is not None and len(cached_details) > 0:
+            self.__cache.save(devices={device['key']: {'signature': signatures[device['key']],
+                                                       'facts': {field: device[field] for field in cached_details if field in device}}
+                                       for device in results})
+        return self.project(fact='devices', entries=results)
+
+    def facts_configlets(self, inventory: list = None, containers: list = None):
+        """
+        facts_configlets Collect facts of all configlets
+
+        Mappers are grouped by configlet and device hostnames and container
+        names are resolved with dictionaries, so processing time is linear
+        in the number of configlets and mappers.
+
+        Parameters
+        ----------
+        inventory : list, optional
+            Devices to resolve device names, by default None (Cloudvision inventory)
+        containers : list, optional
+            Containers to resolve container names, by default None (Cloudvision containers)
+
+        Returns
+        -------
+        list
+            List of configlets facts
+        """
+        configlets = list()
+        with_devices = self.__is_wanted(fact='configlets', field='devices')
+        with_containers = self.__is_wanted(fact='configlets', field='containers')
+        hostnames = dict()
+        container_names = dict()
+        if inventory is None and with_devices:
+            MODULE_LOGGER.info('Using Cloudvision inventory to resolve device names')
+            inventory = self.__snapshot.devices
+        if containers is None and with_containers:
+            MODULE_LOGGER.info('Using Cloudvision containers to resolve container names')
+            containers = self.__snapshot.containers
+        if with_devices:
+            hostnames = self.__index_hostnames(inventory=inventory)
+        if with_containers:
+            container_names = self.__index_container_names(containers=containers)
+        mappers = dict()
+        for mapper in self.__snapshot.configlet_mappers:
+            mappers.setdefault(mapper['configletId'], list()).append(mapper)
+
+        if len(self.__snapshot.configlets) == 0:
+            MODULE_LOGGER.error('No configlet found on CVP')
+        for configlet in self.__snapshot.configlets:
+            if not self.is_selected(fact='configlets', entry=configlet):
+                continue
+            configlet['devices'] = list()
+            configlet['containers'] = list()
+            for mapper in mappers.get(configlet['key'], list()):
+                if mapper['type'] == 'netelement' and hostnames.get(mapper['objectId']) is not None:
+                    configlet['devices'].append(hostnames[mapper['objectId']])
+                if mapper['type'] == 'container' and container_names.get(mapper['objectId']) is not None:
+                    configlet['containers'].append(container_names[mapper['objectId']])
+            configlets.append(configlet)
+        MODULE_LOGGER.info('All configlets facts collected')
+        return self.project(fact='configlets', entries=configlets)
+
+    def facts_containers(self):
+        """
+        facts_containers Collect facts of all containers
+
+        Devices and configlets are resolved from inventory and configlet
+        mappers loaded once. Image bundles are only requested per container
+        when at least one bundle is applied to a container.
+
+        Returns
+        -------
+        list
+            List of containers facts
+        """
+        devices = dict()
+        if self.__is_wanted(fact='containers', field='devices'):
+            for device in self.__snapshot.devices:
+                devices.setdefault(device.get('parentContainerKey'), list()).append(device['fqdn'])
+        containers = [container for container in self.__snapshot.containers if self.is_selected(fact='containers', entry=container)]
+        if not self.__is_wanted(fact='containers', field='imageBundle'):
+            images = [None] * len(containers)
+        elif self.__containers_with_image():
+            images = parallel_map(function=self.__get_container_image, items=containers, max_workers=self.__parallelism)
+        else:
+            MODULE_LOGGER.info('No image bundle applied to containers')
+            images = [""] * len(containers)
+        for container, image in zip(containers, images):
+            MODULE_LOGGER.debug('  -> Working on %s', container['name'])
+            container['devices'] = devices.get(container['key'], list())
+            container['configlets'] = [configlet['name'] for configlet in self.__snapshot.get_configlets_by_object_id(object_id=container['key'])]
+            container['imageBundle'] = image
+        MODULE_LOGGER.info('All containers facts collected')
+        return self.project(fact='containers', entries=containers)
@@ -21,6 +21,10 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 
 class CvElement(object):
     """
@@ -68,3 +72,133 @@ class CvElement(object):
             A dict with KEY and NAME data
         """
         return self.__cv_data
+
+
+def parallel_map(function, items: list, max_workers: int = 1, timeout: float = None, on_timeout=None):
+    """
+    parallel_map Run a function against a list of items with a bounded thread pool
+
+    Results are returned in the same order as items whatever the completion order is.
+    With max_workers set to 1 and no timeout, items are processed sequentially in current thread.
+    Exceptions raised by function are re-raised when results are collected.
+
+    When timeout is set, an item still running timeout seconds after its worker
+    started is abandoned and its result is replaced by on_timeout(item), or None.
+    Timeout only stops waiting for the worker: a running thread cannot be
+    stopped and keeps running until function returns, so function must bound
+    its own calls (e.g. with an HTTP request timeout) and must not change
+    data shared with caller.
+
+    Example
+    -------
+    >>> parallel_map(function=lambda x: x * 2, items=[1, 2, 3], max_workers=2)
+    [2, 4, 6]
+
+    Parameters
+    ----------
+    function : callable
+        Function to run with each item as only argument
+    items : list
+        List of items to process
+    max_workers : int, optional
+        Maximum number of concurrent workers, by default 1
+    timeout : float, optional
+        Maximum time in seconds to process a single item, by default None (no limit)
+    on_timeout : callable, optional
+        Function called with item to build result of an abandoned item, by default None
+
+    Returns
+    -------
+    list
+        List of function results
+    """
+    if timeout is None or len(items) == 0:
+        if max_workers is None or max_workers <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    started = dict()
+
+    def run(index: int):
+        started[index] = time.monotonic()
+        return function(items[index])
+
+    results = [None] * len(items)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers or 1, len(items))))
+    try:
+        futures = [executor.submit(run, index) for index in range(len(items))]
+        pending = set(range(len(items)))
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[index] + timeout for index in pending if index in started]
+            wait_time = max(0, min(deadlines) - now) if deadlines else timeout
+            wait([futures[index] for index in pending], timeout=wait_time, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for index in sorted(pending):
+                if futures[index].done():
+                    results[index] = futures[index].result()
+                    pending.discard(index)
+                elif index in started and now - started[index] >= timeout:
+                    futures[index].cancel()
+                    results[index] = on_timeout(items[index]) if on_timeout is not None else None
+                    pending.discard(index)
+    finally:
+        # Do not wait for abandoned workers
+        executor.shutdown(wait=False)
+    return results
+
+
+class WorkerError(Exception):
+    """
+    WorkerError Error raised by a worker to be reported from main thread
+
+    AnsibleModule.fail_json must only be called once, from main thread, so
+    workers run by parallel_map raise this exception instead.
+    """
+
+
+def parallel_map_until_error(function, items: list, max_workers: int = 1):
+    """
+    parallel_map_until_error Run parallel_map and stop processing items after a WorkerError
+
+    Items not yet started when a worker raises WorkerError are skipped, so
+    no new change is sent to Cloudvision once an error is known. Workers
+    already running complete their item.
+
+    Example
+    -------
+    >>> results, errors = parallel_map_until_error(function=worker, items=devices, max_workers=4)
+    >>> if errors:
+    ...     module.fail_json(msg='\\n'.join(errors))
+
+    Parameters
+    ----------
+    function : callable
+        Function to run with each item as only argument
+    items : list
+        List of items to process
+    max_workers : int, optional
+        Maximum number of concurrent workers, by default 1
+
+    Returns
+    -------
+    tuple
+        List of function results (None for failed and skipped items) and list of error messages
+    """
+    failed = threading.Event()
+    errors = list()
+    lock = threading.Lock()
+
+    def run(item):
+        if failed.is_set():
+            return None
+        try:
+            return function(item)
+        except WorkerError as error:
+            failed.set()
+            with lock:
+                errors.append(str(error))
+            return None
+
+    return parallel_map(function=run, items=items, max_workers=max_workers), errors
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import logging
+import os
+import time
+import threading
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.api_retry import get_error_reason
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.rate_limiter')
+MODULE_LOGGER.info('Start rate_limiter module execution')
+
+# Environment variable enabling the limiter, value is the maximum number of requests per second
+RATE_LIMIT_ENV = 'ANSIBLE_CVP_RATE_LIMIT'
+# Environment variable defining the number of requests allowed in a burst
+RATE_BURST_ENV = 'ANSIBLE_CVP_RATE_BURST'
+# Error reasons returned by Cloudvision when it throttles requests (HTTP 429 and 503)
+THROTTLE_REASONS = ['Too Many Requests', 'Service Unavailable']
+# Rate is divided by this factor on throttled response
+RATE_DECREASE = 2
+
+
+def is_throttled(error: Exception):
+    """
+    is_throttled Check if an error is a throttling response from Cloudvision
+
+    HTTP reason is read from cvprac error message, response body is ignored.
+
+    Parameters
+    ----------
+    error : Exception
+        Error raised by a cv_client.api call
+
+    Returns
+    -------
+    bool
+        True if Cloudvision answered with 429 or 503
+    """
+    return get_error_reason(error) in THROTTLE_REASONS
+
+
+class CvRateLimiter():
+    """
+    CvRateLimiter Adaptive token bucket limiting requests sent to Cloudvision
+
+    Requests consume a token from a bucket refilled at current rate. Rate is
+    divided on every throttled response and slowly increased back to the
+    configured rate on successful responses (AIMD). Limiter is shared by all
+    threads of a module.
+
+    Limiter never sends a call again: throttled errors are raised to the
+    caller, CvApiRetry decides if the call can be safely retried.
+
+    Example
+    -------
+
+    >>> limiter = CvRateLimiter(rate=20)
+    >>> limiter.attach(client)
+    >>> client.api.get_inventory()
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.__max_rate = float(rate)
+        self.__min_rate = min(1.0, self.__max_rate)
+        self.__rate = self.__max_rate
+        self.__burst = max(int(burst if burst is not None else rate), 1)
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__throttled = 0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        from_env Build limiter configured with environment variables
+
+        Returns
+        -------
+        CvRateLimiter
+            Rate limiter, None when ANSIBLE_CVP_RATE_LIMIT is not set or invalid
+        """
+        try:
+            rate = float(os.environ.get(RATE_LIMIT_ENV, 0))
+            burst = int(os.environ[RATE_BURST_ENV]) if os.environ.get(RATE_BURST_ENV) else None
+        except ValueError:
+            MODULE_LOGGER.warning('Invalid %s or %s value, rate limiter is disabled',
+                                  RATE_LIMIT_ENV, RATE_BURST_ENV)
+            return None
+        if rate <= 0:
+            return None
+        return cls(rate=rate, burst=burst)
+
+    @property
+    def rate(self):
+        """
+        rate Getter for current rate
+
+        Returns
+        -------
+        float
+            Number of requests allowed per second
+        """
+        return self.__rate
+
+    @property
+    def summary(self):
+        """
+        summary Getter for limiter usage summary
+
+        Returns
+        -------
+        dict
+            Configured and current rates and number of throttled responses
+        """
+        return {'rate_limit': self.__max_rate, 'current_rate': round(self.__rate, 2),
+                'throttled': self.__throttled}
+
+    def __refill(self):
+        """
+        __refill Add tokens generated since last update, lock must be held
+        """
+        now = time.monotonic()
+        refill = (now - self.__updated) * self.__rate
+        self.__tokens = min(float(self.__burst), self.__tokens + refill)
+        self.__updated = now
+
+    def acquire(self):
+        """
+        acquire Wait until a request can be sent
+        """
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                wait = (1 - self.__tokens) / self.__rate
+            time.sleep(wait)
+
+    def success(self):
+        """
+        success Increase rate after a successful request
+
+        Rate grows by about one request per second every time a full second
+        worth of requests succeeds.
+        """
+        with self.__lock:
+            if self.__rate < self.__max_rate:
+                self.__rate = min(self.__max_rate, self.__rate + 1 / self.__rate)
+
+    def throttle(self):
+        """
+        throttle Decrease rate after a throttled response
+
+        Bucket is emptied so next requests wait for the reduced rate.
+        """
+        with self.__lock:
+            self.__throttled += 1
+            self.__rate = max(self.__min_rate, self.__rate / RATE_DECREASE)
+            self.__refill()
+            self.__tokens = 0
+        MODULE_LOGGER.warning('Cloudvision throttled request, rate reduced to %.2f requests/s',
+                              self.__rate)
+
+    def call(self, function, *args, **kwargs):
+        """
+        call Run an API call within rate limit
+
+        Parameters
+        ----------
+        function : callable
+            cv_client.api method to call
+
+        Returns
+        -------
+        any
+            Result of the API call
+        """
+        self.acquire()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            if is_throttled(error):
+                self.throttle()
+            raise
+        self.success()
+        return result
+
+    def attach(self, client):
+        """
+        attach Limit every API call sent with client
+
+        Parameters
+        ----------
+        client : CvpClient
+            Connected client
+        """
+        client.api = CvRateLimitedApi(api=client.api, limiter=self)
+
+
+class CvRateLimitedApi():
+    """
+    CvRateLimitedApi Proxy of cv_client.api sending calls through a rate limiter
+    """
+
+    def __init__(self, api, limiter: CvRateLimiter):
+        self.__api = api
+        self.limiter = limiter
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.__api, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            return self.limiter.call(attribute, *args, **kwargs)
+        return call
+
+    def __setattr__(self, name: str, value):
+        # Settings such as request_timeout are applied to proxied cv_client.api
+        if name.startswith('_') or name == 'limiter':
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.__api, name, value)
@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import os
+import time
+import json
+import hmac
+import socket
+import hashlib
+import threading
+import builtins
+import socketserver
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+try:
+    from cvprac import cvp_client_errors
+    from cvprac.cvp_client_errors import CvpApiError, CvpRequestError
+    HAS_CVPRAC = True
+except ImportError:
+    HAS_CVPRAC = False
+    CVPRAC_IMP_ERR = traceback.format_exc()
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.session_broker')
+MODULE_LOGGER.info('Start session_broker module execution')
+
+# Environment variable enabling the broker, value is the broker idle timeout in seconds
+BROKER_ENV = 'ANSIBLE_CVP_SESSION_BROKER'
+# Environment variable to change the directory where broker sockets are created
+BROKER_DIR_ENV = 'ANSIBLE_CVP_SESSION_BROKER_DIR'
+BROKER_DIR = '~/.ansible/cvp_sessions'
+# Method name used to check a broker is alive and serves the expected session
+BROKER_PING = '__ping__'
+# Private cvprac methods used to stage topology changes, served like public API methods
+BROKER_PRIVATE_METHODS = ['_add_temp_action', '_save_topology_v2']
+BROKER_BUFFER = 65536
+# Polling interval of the broker main loop, used to check idle timeout
+BROKER_POLL = 1
+
+
+def broker_idle_timeout():
+    """
+    broker_idle_timeout Read broker activation from environment
+
+    Broker is enabled when ANSIBLE_CVP_SESSION_BROKER is set to a positive
+    number of seconds: broker stops after this time without any request.
+
+    Returns
+    -------
+    int
+        Broker idle timeout in seconds, 0 when broker is disabled
+    """
+    value = os.environ.get(BROKER_ENV, '0')
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        MODULE_LOGGER.warning('Invalid %s value %s, session broker is disabled', BROKER_ENV, value)
+        return 0
+
+
+def broker_dir():
+    """
+    broker_dir Directory where broker sockets are created
+
+    Returns
+    -------
+    str
+        Path of the socket directory
+    """
+    return os.path.expanduser(os.environ.get(BROKER_DIR_ENV, BROKER_DIR))
+
+
+def _raise_error(error: dict):
+    """
+    _raise_error Raise exception reported by broker with its original type
+
+    cvprac and builtin exceptions are raised with the same class, any other
+    exception is raised as a CvpApiError.
+
+    Parameters
+    ----------
+    error : dict
+        Error reported by broker with its type and message
+    """
+    candidates = [builtins]
+    if HAS_CVPRAC:
+        candidates.insert(0, cvp_client_errors)
+    for source in candidates:
+        error_class = getattr(source, error.get('type', ''), None)
+        if isinstance(error_class, type) and issubclass(error_class, Exception):
+            raise error_class(error.get('message'))
+    raise CvpApiError(error.get('message'))
+
+
+class CvBrokerHandler(socketserver.StreamRequestHandler):
+    """
+    CvBrokerHandler Serve a single API call received on broker socket
+
+    Request and response are JSON documents on a single line. A request
+    contains the authentication digest, the name of a cv_client.api method
+    and its arguments.
+    """
+
+    def handle(self):
+        self.server.last_request = time.time()
+        try:
+            request = json.loads(self.rfile.readline(BROKER_BUFFER * 1024).decode('utf-8'))
+            response = self.server.dispatch(request)
+        except ValueError as error:
+            response = {'error': {'type': 'CvpRequestError',
+                                  'message': 'Invalid broker request: {0}'.format(str(error))}}
+        try:
+            data = json.dumps(response)
+        except (TypeError, ValueError) as error:
+            message = 'Broker response cannot be serialized: {0}'.format(str(error))
+            MODULE_LOGGER.error(message)
+            data = json.dumps({'error': {'type': 'CvpApiError', 'message': message}})
+        self.wfile.write(data.encode('utf-8') + b'\n')
+        self.server.last_request = time.time()
+
+
+class CvBrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    CvBrokerServer Unix socket server sharing an authenticated CvpClient
+
+    Only requests providing the digest of the credentials used to build the
+    session are served. cvprac re-authenticates the session by itself when
+    Cloudvision answers with an unauthorized error: as it replaces the shared
+    session without locking, API calls are run one at a time.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, client, digest: str):
+        self.client = client
+        self.digest = digest
+        self.last_request = time.time()
+        self.lock = threading.Lock()
+        socketserver.UnixStreamServer.__init__(self, path, CvBrokerHandler)
+
+    def dispatch(self, request: dict):
+        """
+        dispatch Run API call described in request
+
+        Parameters
+        ----------
+        request : dict
+            Request received from a module
+
+        Returns
+        -------
+        dict
+            Response with either a result or an error
+        """
+        if not hmac.compare_digest(str(request.get('auth', '')), self.digest):
+            return {'error': {'type': 'CvpLoginError',
+                              'message': 'Session broker authentication failed'}}
+        method = str(request.get('method', ''))
+        if method == BROKER_PING:
+            return {'result': {'nodes': self.client.nodes, 'port': self.client.port}}
+        if (method.startswith('_') and method not in BROKER_PRIVATE_METHODS) \
+                or not callable(getattr(self.client.api, method, None)):
+            return {'error': {'type': 'AttributeError',
+                              'message': 'Unsupported API method {0}'.format(method)}}
+        try:
+            with self.lock:
+                result = getattr(self.client.api, method)(*request.get('args', []),
+                                                          **request.get('kwargs', {}))
+            return {'result': result}
+        except Exception as error:  # pylint: disable=broad-except
+            MODULE_LOGGER.debug('Broker call %s failed: %s', method, str(error))
+            return {'error': {'type': type(error).__name__, 'message': str(error)}}
+
+
+class CvBrokerApi():
+    """
+    CvBrokerApi Proxy of cv_client.api forwarding calls to a session broker
+
+    When broker is no longer reachable before a request is sent, calls are
+    sent to a direct connection built by the fallback callable.
+    """
+
+    def __init__(self, broker, fallback=None):
+        self.__broker = broker
+        self.__fallback = fallback
+        self.__direct = None
+        self.__lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        if name.startswith('_') and name not in BROKER_PRIVATE_METHODS:
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            if self.__direct is None:
+                try:
+                    return self.__broker.request(method=name, args=list(args), kwargs=kwargs)
+                except ConnectionError:
+                    if self.__fallback is None:
+                        raise
+                    with self.__lock:
+                        if self.__direct is None:
+                            MODULE_LOGGER.warning('Session broker is not reachable, '
+                                                  'fallback to direct connection')
+                            self.__direct = self.__fallback()
+            return getattr(self.__direct.api, name)(*args, **kwargs)
+        return call
+
+
+class CvBrokerClient():
+    """
+    CvBrokerClient Lightweight CvpClient replacement using a session broker
+
+    Only exposes attributes used by the collection modules: nodes, port and
+    api.
+    """
+
+    def __init__(self, broker, nodes: list, port=None, fallback=None):
+        self.nodes = nodes
+        self.port = port
+        self.api = CvBrokerApi(broker=broker, fallback=fallback)
+
+
+class CvSessionBroker():
+    """
+    CvSessionBroker Controller-side process keeping a Cloudvision session alive
+
+    A broker is started per Cloudvision host, port and user and is reachable
+    over a Unix socket in a directory restricted to current user. Requests
+    are authenticated with a digest of the credentials, so a broker never
+    serves a module which could not log in by itself. A broker cannot be
+    used without a password or a token.
+
+    Example
+    -------
+
+    >>> broker = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible')
+    >>> client = broker.connect()
+    >>> if client is None:
+    ...     client = login()
+    ...     broker.spawn(client=client, idle_timeout=300)
+    """
+
+    def __init__(self, host: str, port, user: str, secret: str, socket_dir: str = None,
+                 timeout=None):
+        if not secret:
+            raise ValueError('Session broker requires a password or a token '
+                             'to authenticate requests')
+        identity = '{0}|{1}|{2}'.format(host, port, user)
+        self.__dir = socket_dir if socket_dir is not None else broker_dir()
+        socket_name = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16] + '.sock'
+        self.__path = os.path.join(self.__dir, socket_name)
+        self.__digest = hmac.new(secret.encode('utf-8'), identity.encode('utf-8'),
+                                 hashlib.sha256).hexdigest()
+        self.__timeout = timeout
+
+    @property
+    def path(self):
+        """
+        path Getter for broker socket path
+
+        Returns
+        -------
+        str
+            Path of the Unix socket
+        """
+        return self.__path
+
+    def request(self, method: str, args: list = None, kwargs: dict = None):
+        """
+        request Send an API call to the broker and wait for its result
+
+        Parameters
+        ----------
+        method : str
+            Name of the cv_client.api method to call
+        args : list, optional
+            Positional arguments of the call, by default None
+        kwargs : dict, optional
+            Keyword arguments of the call, by default None
+
+        Returns
+        -------
+        any
+            Result of the API call
+
+        Raises
+        ------
+        ConnectionError
+            When broker socket does not accept connection, request is not sent
+        CvpRequestError
+            When connection with broker is lost after request is sent
+        """
+        payload = json.dumps({'auth': self.__digest, 'method': method,
+                              'args': args or [], 'kwargs': kwargs or {}})
+        broker_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        broker_socket.settimeout(self.__timeout)
+        try:
+            try:
+                broker_socket.connect(self.__path)
+            except OSError as error:
+                raise ConnectionError(str(error))
+            try:
+                broker_socket.sendall(payload.encode('utf-8') + b'\n')
+                data = b''
+                while not data.endswith(b'\n'):
+                    chunk = broker_socket.recv(BROKER_BUFFER)
+                    if not chunk:
+                        break
+                    data += chunk
+                response = json.loads(data.decode('utf-8'))
+            except (OSError, ValueError) as error:
+                raise CvpRequestError('Session broker connection lost during {0}: {1}'.format(
+                    method, str(error)))
+        finally:
+            broker_socket.close()
+        if 'error' in response:
+            _raise_error(response['error'])
+        return response.get('result')
+
+    def connect(self, fallback=None):
+        """
+        connect Get a client served by a running broker
+
+        A stale socket left by a stopped broker is removed.
+
+        Parameters
+        ----------
+        fallback : callable, optional
+            Build a direct connection if broker stops during module execution, by default None
+
+        Returns
+        -------
+        CvBrokerClient
+            Client using the broker, None if no broker serves this session
+        """
+        if not os.path.exists(self.__path):
+            return None
+        try:
+            session = self.request(method=BROKER_PING)
+        except ConnectionError:
+            MODULE_LOGGER.info('Remove stale session broker socket %s', self.__path)
+            self.__remove_socket()
+            return None
+        except Exception as error:  # pylint: disable=broad-except
+            MODULE_LOGGER.info('Session broker cannot be used: %s', str(error))
+            return None
+        MODULE_LOGGER.info('Use session broker %s', self.__path)
+        return CvBrokerClient(broker=self, nodes=session.get('nodes'), port=session.get('port'),
+                              fallback=fallback)
+
+    def serve(self, client, idle_timeout: int):
+        """
+        serve Serve API calls with client until broker is idle
+
+        Socket is bound to a temporary path and then moved in place, so a
+        module never connects to a broker not yet listening.
+
+        Parameters
+        ----------
+        client : CvpClient
+            Authenticated Cloudvision client
+        idle_timeout : int
+            Stop broker after this number of seconds without request
+        """
+        os.makedirs(self.__dir, mode=0o700, exist_ok=True)
+        os.chmod(self.__dir, 0o700)
+        temp_path = '{0}.{1}'.format(self.__path, os.getpid())
+        server = CvBrokerServer(path=temp_path, client=client, digest=self.__digest)
+        server.timeout = min(BROKER_POLL, idle_timeout)
+        inode = None
+        try:
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.__path)
+            inode = os.stat(self.__path).st_ino
+            while time.time() - server.last_request < idle_timeout:
+                server.handle_request()
+        finally:
+            server.server_close()
+            # Only remove socket if not replaced by another broker
+            if os.path.exists(self.__path) and os.stat(self.__path).st_ino == inode:
+                self.__remove_socket()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        MODULE_LOGGER.info('Session broker %s stopped after %s seconds idle',
+                           self.__path, idle_timeout)
+
+    def spawn(self, client, idle_timeout: int):
+        """
+        spawn Start a detached broker process serving client session
+
+        Broker inherits the authenticated session of client. Pooled HTTP
+        connections are dropped in the broker process as they are shared with
+        the module process.
+
+        Parameters
+        ----------
+        client : CvpClient
+            Authenticated Cloudvision client
+        idle_timeout : int
+            Stop broker after this number of seconds without request
+        """
+        try:
+            pid = os.fork()
+        except OSError as error:
+            MODULE_LOGGER.warning('Cannot start session broker: %s', str(error))
+            return
+        if pid > 0:
+            os.waitpid(pid, 0)
+            return
+        # Child process: detach from module process and exit immediately
+        try:
+            os.setsid()
+            if os.fork() == 0:
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for descriptor in range(3):
+                    os.dup2(devnull, descriptor)
+                if client.session is not None:
+                    client.session.close()
+                self.serve(client=client, idle_timeout=idle_timeout)
+        except Exception as error:  # pylint: disable=broad-except
+            MODULE_LOGGER.error('Session broker %s stopped on error: %s', self.__path, str(error))
+            MODULE_LOGGER.debug(traceback.format_exc())
+        finally:
+            os._exit(0)  # pylint: disable=protected-access
+
+    def __remove_socket(self):
+        """
+        __remove_socket Remove broker socket file if it exists
+        """
+        try:
+            os.remove(self.__path)
+        except OSError:
+            pass
@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import threading
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+try:
+    from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
+    from cvprac.cvp_client_errors import CvpApiError, CvpRequestError  # noqa # pylint: disable=unused-import
+    HAS_CVPRAC = True
+except ImportError:
+    HAS_CVPRAC = False
+    CVPRAC_IMP_ERR = traceback.format_exc()
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.snapshot_tools')
+MODULE_LOGGER.info('Start snapshot_tools module execution')
+
+
+# ------------------------------------------ #
+# Fields name to use in classes
+# ------------------------------------------ #
+
+FIELD_FQDN = 'fqdn'
+FIELD_HOSTNAME = 'hostname'
+FIELD_SYSMAC = 'systemMacAddress'
+FIELD_SERIAL = 'serialNumber'
+FIELD_KEY = 'key'
+FIELD_NAME = 'name'
+FIELD_CONTAINER_NAME = 'containerName'
+FIELD_PARENT_ID = 'parentContainerId'
+FIELD_PARENT_KEY = 'parentContainerKey'
+FIELD_CONFIGLET_ID = 'configletId'
+FIELD_OBJECT_ID = 'objectId'
+FIELD_ORDER = 'order'
+
+DEVICE_INDEXES = [FIELD_HOSTNAME, FIELD_FQDN, FIELD_SYSMAC, FIELD_SERIAL]
+
+
+class CvSnapshot(object):
+    """
+    CvSnapshot Indexed view of Cloudvision provisioning data shared by tool classes
+
+    Inventory, containers and configlets (with their mappers) are bulk loaded
+    once, on first access, and exposed through dictionaries so every lookup is
+    done in constant time instead of issuing one API call per object.
+
+    A lookup missing from the index falls back to the equivalent per-object
+    API call and the result is cached, so objects created during module
+    execution are still resolved.
+
+    Loading and updates are protected by a lock so an instance can be shared by
+    concurrent workers. Devices are indexed as copies: devices property returns
+    inventory as received from Cloudvision.
+
+    Example
+    -------
+
+    >>> snapshot = CvSnapshot(cv_connection=cv_client)
+    >>> snapshot.get_device(search_value='leaf1', search_by='hostname')['systemMacAddress']
+    '50:8d:00:e3:78:aa'
+    >>> snapshot.get_container_by_name(container_name='DC1_LEAFS')['key']
+    'container_55effafb-2991-45ca-86e5-bf09d4739248'
+    """
+
+    def __init__(self, cv_connection):
+        self.__cv_client = cv_connection
+        self.__lock = threading.RLock()
+        self.__devices = None
+        self.__devices_index = None
+        self.__containers = None
+        self.__containers_by_key = None
+        self.__containers_by_name = None
+        self.__configlets = None
+        self.__configlets_by_key = None
+        self.__configlets_by_name = None
+        self.__mappers = None
+        self.__mappers_by_object = None
+
+    # ------------------------------------------ #
+    # Private functions
+    # ------------------------------------------ #
+
+    @staticmethod
+    def __device_index_value(device: dict, index: str):
+        """
+        __device_index_value Extract value to use as index key for a device
+
+        Hostname index mimics cvprac get_device_by_name(search_by_hostname=True)
+        and uses the first component of the FQDN.
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision
+        index : str
+            Name of the index
+
+        Returns
+        -------
+        str
+            Value to use as dictionary key, None if not available
+        """
+        if index == FIELD_HOSTNAME:
+            if device.get(FIELD_FQDN):
+                return device[FIELD_FQDN].split('.')[0]
+            return device.get(FIELD_HOSTNAME)
+        return device.get(index)
+
+    def __index_device(self, device: dict, devices_index: dict):
+        """
+        __index_device Register a copy of a device in all device indexes
+
+        A copy is indexed so fields added for tool classes are not exposed
+        in data returned by Cloudvision. Lock must be held.
+
+        Parameters
+        ----------
+        device : dict
+            Device data from Cloudvision
+        devices_index : dict
+            Device indexes to update
+
+        Returns
+        -------
+        dict
+            Indexed copy of the device
+        """
+        device = dict(device)
+        if FIELD_PARENT_ID not in device and FIELD_PARENT_KEY in device:
+            device[FIELD_PARENT_ID] = device[FIELD_PARENT_KEY]
+        for index in DEVICE_INDEXES:
+            value = self.__device_index_value(device=device, index=index)
+            if value is not None:
+                devices_index[index][value] = device
+        return device
+
+    def __load_devices(self):
+        """
+        __load_devices Bulk load Cloudvision inventory and build device indexes
+        """
+        if self.__devices is not None:
+            return
+        with self.__lock:
+            if self.__devices is not None:
+                return
+            MODULE_LOGGER.info('Loading inventory snapshot from Cloudvision')
+            devices = self.__cv_client.api.get_inventory()
+            devices_index = {index: dict() for index in DEVICE_INDEXES}
+            for device in devices:
+                self.__index_device(device=device, devices_index=devices_index)
+            self.__devices_index = devices_index
+            self.__devices = devices
+        MODULE_LOGGER.debug('Inventory snapshot has %s devices', str(len(self.__devices)))
+
+    def __index_container(self, container: dict):
+        """
+        __index_container Register a container in key and name indexes
+
+        Parameters
+        ----------
+        container : dict
+            Container data from Cloudvision
+        """
+        if FIELD_KEY not in container and 'Key' in container:
+            container[FIELD_KEY] = container['Key']
+        if FIELD_NAME not in container and 'Name' in container:
+            container[FIELD_NAME] = container['Name']
+        self.__containers_by_key[container[FIELD_KEY]] = container
+        self.__containers_by_name[container[FIELD_NAME]] = container
+
+    def __load_containers(self):
+        """
+        __load_containers Bulk load Cloudvision containers and build container indexes
+        """
+        if self.__containers is not None:
+            return
+        with self.__lock:
+            if self.__containers is not None:
+                return
+            MODULE_LOGGER.info('Loading containers snapshot from Cloudvision')
+            containers = self.__cv_client.api.get_containers()['data']
+            self.__containers_by_key = dict()
+            self.__containers_by_name = dict()
+            for container in containers:
+                self.__index_container(container=container)
+            self.__containers = containers
+        MODULE_LOGGER.debug('Containers snapshot has %s containers', str(len(self.__containers)))
+
+    def __load_configlets(self):
+        """
+        __load_configlets Bulk load Cloudvision configlets and mappers and build configlet indexes
+        """
+        if self.__configlets is not None:
+            return
+        with self.__lock:
+            if self.__configlets is not None:
+                return
+            MODULE_LOGGER.info('Loading configlets snapshot from Cloudvision')
+            data = self.__cv_client.api.get_configlets_and_mappers()['data']
+            configlets = data.get('configlets', list())
+            self.__mappers = data.get('configletMappers', list())
+            self.__configlets_by_key = {configlet[FIELD_KEY]: configlet for configlet in configlets}
+            self.__configlets_by_name = {configlet[FIELD_NAME]: configlet for configlet in configlets}
+            self.__mappers_by_object = dict()
+            for mapper in self.__mappers:
+                self.__mappers_by_object.setdefault(mapper[FIELD_OBJECT_ID], list()).append(mapper)
+            # Mappers are returned in any order, configlets are applied following their order field
+            for mappers in self.__mappers_by_object.values():
+                mappers.sort(key=lambda mapper: (mapper.get(FIELD_ORDER) is None,
+                                                 int(mapper.get(FIELD_ORDER) or 0)))
+            self.__configlets = configlets
+        MODULE_LOGGER.debug('Configlets snapshot has %s configlets and %s mappers',
+                            str(len(self.__configlets)), str(len(self.__mappers)))
+
+    # ------------------------------------------ #
+    # Getters
+    # ------------------------------------------ #
+
+    @property
+    def devices(self):
+        """
+        devices Getter for all devices from Cloudvision inventory
+
+        Returns
+        -------
+        list
+            List of devices data
+        """
+        self.__load_devices()
+        return self.__devices
+
+    @property
+    def containers(self):
+        """
+        containers Getter for all containers from Cloudvision
+
+        Returns
+        -------
+        list
+            List of containers data
+        """
+        self.__load_containers()
+        return self.__containers
+
+    @property
+    def configlets(self):
+        """
+        configlets Getter for all configlets from Cloudvision
+
+        Returns
+        -------
+        list
+            List of configlets data
+        """
+        self.__load_configlets()
+        return self.__configlets
+
+    @property
+    def configlet_mappers(self):
+        """
+        configlet_mappers Getter for all configlet mappers from Cloudvision
+
+        Returns
+        -------
+        list
+            List of configlet mappers
+        """
+        self.__load_configlets()
+        return self.__mappers
+
+    # ------------------------------------------ #
+    # Lookup functions
+    # ------------------------------------------ #
+
+    def get_device(self, search_value: str, search_by: str = FIELD_HOSTNAME):
+        """
+        get_device Get device data using one of the device indexes
+
+        Parameters
+        ----------
+        search_value : str
+            Value to look for (hostname, fqdn, systemMacAddress or serialNumber)
+        search_by : str, optional
+            Index to use for lookup, by default hostname
+
+        Returns
+        -------
+        dict
+            Device data, an empty dict if not found (same behavior as cvprac)
+        """
+        self.__load_devices()
+        devices_index = self.__devices_index
+        if search_by in devices_index and search_value in devices_index[search_by]:
+            return devices_index[search_by][search_value]
+        MODULE_LOGGER.debug('Device %s not found in snapshot using %s, fallback to API', str(search_value), str(search_by))
+        device = dict()
+        if search_by == FIELD_FQDN:
+            device = self.__cv_client.api.get_device_by_name(fqdn=search_value, search_by_hostname=False)
+        elif search_by == FIELD_HOSTNAME:
+            device = self.__cv_client.api.get_device_by_name(fqdn=search_value, search_by_hostname=True)
+        elif search_by == FIELD_SYSMAC:
+            device = self.__cv_client.api.get_device_by_mac(device_mac=search_value)
+        elif search_by == FIELD_SERIAL:
+            device = self.__cv_client.api.get_device_by_serial(device_serial=search_value)
+        if device is not None and len(device) > 0:
+            with self.__lock:
+                device = self.__index_device(device=device, devices_index=self.__devices_index)
+        return device
+
+    def get_container_by_name(self, container_name: str):
+        """
+        get_container_by_name Get container data using its name
+
+        Parameters
+        ----------
+        container_name : str
+            Name of the container
+
+        Returns
+        -------
+        dict
+            Container data, None if not found
+        """
+        self.__load_containers()
+        if container_name in self.__containers_by_name:
+            return self.__containers_by_name[container_name]
+        MODULE_LOGGER.debug('Container %s not found in snapshot, fallback to API', str(container_name))
+        container = self.__cv_client.api.get_container_by_name(name=str(container_name))
+        if container is not None and FIELD_KEY in container:
+            with self.__lock:
+                self.__index_container(container=container)
+        return container
+
+    def get_container_by_key(self, container_key: str):
+        """
+        get_container_by_key Get container data using its key
+
+        Parameters
+        ----------
+        container_key : str
+            Key of the container
+
+        Returns
+        -------
+        dict
+            Container data, None if not found
+        """
+        self.__load_containers()
+        return self.__containers_by_key.get(container_key)
+
+    def get_configlet_by_name(self, configlet_name: str):
+        """
+        get_configlet_by_name Get configlet data using its name
+
+        Parameters
+        ----------
+        configlet_name : str
+            Name of the configlet
+
+        Returns
+        -------
+        dict
+            Configlet data, None if not found
+        """
+        self.__load_configlets()
+        return self.__configlets_by_name.get(configlet_name)
+
+    def get_configlet_by_key(self, configlet_key: str):
+        """
+        get_configlet_by_key Get configlet data using its key
+
+        Parameters
+        ----------
+        configlet_key : str
+            Key of the configlet
+
+        Returns
+        -------
+        dict
+            Configlet data, None if not found
+        """
+        self.__load_configlets()
+        return self.__configlets_by_key.get(configlet_key)
+
+    def get_configlets_by_object_id(self, object_id: str):
+        """
+        get_configlets_by_object_id Get configlets mapped to a container or a device
+
+        Parameters
+        ----------
+        object_id : str
+            Container key or device systemMacAddress
+
+        Returns
+        -------
+        list
+            List of configlets data mapped to the object, in applied order
+        """
+        self.__load_configlets()
+        configlets = list()
+        for mapper in self.__mappers_by_object.get(object_id, list()):
+            configlet = self.__configlets_by_key.get(mapper[FIELD_CONFIGLET_ID])
+            if configlet is not None:
+                configlets.append(configlet)
+        return configlets
+
+    # ------------------------------------------ #
+    # Update functions
+    # ------------------------------------------ #
+
+    def set_device_container(self, system_mac: str, container: dict):
+        """
+        set_device_container Update container of a device after a move or deploy
+
+        Parameters
+        ----------
+        system_mac : str
+            Device systemMacAddress
+        container : dict
+            Container data with key and name
+        """
+        device = self.get_device(search_value=system_mac, search_by=FIELD_SYSMAC)
+        if device is not None and len(device) > 0:
+            with self.__lock:
+                device[FIELD_PARENT_ID] = container[FIELD_KEY]
+                device[FIELD_PARENT_KEY] = container[FIELD_KEY]
+                device[FIELD_CONTAINER_NAME] = container[FIELD_NAME]
+
+    def remove_container(self, container_name: str):
+        """
+        remove_container Remove a container from indexes after its deletion
+
+        Parameters
+        ----------
+        container_name : str
+            Name of the container
+        """
+        self.__load_containers()
+        with self.__lock:
+            container = self.__containers_by_name.pop(container_name, None)
+            if container is not None:
+                self.__containers_by_key.pop(container[FIELD_KEY], None)
+
+    def refresh_containers(self):
+        """
+        refresh_containers Reload containers from Cloudvision after a topology change
+        """
+        with self.__lock:
+            self.__containers = None
+            self.__load_containers()
+
+    def invalidate(self):
+        """
+        invalidate Drop all cached data to force a reload on next lookup
+
+        Indexes are replaced on next load, so concurrent lookups keep using
+        the previous data until then.
+        """
+        with self.__lock:
+            self.__devices = None
+            self.__containers = None
+            self.__configlets = None
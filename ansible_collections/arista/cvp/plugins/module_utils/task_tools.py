@@ -23,9 +23,14 @@ __metaclass__ = type
 
 import traceback
 import logging
+import random
+import threading
+import time
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot, FIELD_SYSMAC, FIELD_PARENT_KEY
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
     from cvprac.cvp_client_errors import CvpApiError, CvpRequestError  # noqa # pylint: disable=unused-import
@@ -38,16 +43,203 @@ except ImportError:
 MODULE_LOGGER = logging.getLogger('arista.cvp.task_tools')
 MODULE_LOGGER.info('Start task_tools module execution')
 
+FIELD_TASK_ID = 'workOrderId'
+FIELD_TASK_STATUS = 'workOrderUserDefinedStatus'
+FIELD_TASK_DETAILS = 'workOrderDetails'
+FIELD_TASK_DEVICE_ID = 'netElementId'
+# Task status where task will not change anymore
+TASK_TERMINAL_STATES = ['Completed', 'Cancelled', 'Failed']
+# Task status where task can still change, polled with one call per status
+TASK_ACTIVE_STATES = ['Pending', 'In-Progress']
+# Number of tasks to wait for above which tasks are retrieved with a single call per active status
+TASK_BULK_THRESHOLD = 10
+
+
+class CvTaskWaiter():
+    """
+    CvTaskWaiter Class to wait for Cloudvision tasks to reach a terminal state
+
+    Task status is polled with an exponential backoff and a random jitter between 2 polls.
+    When waiting for many tasks, status is retrieved with a single call per active status.
+
+    Example
+    -------
+    >>> waiter = CvTaskWaiter(cv_connection=cv_client, timeout=600)
+    >>> tasks_data = waiter.wait(task_ids=['12', '13'])
+    >>> print(waiter.timed_out)
+    ['13']
+    """
+
+    def __init__(self, cv_connection, timeout: float = 0, task_timeout: float = None, poll_interval: float = 1,
+                 max_poll_interval: float = 30, backoff: float = 2, jitter: float = 0.1):
+        self.__cv_client = cv_connection
+        self.__timeout = timeout
+        self.__task_timeout = task_timeout
+        self.__poll_interval = poll_interval
+        self.__max_poll_interval = max_poll_interval
+        self.__backoff = backoff
+        self.__jitter = jitter
+        self.__timed_out = list()
+        self.__polls = 0
+
+    @property
+    def timed_out(self):
+        """
+        timed_out Getter for list of tasks not in a terminal state when waiter stopped
+
+        Returns
+        -------
+        list
+            List of task IDs
+        """
+        return self.__timed_out
+
+    @property
+    def polls(self):
+        """
+        polls Getter for number of status retrieval rounds executed by last wait
+
+        Returns
+        -------
+        int
+            Number of polls
+        """
+        return self.__polls
+
+    def __get_tasks_data(self, task_ids: list):
+        """
+        __get_tasks_data Get data for a list of tasks from Cloudvision
+
+        Above TASK_BULK_THRESHOLD tasks, tasks in an active state are retrieved with a
+        single call per state and indexed by task ID. Tasks not part of these answers,
+        usually tasks which just reached a terminal state, are retrieved one by one.
+
+        Parameters
+        ----------
+        task_ids : list
+            List of task IDs
+
+        Returns
+        -------
+        dict
+            Task data indexed by task ID
+        """
+        tasks_data = dict()
+        if len(task_ids) > TASK_BULK_THRESHOLD:
+            expected_tasks = {str(task_id) for task_id in task_ids}
+            for status in TASK_ACTIVE_STATES:
+                for task in self.__cv_client.api.get_tasks_by_status(status=status):
+                    if str(task.get(FIELD_TASK_ID)) in expected_tasks:
+                        tasks_data[str(task[FIELD_TASK_ID])] = task
+        for task_id in task_ids:
+            if str(task_id) not in tasks_data:
+                tasks_data[str(task_id)] = self.__cv_client.api.get_task_by_id(task_id)
+        return {task_id: tasks_data[str(task_id)] for task_id in task_ids}
+
+    def __next_interval(self, interval: float):
+        """
+        __next_interval Compute next poll interval using exponential backoff
+
+        Parameters
+        ----------
+        interval : float
+            Current poll interval
+
+        Returns
+        -------
+        float
+            Next poll interval, capped by max_poll_interval
+        """
+        return min(interval * self.__backoff, self.__max_poll_interval)
+
+    def is_terminal(self, task_data: dict):
+        """
+        is_terminal Test if a task is in a terminal state
+
+        Parameters
+        ----------
+        task_data : dict
+            Task data from Cloudvision
+
+        Returns
+        -------
+        bool
+            True if task will not change anymore
+        """
+        if task_data is not None:
+            return task_data.get(FIELD_TASK_STATUS) in TASK_TERMINAL_STATES
+        return False
+
+    def wait(self, task_ids: list, task_timeouts: dict = None):
+        """
+        wait Wait for a list of tasks to reach a terminal state
+
+        Waiter stops when all tasks are in a terminal state or global timeout is reached.
+        A task stops being polled once its own timeout is reached.
+
+        Parameters
+        ----------
+        task_ids : list
+            List of task IDs to wait for
+        task_timeouts : dict, optional
+            Timeout in seconds for specific task IDs, by default task_timeout for all tasks
+
+        Returns
+        -------
+        dict
+            Last known data for every task indexed by task ID
+        """
+        start = time.time()
+        deadline = start + self.__timeout
+        task_deadlines = dict()
+        for task_id in task_ids:
+            task_timeout = self.__task_timeout
+            if task_timeouts is not None and task_id in task_timeouts:
+                task_timeout = task_timeouts[task_id]
+            task_deadlines[task_id] = deadline if task_timeout is None else min(deadline, start + task_timeout)
+
+        tasks_data = dict()
+        self.__timed_out = list()
+        self.__polls = 0
+        pending = list(task_ids)
+        interval = self.__poll_interval
+        while len(pending) > 0:
+            tasks_data.update(self.__get_tasks_data(task_ids=pending))
+            self.__polls += 1
+            now = time.time()
+            still_pending = list()
+            for task_id in pending:
+                if self.is_terminal(task_data=tasks_data[task_id]):
+                    continue
+                if now >= task_deadlines[task_id]:
+                    MODULE_LOGGER.warning('Task %s has not completed in time', str(task_id))
+                    self.__timed_out.append(task_id)
+                    continue
+                still_pending.append(task_id)
+            pending = still_pending
+            if len(pending) == 0:
+                break
+            # Do not sleep beyond the closest deadline
+            next_deadline = min(task_deadlines[task_id] for task_id in pending)
+            sleep_time = interval + random.uniform(-self.__jitter, self.__jitter) * interval
+            sleep_time = max(0, min(sleep_time, next_deadline - now))
+            MODULE_LOGGER.debug('Waiting %s seconds for %s tasks', str(sleep_time), str(len(pending)))
+            time.sleep(sleep_time)
+            interval = self.__next_interval(interval=interval)
+        MODULE_LOGGER.info('Tasks wait ended after %s polls', str(self.__polls))
+        return tasks_data
+
 
 class CvTaskTools():
     """
     CvTaskTools Class to manage Cloudvision tasks execution
     """
 
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False, snapshot: CvSnapshot = None):
         self.__cv_client = cv_connection
         self.__ansible = ansible_module
         self.__check_mode = check_mode
+        self.__snapshot = snapshot if snapshot is not None else CvSnapshot(cv_connection=cv_connection)
 
     def __get_task_data(self, task_id: str):
         """
@@ -67,6 +259,97 @@ class CvTaskTools():
         data = self.__cv_client.api.get_task_by_id(task_id=task_id)
         return data
 
+    def __get_pending_tasks(self):
+        """
+        __get_pending_tasks Get all pending tasks from Cloudvision with a single call
+
+        Returns
+        -------
+        dict
+            Cloudvision data about pending tasks indexed by task ID
+        """
+        tasks_data = self.__cv_client.api.get_tasks_by_status(status='Pending')
+        MODULE_LOGGER.debug('Found %s pending tasks on Cloudvision', str(len(tasks_data)))
+        return {str(task[FIELD_TASK_ID]): task for task in tasks_data if FIELD_TASK_ID in task}
+
+    def __get_task_container(self, task_data: dict):
+        """
+        __get_task_container Get key of the container where device targeted by a task is attached
+
+        Parameters
+        ----------
+        task_data : dict
+            Task data from Cloudvision
+
+        Returns
+        -------
+        str
+            Container key, None if device is not found
+        """
+        device_id = task_data.get(FIELD_TASK_DETAILS, dict()).get(FIELD_TASK_DEVICE_ID)
+        if device_id is None:
+            return None
+        device = self.__snapshot.get_device(search_value=device_id, search_by=FIELD_SYSMAC)
+        return device.get(FIELD_PARENT_KEY) if device else None
+
+    def __send_task_action(self, task_id: str, state: str, api_result: CvApiResult):
+        """
+        __send_task_action Send execute or cancel API calls for a task
+
+        Parameters
+        ----------
+        task_id : str
+            Task ID to action
+        state : str
+            How to action task: executed/cancelled
+        api_result : CvApiResult
+            Result of task action to update
+        """
+        self.__cv_client.api.add_note_to_task(task_id, "Executed by Ansible")
+        if state == "executed":
+            api_result.add_entry(self.execute_task(task_id))
+            api_result.changed = True
+            api_result.success = True
+        elif state == "cancelled":
+            api_result.add_entry(self.cancel_task(task_id))
+            api_result.changed = True
+            api_result.success = True
+
+    def __action_task(self, task_id: str, task_data: dict, state: str, container_lock=None):
+        """
+        __action_task Worker to execute or cancel a single task
+
+        Parameters
+        ----------
+        task_id : str
+            Task ID to action
+        task_data : dict
+            Task data from Cloudvision
+        state : str
+            How to action task: executed/cancelled
+        container_lock : threading.BoundedSemaphore, optional
+            Semaphore limiting number of tasks actioned concurrently in task container, by default None
+
+        Returns
+        -------
+        CvApiResult
+            Result of task action, None if task is not actionable
+        """
+        if not self.is_actionable(task_data=task_data):
+            return None
+        api_result = CvApiResult(action_name='task_' + str(task_id))
+        if self.__ansible.check_mode is False:
+            if container_lock is not None:
+                with container_lock:
+                    self.__send_task_action(task_id=task_id, state=state, api_result=api_result)
+            else:
+                self.__send_task_action(task_id=task_id, state=state, api_result=api_result)
+        else:
+            api_result.add_entry('check_mode')
+            api_result.changed = False
+            api_result.success = True
+        return api_result
+
     def is_actionable(self, task_data: dict):
         """
         is_actionable Test if a task is in correct state to be actionned
@@ -82,7 +365,7 @@ class CvTaskTools():
             True if task is actionale, False in other situations
         """
         if task_data is not None:
-            return task_data.get("workOrderUserDefinedStatus") in ['Pending']
+            return task_data.get(FIELD_TASK_STATUS) in ['Pending']
         return False
 
     def execute_task(self, task_id: str):
@@ -117,7 +400,8 @@ class CvTaskTools():
         """
         return self.__cv_client.api.cancel_task(task_id)
 
-    def tasker(self, taskIds_list: list, state: str = 'executed'):
+    def tasker(self, taskIds_list: list, state: str = 'executed', wait: int = 0, poll_interval: float = 1,
+               max_concurrent: int = 1, max_concurrent_per_container: int = 0):
         """
         tasker Generic entry point to manage a set of tasks
 
@@ -127,6 +411,14 @@ class CvTaskTools():
             List of task IDs from user input
         state : str, optional
             How to action tasks: executed/cancelled, by default 'executed'
+        wait : int, optional
+            Time in seconds to wait for actioned tasks to reach a terminal state, by default 0
+        poll_interval : float, optional
+            Initial time in seconds between 2 task status polls, by default 1
+        max_concurrent : int, optional
+            Maximum number of tasks actioned concurrently, by default 1
+        max_concurrent_per_container : int, optional
+            Maximum number of tasks actioned concurrently for devices of a same container, by default 0 (no limit)
 
         Returns
         -------
@@ -135,23 +427,42 @@ class CvTaskTools():
         """
         ansible_response = CvAnsibleResponse()
         tasker_manager = CvManagerResult(builder_name='actions_manager')
-        for task_id in taskIds_list:
-            api_result = CvApiResult(action_name='task_' + str(task_id))
-            if self.is_actionable(task_data=self.__get_task_data(task_id)):
-                if self.__ansible.check_mode is False:
-                    self.__cv_client.api.add_note_to_task(task_id, "Executed by Ansible")
-                    if state == "executed":
-                        api_result.add_entry(self.execute_task(task_id))
-                        api_result.changed = True
-                        api_result.success = True
-                    elif state == "cancelled":
-                        api_result.add_entry(self.cancel_task(task_id))
-                        api_result.changed = True
-                        api_result.success = True
-                else:
-                    api_result.add_entry('check_mode')
-                    api_result.changed = False
-                    api_result.success = True
-                tasker_manager.add_change(api_result)
+        # Large list of tasks: check status against a single list of pending tasks
+        pending_tasks = None
+        if len(taskIds_list) > TASK_BULK_THRESHOLD:
+            pending_tasks = self.__get_pending_tasks()
+        if pending_tasks is not None:
+            tasks_data = [(task_id, pending_tasks.get(str(task_id))) for task_id in taskIds_list]
+        else:
+            tasks_data = list(zip(taskIds_list, parallel_map(function=self.__get_task_data, items=taskIds_list, max_workers=max_concurrent)))
+
+        # Build one semaphore per container before starting workers
+        containers_lock = dict()
+        tasks_lock = dict()
+        if max_concurrent > 1 and max_concurrent_per_container > 0:
+            for task_id, task_data in tasks_data:
+                if self.is_actionable(task_data=task_data):
+                    container = self.__get_task_container(task_data=task_data)
+                    if container is not None:
+                        containers_lock.setdefault(container, threading.BoundedSemaphore(max_concurrent_per_container))
+                        tasks_lock[task_id] = containers_lock[container]
+
+        api_results = dict()
+        for task_id, api_result in zip(taskIds_list,
+                                       parallel_map(function=lambda x: self.__action_task(task_id=x[0], task_data=x[1], state=state,
+                                                                                          container_lock=tasks_lock.get(x[0])),
+                                                    items=tasks_data, max_workers=max_concurrent)):
+            if api_result is not None:
+                api_results[task_id] = api_result
+        if wait > 0 and self.__ansible.check_mode is False and len(api_results) > 0:
+            waiter = CvTaskWaiter(cv_connection=self.__cv_client, timeout=wait, poll_interval=poll_interval)
+            tasks_data = waiter.wait(task_ids=list(api_results.keys()))
+            for task_id, task_data in tasks_data.items():
+                if task_data is not None:
+                    api_results[task_id].add_entry(task_data.get(FIELD_TASK_STATUS))
+            for task_id in waiter.timed_out:
+                self.__ansible.warn('Task {0} has not completed in {1} seconds'.format(task_id, wait))
+        for api_result in api_results.values():
+            tasker_manager.add_change(api_result)
         ansible_response.add_manager(tasker_manager)
         return ansible_response
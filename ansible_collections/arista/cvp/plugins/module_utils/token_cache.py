@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import traceback
+import logging
+import os
+import time
+import json
+import hmac
+import hashlib
+import tempfile
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+try:
+    from requests.cookies import cookiejar_from_dict
+    from requests.utils import dict_from_cookiejar
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    REQUESTS_IMP_ERR = traceback.format_exc()
+
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.token_cache')
+MODULE_LOGGER.info('Start token_cache module execution')
+
+# Environment variable enabling the cache, value is the cache directory
+TOKEN_CACHE_ENV = 'ANSIBLE_CVP_TOKEN_CACHE'
+# Environment variable to change how long (in seconds) a cached session is reused
+TOKEN_CACHE_TTL_ENV = 'ANSIBLE_CVP_TOKEN_CACHE_TTL'
+TOKEN_CACHE_TTL = 3600
+# Version of the cache file structure, cache is dropped when it changes
+TOKEN_CACHE_VERSION = 1
+# Session headers set by cvprac login and stored in cache
+TOKEN_CACHE_HEADERS = ['APP_SESSION_ID']
+
+
+class CvTokenCache():
+    """
+    CvTokenCache Local cache of Cloudvision session cookies
+
+    One file is used per Cloudvision host, port and user. A cached session
+    is only reused when it was created with the same credentials and is not
+    expired. When Cloudvision rejects a cached session, cvprac runs a new
+    login and cache is updated with the new session.
+
+    Example
+    -------
+
+    >>> cache = CvTokenCache(cache_dir='~/.ansible/cvp_tokens', host='cvp.lab', port=443, user='ansible', secret='ansible')
+    >>> client = CvpClient()
+    >>> cache.attach(client)
+    >>> client.connect(nodes=['cvp.lab'], username='ansible', password='ansible')
+    """
+
+    def __init__(self, cache_dir: str, host: str, port, user: str, secret: str, ttl: int = TOKEN_CACHE_TTL):
+        identity = '{0}|{1}|{2}'.format(host, port, user)
+        self.__dir = os.path.expanduser(cache_dir)
+        self.__path = os.path.join(self.__dir, hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16] + '.json')
+        self.__digest = hmac.new(str(secret).encode('utf-8'), identity.encode('utf-8'), hashlib.sha256).hexdigest()
+        self.__ttl = ttl
+        self.__restored = False
+
+    @classmethod
+    def from_env(cls, host: str, port, user: str, secret: str):
+        """
+        from_env Build cache configured with environment variables
+
+        Parameters
+        ----------
+        host : str
+            Cloudvision host
+        port : int
+            Cloudvision port
+        user : str
+            User connecting to Cloudvision
+        secret : str
+            Password or token of the user
+
+        Returns
+        -------
+        CvTokenCache
+            Token cache, None when ANSIBLE_CVP_TOKEN_CACHE is not set
+        """
+        cache_dir = os.environ.get(TOKEN_CACHE_ENV)
+        if not cache_dir:
+            return None
+        try:
+            ttl = int(os.environ.get(TOKEN_CACHE_TTL_ENV, TOKEN_CACHE_TTL))
+        except ValueError:
+            MODULE_LOGGER.warning('Invalid %s value, use default %s seconds', TOKEN_CACHE_TTL_ENV, TOKEN_CACHE_TTL)
+            ttl = TOKEN_CACHE_TTL
+        return cls(cache_dir=cache_dir, host=host, port=port, user=user, secret=secret, ttl=ttl)
+
+    @property
+    def path(self):
+        """
+        path Getter for cache file path
+
+        Returns
+        -------
+        str
+            Path of the cache file
+        """
+        return self.__path
+
+    @property
+    def restored(self):
+        """
+        restored Getter for cache usage
+
+        Returns
+        -------
+        bool
+            True if a cached session has been used instead of a login
+        """
+        return self.__restored
+
+    def load(self):
+        """
+        load Read cached session, an unreadable cache is ignored
+
+        Returns
+        -------
+        dict
+            Cookies and headers of the session, None if no valid session is cached
+        """
+        try:
+            with open(self.__path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != TOKEN_CACHE_VERSION or not hmac.compare_digest(str(data.get('digest', '')), self.__digest):
+            return None
+        if data.get('expires', 0) <= time.time():
+            MODULE_LOGGER.info('Cached session %s is expired', self.__path)
+            return None
+        return data
+
+    def save(self, cookies: dict, headers: dict):
+        """
+        save Write session to cache with restricted permissions
+
+        Parameters
+        ----------
+        cookies : dict
+            Session cookies
+        headers : dict
+            Session headers
+        """
+        data = {'version': TOKEN_CACHE_VERSION, 'digest': self.__digest, 'expires': time.time() + self.__ttl,
+                'cookies': cookies, 'headers': headers}
+        try:
+            os.makedirs(self.__dir, mode=0o700, exist_ok=True)
+            os.chmod(self.__dir, 0o700)
+            descriptor, temp_path = tempfile.mkstemp(dir=self.__dir, suffix='.tmp')
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as cache_file:
+                json.dump(data, cache_file)
+            os.replace(temp_path, self.__path)
+        except OSError as error:
+            MODULE_LOGGER.warning('Cannot write token cache %s: %s', self.__path, str(error))
+
+    def remove(self):
+        """
+        remove Drop cached session
+        """
+        try:
+            os.remove(self.__path)
+        except OSError:
+            pass
+
+    def attach(self, client):
+        """
+        attach Use cache for login of a CvpClient
+
+        First login of client restores the cached session without any request
+        to Cloudvision. Any other login, including the one cvprac runs when
+        Cloudvision answers with an unauthorized error, is a real login and
+        its session is saved in cache.
+
+        Parameters
+        ----------
+        client : CvpClient
+            Client not yet connected
+        """
+        login = client._login  # pylint: disable=protected-access
+        state = {'first': True}
+
+        def cached_login():
+            if state['first']:
+                state['first'] = False
+                data = self.load()
+                if data is not None:
+                    client.cookies = cookiejar_from_dict(data['cookies'])
+                    client.headers.update(data['headers'])
+                    if client.api_token is not None:
+                        client.headers['Authorization'] = 'Bearer {0}'.format(client.api_token)
+                    self.__restored = True
+                    MODULE_LOGGER.info('Reuse cached session %s', self.__path)
+                    return None
+            try:
+                result = login()
+            except Exception:
+                self.remove()
+                raise
+            self.save(cookies=dict_from_cookiejar(client.cookies) if client.cookies is not None else {},
+                      headers={key: client.headers[key] for key in TOKEN_CACHE_HEADERS if key in client.headers})
+            return result
+
+        client._login = cached_login  # pylint: disable=protected-access
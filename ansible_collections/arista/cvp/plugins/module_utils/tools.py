@@ -62,30 +62,31 @@ def str_cleanup_line_ending(content):
     return None
 
 
-def compare(fromText, toText, fromName='', toName='', lines=10):
+def compare(fromText, toText, fromName='', toName='', lines=10, with_diff=True):
     """ Compare text string in 'fromText' with 'toText' and produce
           a boolean to indicate if there is a diff between them, along
           with a unified diff list.
           Boolean - False if the sequences are identical, True if they are not.
-          Unified diff list:
+          Unified diff list is only generated when sequences are different
+          and with_diff is True, otherwise an empty list is returned:
           Code    Meaning
           '- '    line unique to sequence 1
           '+ '    line unique to sequence 2
           '  '    line common to both sequences
           '? '    line not present in either input sequence
     """
-    fromlines = str_cleanup_line_ending(content=fromText).splitlines(1)
-    tolines = str_cleanup_line_ending(content=toText).splitlines(1)
-    diff = list(difflib.unified_diff(
-        fromlines, tolines, fromName, toName, n=lines))
     # Calculate and compare hash values to produce the boolean.
     fromHash = hashlib.sha1(fromText.encode()).hexdigest()
     toHash = hashlib.sha1(toText.encode()).hexdigest()
     if fromHash == toHash:
-        cfglet_changed = False
-    else:
-        cfglet_changed = True
-    return [cfglet_changed, diff]
+        return [False, list()]
+    diff = list()
+    if with_diff:
+        fromlines = str_cleanup_line_ending(content=fromText).splitlines(1)
+        tolines = str_cleanup_line_ending(content=toText).splitlines(1)
+        diff = list(difflib.unified_diff(
+            fromlines, tolines, fromName, toName, n=lines))
+    return [True, diff]
 
 
 def isIterable(testing_object=None):
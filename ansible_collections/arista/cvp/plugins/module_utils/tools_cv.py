@@ -24,6 +24,11 @@ __metaclass__ = type
 import logging
 import traceback
 from ansible.module_utils.connection import Connection
+from ansible_collections.arista.cvp.plugins.module_utils.session_broker import CvSessionBroker, broker_idle_timeout
+from ansible_collections.arista.cvp.plugins.module_utils.token_cache import CvTokenCache
+from ansible_collections.arista.cvp.plugins.module_utils.connection_pool import CvConnectionPool
+from ansible_collections.arista.cvp.plugins.module_utils.rate_limiter import CvRateLimiter
+from ansible_collections.arista.cvp.plugins.module_utils.api_retry import CvApiRetry
 try:
     from cvprac.cvp_client import CvpClient
     from cvprac.cvp_client_errors import CvpLoginError
@@ -40,6 +45,13 @@ def cv_connect(module):
     cv_connect CV Connection method.
 
     Generic Cloudvision connection method to connect to either on-prem or cvaas instances.
+    When ANSIBLE_CVP_SESSION_BROKER is set, session is shared with next modules
+    through a local session broker instead of running a login for each module.
+    When ANSIBLE_CVP_TOKEN_CACHE is set, a cached session is reused instead of
+    running a login. HTTP connection pool is configured with ANSIBLE_CVP_POOL_*
+    and ANSIBLE_CVP_KEEPALIVE variables. API calls are rate limited when
+    ANSIBLE_CVP_RATE_LIMIT is set. Transient failures of API calls are retried
+    unless ANSIBLE_CVP_API_RETRIES is set to 0.
 
     Parameters
     ----------
@@ -49,9 +61,9 @@ def cv_connect(module):
     Returns
     -------
     CvpClient
-        Instanciated CvpClient with connection information.
+        Instanciated CvpClient with connection information, or CvBrokerClient
+        when session is served by a session broker.
     """
-    client = CvpClient()
     LOGGER.info('Connecting to CVP')
     connection = Connection(module._socket_path)
     host = connection.get_option("host")
@@ -74,27 +86,95 @@ def cv_connect(module):
                  str(host),
                  str(ansible_connect_timeout),
                  str(ansible_command_timeout))
-    try:
-        client.connect(nodes=[host],
-                       username=user,
-                       cvaas_token=cvaas_token,
-                       password=user_authentication,
-                       protocol="https",
-                       is_cvaas=is_cvaas,
-                       port=port,
-                       cert=cert_validation,
-                       request_timeout=ansible_command_timeout,
-                       connect_timeout=ansible_connect_timeout
-                       )
-    except CvpLoginError as e:
-        module.fail_json(msg=str(e))
-        LOGGER.error('Cannot connect to CVP: %s', str(e))
-
-    LOGGER.info('Connected to CVP')
+
+    connection_pool = CvConnectionPool.from_env()
+    if connection_pool is not None:
+        LOGGER.debug('  HTTP pool configured with %s connections per host',
+                     str(connection_pool.pool_maxsize))
+
+    def login():
+        client = CvpClient()
+        token_cache = CvTokenCache.from_env(host=host,
+                                            port=port,
+                                            user=connection.get_option("remote_user"),
+                                            secret=connection.get_option("password"))
+        if token_cache is not None:
+            token_cache.attach(client)
+        # Attached last so pool is also configured when a cached session is restored
+        if connection_pool is not None:
+            connection_pool.attach(client)
+        try:
+            client.connect(nodes=[host],
+                           username=user,
+                           cvaas_token=cvaas_token,
+                           password=user_authentication,
+                           protocol="https",
+                           is_cvaas=is_cvaas,
+                           port=port,
+                           cert=cert_validation,
+                           request_timeout=ansible_command_timeout,
+                           connect_timeout=ansible_connect_timeout
+                           )
+        except CvpLoginError as e:
+            module.fail_json(msg=str(e))
+            LOGGER.error('Cannot connect to CVP: %s', str(e))
+        if token_cache is not None and token_cache.restored:
+            LOGGER.info('  Reuse cached CV session from %s', token_cache.path)
+        return client
+
+    client = None
+    broker_timeout = broker_idle_timeout()
+    if broker_timeout > 0 and not connection.get_option("password"):
+        # Broker requests are authenticated with the password or token
+        LOGGER.warning('Session broker is disabled: no password or token to authenticate requests')
+        broker_timeout = 0
+    if broker_timeout > 0:
+        broker = CvSessionBroker(host=host,
+                                 port=port,
+                                 user=connection.get_option("remote_user"),
+                                 secret=connection.get_option("password"),
+                                 timeout=ansible_command_timeout)
+        client = broker.connect(fallback=login)
+        if client is not None:
+            LOGGER.info('Connected to CVP using session broker')
+
+    if client is None:
+        client = login()
+        LOGGER.info('Connected to CVP')
+        if broker_timeout > 0:
+            broker.spawn(client=client, idle_timeout=broker_timeout)
+
+    rate_limiter = CvRateLimiter.from_env()
+    if rate_limiter is not None:
+        LOGGER.debug('  API calls limited to %s requests per second', str(rate_limiter.rate))
+        rate_limiter.attach(client)
+
+    # Attached last so every retry is also rate limited
+    api_retry = CvApiRetry.from_env()
+    if api_retry is not None:
+        api_retry.attach(client)
 
     return client
 
 
+def cv_report_retries(client, result: dict):
+    """
+    cv_report_retries Add API retries summary to module output
+
+    Summary is only added when at least one API call has been retried.
+
+    Parameters
+    ----------
+    client : CvpClient
+        Client built by cv_connect
+    result : dict
+        Module output
+    """
+    api_retry = getattr(client.api, 'retry', None) if client is not None else None
+    if isinstance(api_retry, CvApiRetry) and api_retry.summary['retries'] > 0:
+        result['api_retries'] = api_retry.summary
+
+
 def isIterable(testing_object=None):
     """
     Test if an object is iterable or not.
@@ -25,6 +25,7 @@ __metaclass__ = type
 import logging
 import traceback
 import json
+from collections import deque
 from ansible.module_utils.six import string_types
 try:
     from treelib import Tree
@@ -93,31 +94,91 @@ def tree_to_list(json_data, myList):
     # Cast input to be encoded as JSON structure.
     if isinstance(json_data, str):
         json_data = json.loads(json_data)
-    # If it is a dictionary object,
-    # it means we have to go through it to extract content
-    if isinstance(json_data, dict):
-        # Get key as it is a container name we want to save.
-        for k1, v1 in json_data.items():
-            # Ensure we are getting children element.
-            if isinstance(v1, dict):
-                for k2, v2 in v1.items():
-                    if 'children' == k2:
-                        # Save entry as we are dealing with an object to create
-                        myList.append(k1)
-                        for e in v2:
-                            # Move to next element with a recursion
-                            tree_to_list(
-                                json_data=json.dumps(e), myList=myList)
-    # We are facing a end of a branch with a list of leaves.
-    elif isinstance(json_data, list):
-        for entry in json_data:
+    # Walk tree depth first using a stack to keep same order as a recursion
+    stack = [json_data]
+    while stack:
+        entry = stack.pop()
+        # If it is a dictionary object,
+        # it means we have to go through it to extract content
+        if isinstance(entry, dict):
+            next_entries = list()
+            # Get key as it is a container name we want to save.
+            for k1, v1 in entry.items():
+                # Ensure we are getting children element.
+                if isinstance(v1, dict) and 'children' in v1:
+                    # Save entry as we are dealing with an object to create
+                    next_entries.append(k1)
+                    next_entries.extend(v1['children'])
+            stack.extend(reversed(next_entries))
+        # We are facing a end of a branch with a list of leaves.
+        elif isinstance(entry, list):
+            for leaf in entry:
+                myList.append(leaf)
+        # We are facing a end of a branch with a single leaf.
+        elif isinstance(entry, string_types):
             myList.append(entry)
-    # We are facing a end of a branch with a single leaf.
-    elif isinstance(json_data, string_types):
-        myList.append(json_data)
     return myList
 
 
+def tree_build_from_index(children, root='Tenant'):
+    """
+    Build a tree from a parent to children index.
+
+    Containers are attached to the tree from root to the bottom, so every
+    container is processed only once.
+
+    Parameters
+    ----------
+    children : dict
+        List of children container names indexed by parent container name
+    root: string, optional
+        Name of container to consider as root for topology, by default Tenant
+
+    Returns
+    -------
+    Tree
+        treelib Tree of containers
+    """
+    tree = Tree()
+    # Create root node to mimic CVP behavior
+    tree.create_node(root, root)
+    queue = deque([root])
+    while queue:
+        parent = queue.popleft()
+        for container_name in children.get(parent, list()):
+            if tree.contains(container_name):
+                continue
+            LOGGER.debug('create new node with: %s', str(container_name))
+            tree.create_node(container_name, container_name, parent=parent)
+            queue.append(container_name)
+    return tree
+
+
+def tree_check_orphans(tree, containers, root='Tenant'):
+    """
+    Check all containers are part of the tree.
+
+    Parameters
+    ----------
+    tree : Tree
+        treelib Tree of containers
+    containers : list
+        List of container names expected in the tree
+    root: string, optional
+        Name of container used as root for topology, by default Tenant
+
+    Raises
+    ------
+    ValueError
+        If a container is not attached to root container
+    """
+    orphans = [container_name for container_name in containers if not tree.contains(container_name)]
+    if len(orphans) > 0:
+        LOGGER.error('Following containers are not attached to %s: %s', str(root), str(orphans))
+        raise ValueError('Following containers have a missing or cyclic parent and cannot be attached to {}: {}'.format(
+            root, ', '.join(orphans)))
+
+
 def tree_build_from_dict(containers=None, root='Tenant'):
     """
     Build a tree based on a unsorted dictConfig(config).
@@ -157,34 +218,16 @@ def tree_build_from_dict(containers=None, root='Tenant'):
     json
         tree topology
     """
-    # Create tree object
-    tree = Tree()  # Create the base node
-    previously_created = list()
-    # Create root node to mimic CVP behavior
     LOGGER.debug('containers list is %s', str(containers))
     LOGGER.debug('root container is set to: %s', str(root))
-    tree.create_node(root, root)
-    # Iterate for first level of containers directly attached under root.
+    # Build index of children for every parent
+    children = dict()
     for container_name, container_info in containers.items():
-        if container_info['parent_container'] in [root]:
-            previously_created.append(container_name)
-            tree.create_node(container_name, container_name,
-                             parent=container_info['parent_container'])
-            LOGGER.debug(
-                'create root tree entry with: %s', str(container_name))
-    # Loop since expected tree is not equal to number of entries in container topology
-    while (len(tree.all_nodes()) < len(containers) + 1):
-        LOGGER.debug(
-            ' Tree has size: %s - Containers has size: %s', str(len(tree.all_nodes())), str(len(containers)))
-        for container_name, container_info in containers.items():
-            if tree.contains(container_info['parent_container']) and container_info['parent_container'] not in [root]:
-                try:
-                    LOGGER.debug(
-                        'create new node with: %s', str(container_name))
-                    tree.create_node(container_name, container_name,
-                                     parent=container_info['parent_container'])
-                except:  # noqa E722
-                    continue
+        if container_name == root:
+            continue
+        children.setdefault(container_info['parent_container'], list()).append(container_name)
+    tree = tree_build_from_index(children=children, root=root)
+    tree_check_orphans(tree=tree, containers=containers.keys(), root=root)
     return tree.to_json()
 
 
@@ -233,32 +276,15 @@ def tree_build_from_list(containers, root='Tenant'):
     json
         tree topology
     """
-    # Create tree object
-    tree = Tree()  # Create the base node
-    previously_created = list()
-    # Create root node to mimic CVP behavior
     LOGGER.debug('containers list is %s', str(containers))
-    tree.create_node(root, root)
-    # Iterate for first level of containers directly attached under root.
+    # Build index of children for every parent
+    children = dict()
     for cvp_container in containers:
-        if cvp_container['parentName'] is None:
+        if cvp_container['parentName'] is None or cvp_container['name'] == root:
             continue
-        if cvp_container['parentName'] in [root]:
-            LOGGER.debug(
-                'found container attached to %s: %s', str(root), str(cvp_container))
-            previously_created.append(cvp_container['name'])
-            tree.create_node(
-                cvp_container['name'], cvp_container['name'], parent=cvp_container['parentName'])
-    # Loop since expected tree is not equal to number of entries in container topology
-    while len(tree.all_nodes()) < len(containers):
-        for cvp_container in containers:
-            # and cvp_container['parentName'] not in ['Tenant']
-            if tree.contains(cvp_container['parentName']):
-                try:
-                    tree.create_node(
-                        cvp_container['name'], cvp_container['name'], parent=cvp_container['parentName'])
-                except:  # noqa E722
-                    continue
+        children.setdefault(cvp_container['parentName'], list()).append(cvp_container['name'])
+    tree = tree_build_from_index(children=children, root=root)
+    tree_check_orphans(tree=tree, containers=[x['name'] for x in containers if x['parentName'] is not None], root=root)
     return tree.to_json()
 
 
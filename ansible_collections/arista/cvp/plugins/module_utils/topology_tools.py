@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# flake8: noqa: W1202
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import logging
+import threading
+from collections import deque
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map_until_error
+
+MODULE_LOGGER = logging.getLogger('arista.cvp.topology_tools')
+
+# CONSTANTS for container operations
+OPERATION_ADD = 'add'
+OPERATION_DELETE = 'delete'
+
+
+def sort_topology(topology: dict, parent_field: str, root_name: str):
+    """
+    sort_topology Build list of containers using a topological sort (Kahn algorithm)
+
+    Containers attached to root container or to a container not defined in topology are used
+    as starting points. Containers with a parent not defined in topology are saved as orphans
+    and expected to exist on Cloudvision.
+    Containers part of a cycle cannot be sorted and are saved as cyclic containers.
+
+    Example
+    -------
+    >>> sort_topology(topology={'DC1': {'parentContainerName': 'Tenant'}},
+    ...               parent_field='parentContainerName', root_name='Tenant')
+    (['DC1'], [['DC1']], [], [])
+
+    Parameters
+    ----------
+    topology : dict
+        Containers topology indexed by container name
+    parent_field : str
+        Field where parent container name is defined
+    root_name : str
+        Name of the root container
+
+    Returns
+    -------
+    tuple
+        Ordered list of containers, list of levels, list of orphans and list of cyclic containers
+    """
+    MODULE_LOGGER.info("Build list of container to create from %s", str(topology))
+    children = dict()
+    root_containers = list()
+    orphans = list()
+    for container_name, container_data in topology.items():
+        parent_name = container_data[parent_field]
+        if parent_name == root_name:
+            root_containers.append(container_name)
+        elif parent_name in topology:
+            children.setdefault(parent_name, list()).append(container_name)
+        else:
+            orphans.append(container_name)
+    if len(orphans) > 0:
+        MODULE_LOGGER.warning('Following containers dont have a parent present in the topology %s',
+                              str(orphans))
+
+    ordered = list()
+    levels = list()
+    queue = deque([(x, 0) for x in root_containers + orphans])
+    while queue:
+        container_name, level = queue.popleft()
+        ordered.append(container_name)
+        if level == len(levels):
+            levels.append(list())
+        levels[level].append(container_name)
+        queue.extend([(x, level + 1) for x in children.get(container_name, list())])
+
+    # Remaining containers are part of a parent loop
+    cyclic = list()
+    if len(ordered) < len(topology):
+        sorted_containers = set(ordered)
+        cyclic = [x for x in topology if x not in sorted_containers]
+        MODULE_LOGGER.error('Following containers are part of a parent cycle %s', str(cyclic))
+        ordered = ordered + cyclic
+        levels.append(cyclic)
+    MODULE_LOGGER.info('List of containers to apply on CV: %s', str(ordered))
+    return ordered, levels, orphans, cyclic
+
+
+class SortedTopology(object):
+    """
+    SortedTopology Containers topology sorted from root container to the bottom
+
+    Sorting is computed on first access and reused afterwards.
+    """
+
+    def __init__(self, topology: dict, parent_field: str, root_name: str):
+        self.__topology = topology
+        self.__parent_field = parent_field
+        self.__root_name = root_name
+        self.__sorted = None
+
+    def __sort(self):
+        """
+        __sort Sort topology on first access
+
+        Returns
+        -------
+        tuple
+            Ordered containers, levels, orphans and cyclic containers
+        """
+        if self.__sorted is None:
+            self.__sorted = sort_topology(topology=self.__topology,
+                                          parent_field=self.__parent_field,
+                                          root_name=self.__root_name)
+        return self.__sorted
+
+    @property
+    def ordered_list_containers(self):
+        """
+        ordered_list_containers List of container from root to the bottom
+
+        Returns
+        -------
+        list
+            List of containers
+        """
+        return self.__sort()[0]
+
+    @property
+    def levels_containers(self):
+        """
+        levels_containers List of containers grouped by depth from root to the bottom
+
+        Containers in the same level are independent from each other.
+
+        Returns
+        -------
+        list
+            List of container lists, one list per level
+        """
+        return self.__sort()[1]
+
+    @property
+    def orphan_containers(self):
+        """
+        orphan_containers List of containers with a parent not defined in topology
+
+        Returns
+        -------
+        list
+            List of containers
+        """
+        return self.__sort()[2]
+
+    @property
+    def cyclic_containers(self):
+        """
+        cyclic_containers List of containers part of a parent cycle
+
+        Returns
+        -------
+        list
+            List of containers
+        """
+        return self.__sort()[3]
+
+
+class CvTopologyStager(object):
+    """
+    CvTopologyStager Stage topology changes on Cloudvision and commit them with one save-topology
+
+    Container additions and deletions of a topology level are staged concurrently
+    as temporary actions, then the whole level is saved at once and verified
+    against a fresh containers snapshot. Configlet actions can be batched the
+    same way with a single save-topology sent after the last one.
+    """
+
+    def __init__(self, cv_connection, snapshot, parallelism: int = 1):
+        self.__cvp_client = cv_connection
+        self.__snapshot = snapshot
+        self.__parallelism = parallelism
+        self.__staged = list()
+        self.__lock = threading.Lock()
+
+    @property
+    def parallelism(self):
+        """
+        parallelism Getter for number of containers staged concurrently
+
+        Returns
+        -------
+        int
+            Maximum number of concurrent workers
+        """
+        return self.__parallelism
+
+    def stage_container(self, operation: str, container_name: str, parent_name: str,
+                        parent_key: str, container_key: str = 'new_container'):
+        """
+        stage_container Stage a container addition or deletion without saving topology
+
+        Parameters
+        ----------
+        operation : str
+            Container operation: add or delete
+        container_name : str
+            Name of the container
+        parent_name : str
+            Name of the parent container
+        parent_key : str
+            Key of the parent container
+        container_key : str, optional
+            Key of the container, by default 'new_container' for additions
+        """
+        msg = '{} container {} under container {}'.format(operation, container_name, parent_name)
+        action = {'info': msg, 'infoPreview': msg, 'action': operation, 'nodeType': 'container',
+                  'nodeId': container_key, 'toId': '', 'fromId': '', 'nodeName': container_name,
+                  'fromName': '', 'toName': '', 'childTasks': [], 'parentTask': '',
+                  'toIdType': 'container'}
+        if operation == OPERATION_ADD:
+            action.update({'toId': parent_key, 'toName': parent_name})
+        else:
+            action.update({'fromId': parent_key, 'fromName': parent_name})
+        MODULE_LOGGER.debug('Staging action: %s', msg)
+        api = self.__cvp_client.api
+        api._add_temp_action({'data': [action]})  # pylint: disable=protected-access
+        with self.__lock:
+            self.__staged.append((container_name, operation))
+
+    def save_topology(self):
+        """
+        save_topology Commit all actions staged in the session with a single save-topology
+
+        Returns
+        -------
+        list
+            List of taskIds generated by Cloudvision, None if save-topology failed
+        """
+        MODULE_LOGGER.info('Saving topology for staged actions')
+        response = self.__cvp_client.api._save_topology_v2([])  # pylint: disable=protected-access
+        if response is None or response.get('data', dict()).get('status') != 'success':
+            MODULE_LOGGER.error('Save-topology failed: %s', str(response))
+            return None
+        return response['data'].get('taskIds', list())
+
+    def save_containers(self):
+        """
+        save_containers Commit staged container actions and check them against Cloudvision
+
+        Returns
+        -------
+        tuple
+            List of taskIds and list of error messages
+        """
+        with self.__lock:
+            staged, self.__staged = self.__staged, list()
+        if len(staged) == 0:
+            return list(), list()
+        task_ids = self.save_topology()
+        if task_ids is None:
+            names = ', '.join([container_name for container_name, _ in staged])
+            return list(), ['Error saving topology for containers {}'.format(names)]
+        self.__snapshot.refresh_containers()
+        existing = {container['name'] for container in self.__snapshot.containers}
+        errors = list()
+        for container_name, operation in staged:
+            if (operation == OPERATION_ADD) != (container_name in existing):
+                errors.append('Error saving {} of container {} on CV'.format(operation,
+                                                                             container_name))
+        MODULE_LOGGER.info('Topology saved for %s containers with %s errors',
+                           str(len(staged)), str(len(errors)))
+        return task_ids, errors
+
+    def run_level(self, worker, containers: list):
+        """
+        run_level Run a container worker on all containers of a topology level
+
+        When parallelism is greater than 1, workers stage their change concurrently
+        and the level is committed with a single save-topology. Otherwise workers
+        are called without stager and send their own change.
+
+        Parameters
+        ----------
+        worker : callable
+            Function called with container and stager arguments, returns a CvApiResult
+        containers : list
+            Names of the containers of the level
+
+        Returns
+        -------
+        tuple
+            List of worker results and list of error messages
+        """
+        stager = self if self.__parallelism > 1 else None
+        results, errors = parallel_map_until_error(
+            function=lambda x: worker(container=x, stager=stager),
+            items=containers, max_workers=self.__parallelism)
+        if len(errors) > 0 or stager is None:
+            return results, errors
+        task_ids, errors = self.save_containers()
+        changed = [result for result in results if result.changed]
+        if len(changed) > 0:
+            changed[-1].taskIds = task_ids
+        return results, errors
+
+    def run_actions(self, actions: list, batch_mode: bool = False):
+        """
+        run_actions Execute a list of topology actions and report their results
+
+        In batch mode, all actions are staged on Cloudvision and committed with
+        a single save-topology once they have all run. Staged actions are reported
+        as changed without taskIds: tasks generated by the save-topology are
+        reported by the last changed action.
+
+        Parameters
+        ----------
+        actions : list
+            List of tuples (CvManagerResult, worker, worker arguments)
+        batch_mode : bool, optional
+            Commit all actions with a single save-topology, by default False
+
+        Returns
+        -------
+        list
+            List of error messages
+        """
+        results = [(manager, worker(save_topology=not batch_mode, **kwargs))
+                   for manager, worker, kwargs in actions]
+        errors = list()
+        changed = [result for _, result in results if result.changed]
+        if batch_mode and len(changed) > 0:
+            task_ids = self.save_topology()
+            if task_ids is None:
+                errors.append('Error saving topology for {} staged changes'.format(len(changed)))
+            else:
+                changed[-1].taskIds = task_ids
+        for manager, result in results:
+            manager.add_change(result)
+        return errors
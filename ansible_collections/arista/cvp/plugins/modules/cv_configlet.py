@@ -50,8 +50,14 @@ options:
     type: str
   cvp_facts:
     description: Facts extracted from CVP servers using cv_facts module
-    required: true
+    required: false
     type: dict
+  cvp_facts_file:
+    description:
+      - Path of a facts file written by cv_facts with facts_file option.
+      - Alternative to cvp_facts to avoid passing facts as module arguments.
+    required: false
+    type: path
   configlet_filter:
     description: Filter to apply intended mode on a set of configlet.
                  If not used, then module only uses ADD mode. configlet_filter
@@ -118,6 +124,7 @@ import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pyl
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
 import ansible_collections.arista.cvp.plugins.module_utils.tools as tools
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v1 as schema
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import load_cvp_facts
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_configlet')
 MODULE_LOGGER.info('Start cv_configlet module execution')
@@ -663,7 +670,8 @@ def main():
     argument_spec = dict(
         configlets=dict(type='dict', required=True),
         configlets_notes=dict(type='str', default='Managed by Ansible', required=False),
-        cvp_facts=dict(type='dict', required=True),
+        cvp_facts=dict(type='dict', required=False),
+        cvp_facts_file=dict(type='path', required=False),
         configlet_filter=dict(type='list', default='none', elements='str'),
         filter_mode=dict(type='str',
                          choices=['loose', 'strict'],
@@ -675,8 +683,13 @@ def main():
                    required=False))
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['cvp_facts', 'cvp_facts_file']],
+                           mutually_exclusive=[['cvp_facts', 'cvp_facts_file']],
                            supports_check_mode=True)
 
+    # Read facts from file generated by cv_facts when provided
+    load_cvp_facts(module=module)
+
     MODULE_LOGGER.info('starting module cv_configlet')
     if module.check_mode:
         MODULE_LOGGER.warning('! check_mode is enable')
@@ -709,6 +722,8 @@ def main():
 
     # Pass module params to configlet_action to act on configlet
     result = action_manager(module)
+    if not module.check_mode:
+        tools_cv.cv_report_retries(client=module.client, result=result)
 
     module.exit_json(**result)
 
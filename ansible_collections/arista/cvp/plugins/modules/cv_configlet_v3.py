@@ -49,6 +49,13 @@ options:
     required: false
     default: 'Managed by Ansible'
     type: str
+  diff_budget:
+    description:
+        - Maximum number of changed configlets for which a unified diff is generated.
+        - Unified diff is always generated when ansible runs with --diff.
+    required: false
+    default: 0
+    type: int
   state:
     description:
         - If absent, configlets will be removed from CVP if they are not bound
@@ -140,7 +147,10 @@ def main():
                    choices=['present', 'absent']),
         configlets_notes=dict(type='str',
                               default='Managed by Ansible',
-                              required=False)
+                              required=False),
+        diff_budget=dict(type='int',
+                         default=0,
+                         required=False)
     )
 
     # Make module global to use it in all functions when required
@@ -172,7 +182,7 @@ def main():
 
     # Instantiate data
     cv_configlet_manager = CvConfigletTools(
-        cv_connection=cv_client, ansible_module=ansible_module)
+        cv_connection=cv_client, ansible_module=ansible_module, diff_budget=ansible_module.params['diff_budget'])
 
     # if ansible_module.check_mode is True:
     #     ansible_module.fail_json(msg="Not yet implemented !")
@@ -180,6 +190,7 @@ def main():
     cv_response: CvAnsibleResponse = cv_configlet_manager.apply(
         configlet_list=user_configlets.configlets, present=is_present, note=ansible_module.params['configlets_notes'])
     result = cv_response.content
+    tools_cv.cv_report_retries(client=cv_client, result=result)
 
     ansible_module.exit_json(**result)
 
@@ -41,8 +41,14 @@ options:
     type: dict
   cvp_facts:
     description: Facts from CVP collected by cv_facts module
-    required: true
+    required: false
     type: dict
+  cvp_facts_file:
+    description:
+      - Path of a facts file written by cv_facts with facts_file option.
+      - Alternative to cvp_facts to avoid passing facts as module arguments.
+    required: false
+    type: path
   mode:
     description: Allow to save topology or not
     required: false
@@ -100,6 +106,7 @@ import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
 import ansible_collections.arista.cvp.plugins.module_utils.tools as tools
 import ansible_collections.arista.cvp.plugins.module_utils.tools_tree as tools_tree
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v1 as schema
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import load_cvp_facts
 from ansible.module_utils.basic import AnsibleModule
 
 # List of Ansible default containers
@@ -211,7 +218,10 @@ def create_new_containers(module, intended, facts):
     # Get root container of topology
     topology_root = tools_tree.get_root_container(containers_fact=facts['containers'])
     # Build ordered list of containers to create: from Tenant to leaves.
-    container_intended_tree = tools_tree.tree_build_from_dict(containers=intended, root=topology_root)
+    try:
+        container_intended_tree = tools_tree.tree_build_from_dict(containers=intended, root=topology_root)
+    except ValueError as error:
+        module.fail_json(msg=str(error))
     MODULE_LOGGER.debug("The ordered dict is: %s", str(container_intended_tree))
     container_intended_ordered_list = tools_tree.tree_to_list(json_data=container_intended_tree, myList=list())
     MODULE_LOGGER.debug("The ordered list is: %s", str(container_intended_ordered_list))
@@ -324,12 +334,14 @@ def delete_unused_containers(module, intended, facts):
     # Get root container for the topology
     topology_root = tools_tree.get_root_container(containers_fact=facts['containers'])
 
-    # Build a tree of containers configured on CVP
-    container_cvp_tree = tools_tree.tree_build_from_list(containers=facts['containers'], root=topology_root)
+    try:
+        # Build a tree of containers configured on CVP
+        container_cvp_tree = tools_tree.tree_build_from_list(containers=facts['containers'], root=topology_root)
+        # Build a tree of containers expected to be configured on CVP
+        container_intended_tree = tools_tree.tree_build_from_dict(containers=intended, root=topology_root)
+    except ValueError as error:
+        module.fail_json(msg=str(error))
     container_cvp_ordered_list = tools_tree.tree_to_list(json_data=container_cvp_tree, myList=list())
-
-    # Build a tree of containers expected to be configured on CVP
-    container_intended_tree = tools_tree.tree_build_from_dict(containers=intended, root=topology_root)
     container_intended_ordered_list = tools_tree.tree_to_list(json_data=container_intended_tree, myList=list())
 
     container_to_delete = list()
@@ -734,14 +746,17 @@ def delete_topology(module, intended, facts):
     MODULE_LOGGER.info('relative topology root is: %s', str(topology_root))
     # Build a tree of containers configured on CVP
     MODULE_LOGGER.info('build tree topology from facts topology')
-    container_cvp_tree = tools_tree.tree_build_from_list(
-        containers=facts['containers'], root=topology_root)
+    try:
+        container_cvp_tree = tools_tree.tree_build_from_list(
+            containers=facts['containers'], root=topology_root)
+        # Build a tree of containers expected to be deleted from CVP
+        MODULE_LOGGER.info('build tree topology from intended topology')
+        container_intended_tree = tools_tree.tree_build_from_dict(
+            containers=intended, root=topology_root_relative)
+    except ValueError as error:
+        module.fail_json(msg=str(error))
     container_cvp_ordered_list = tools_tree.tree_to_list(json_data=container_cvp_tree, myList=list())  # noqa # pylint: disable=unused-variable
 
-    # Build a tree of containers expected to be deleted from CVP
-    MODULE_LOGGER.info('build tree topology from intended topology')
-    container_intended_tree = tools_tree.tree_build_from_dict(
-        containers=intended, root=topology_root_relative)
     container_intended_ordered_list = tools_tree.tree_to_list(json_data=container_intended_tree, myList=list())
 
     MODULE_LOGGER.info('container_intended_ordered_list %s', container_intended_ordered_list)
@@ -813,7 +828,8 @@ def main():
     """
     argument_spec = dict(
         topology=dict(type='dict', required=True),
-        cvp_facts=dict(type='dict', required=True),
+        cvp_facts=dict(type='dict', required=False),
+        cvp_facts_file=dict(type='path', required=False),
         configlet_filter=dict(type='list', default='none', elements='str'),
         mode=dict(type='str',
                   required=False,
@@ -822,8 +838,13 @@ def main():
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['cvp_facts', 'cvp_facts_file']],
+                           mutually_exclusive=[['cvp_facts', 'cvp_facts_file']],
                            supports_check_mode=True)
 
+    # Read facts from file generated by cv_facts when provided
+    load_cvp_facts(module=module)
+
     MODULE_LOGGER.info('starting module cv_container')
     if module.check_mode:
         MODULE_LOGGER.warning('! check_mode is enable')
@@ -924,6 +945,9 @@ def main():
     # DEPRECATION: Make a copy to support old namespace.
     result['cv_container'] = result['data']
 
+    if not module.check_mode:
+        tools_cv.cv_report_retries(client=module.client, result=result)
+
     module.exit_json(**result)
 
 
@@ -56,6 +56,21 @@ options:
     default: 'loose'
     choices: ['loose', 'strict']
     type: str
+  batch_mode:
+    description:
+      - Stage configlets changes for all containers and commit them with a single topology save.
+      - Staged changes are reported as changed with no taskIds, all generated tasks are reported by the last changed configlet.
+      - In strict mode, containers with configlets to attach and to detach are saved immediately and not staged.
+    required: false
+    default: false
+    type: bool
+  parallelism:
+    description:
+      - Number of containers of the same level created or deleted concurrently.
+      - When greater than 1, changes of a level are staged concurrently and saved on Cloudvision with a single topology save.
+    required: false
+    default: 1
+    type: int
 '''
 
 EXAMPLES = r'''
@@ -150,7 +165,13 @@ def main():
         apply_mode=dict(type='str',
                         required=False,
                         default='loose',
-                        choices=['loose', 'strict'])
+                        choices=['loose', 'strict']),
+        batch_mode=dict(type='bool',
+                        required=False,
+                        default=False),
+        parallelism=dict(type='int',
+                         required=False,
+                         default=1)
     )
 
     # Make module global to use it in all functions when required
@@ -177,18 +198,24 @@ def main():
         ansible_module.fail_json(
             msg='Error, your input is not valid against current schema:\n {}'.format(*ansible_module.params['topology']))
 
+    if len(user_topology.cyclic_containers) > 0:
+        ansible_module.fail_json(
+            msg='Error, following containers are part of a parent cycle: {}'.format(', '.join(user_topology.cyclic_containers)))
+
     # Create CVPRAC client
     cv_client = tools_cv.cv_connect(ansible_module)
 
     # Instantiate data
     cv_topology = CvContainerTools(
-        cv_connection=cv_client, ansible_module=ansible_module)
+        cv_connection=cv_client, ansible_module=ansible_module, parallelism=ansible_module.params['parallelism'])
 
     cv_response: CvAnsibleResponse = cv_topology.build_topology(
-        user_topology=user_topology, present=state_present, apply_mode=ansible_module.params['apply_mode'])
+        user_topology=user_topology, present=state_present, apply_mode=ansible_module.params['apply_mode'],
+        batch_mode=ansible_module.params['batch_mode'])
     MODULE_LOGGER.debug(
         'Received response from Topology builder: %s', str(cv_response))
     result = cv_response.content
+    tools_cv.cv_report_retries(client=cv_client, result=result)
 
     ansible_module.exit_json(**result)
 
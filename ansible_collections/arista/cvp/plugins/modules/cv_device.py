@@ -43,8 +43,14 @@ options:
     type: dict
   cvp_facts:
     description: Facts from CVP collected by cv_facts module
-    required: true
+    required: false
     type: dict
+  cvp_facts_file:
+    description:
+      - Path of a facts file written by cv_facts with facts_file option.
+      - Alternative to cvp_facts to avoid passing facts as module arguments.
+    required: false
+    type: path
   device_filter:
     description: Filter to apply intended mode on a set of configlet.
                  If not used, then module only uses ADD mode. device_filter
@@ -127,6 +133,7 @@ from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
 import ansible_collections.arista.cvp.plugins.module_utils.tools as tools
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v1 as schema
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import load_cvp_facts
 
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_device')
@@ -1150,7 +1157,8 @@ def main():
     """
     argument_spec = dict(
         devices=dict(type="dict", required=True),
-        cvp_facts=dict(type="dict", required=True),
+        cvp_facts=dict(type="dict", required=False),
+        cvp_facts_file=dict(type="path", required=False),
         device_filter=dict(type="list", default="all", elements='str'),
         state=dict(
             type="str", choices=["present", "absent"], default="present", required=False
@@ -1161,8 +1169,13 @@ def main():
                             choices=['merge', 'override', 'delete']))
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['cvp_facts', 'cvp_facts_file']],
+                           mutually_exclusive=[['cvp_facts', 'cvp_facts_file']],
                            supports_check_mode=True)
 
+    # Read facts from file generated by cv_facts when provided
+    load_cvp_facts(module=module)
+
     if not tools_cv.HAS_CVPRAC:
         module.fail_json(
             msg='cvprac required for this module. Please install using pip install cvprac')
@@ -1179,6 +1192,8 @@ def main():
         module.client = tools_cv.cv_connect(module)
 
     result = devices_action(module=module)
+    if not module.check_mode:
+        tools_cv.cv_report_retries(client=module.client, result=result)
     module.exit_json(**result)
 
 
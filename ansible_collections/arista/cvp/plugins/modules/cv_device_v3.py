@@ -58,6 +58,11 @@ options:
     default: 'hostname'
     choices: ['fqdn', 'hostname', 'serialNumber']
     type: str
+  parallelism:
+    description: Number of devices processed concurrently when attaching or detaching configlets.
+    required: false
+    default: 1
+    type: int
 '''
 
 EXAMPLES = r'''
@@ -176,7 +181,10 @@ def main():
         search_key=dict(type='str',
                         required=False,
                         default='hostname',
-                        choices=['fqdn', 'hostname', 'serialNumber'])
+                        choices=['fqdn', 'hostname', 'serialNumber']),
+        parallelism=dict(type='int',
+                         required=False,
+                         default=1)
     )
 
     # Make module global to use it in all functions when required
@@ -207,13 +215,15 @@ def main():
     cv_topology = CvDeviceTools(
         cv_connection=cv_client,
         ansible_module=ansible_module,
-        check_mode=ansible_module.check_mode)
+        check_mode=ansible_module.check_mode,
+        parallelism=ansible_module.params['parallelism'])
 
     MODULE_LOGGER.debug('Ansible user inventory is: %s', str(user_topology.devices))
     result = cv_topology.manager(
         user_inventory=user_topology,
         apply_mode=ansible_module.params['apply_mode'],
         search_mode=ansible_module.params['search_key'])
+    tools_cv.cv_report_retries(client=cv_client, result=result)
 
     ansible_module.exit_json(**result)
 
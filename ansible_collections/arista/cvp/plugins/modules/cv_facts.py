@@ -64,6 +64,69 @@ options:
       - containers
       - configlets
       - tasks
+  parallelism:
+    description:
+      - Number of devices to collect facts for concurrently.
+      - Container names are always resolved from a single list of containers.
+    required: false
+    default: 1
+    type: int
+  device_timeout:
+    description:
+      - Maximum time in seconds to collect facts of a single device.
+      - Devices not collected in time are removed from facts with a warning.
+      - HTTP requests sent for a device also use this value as request timeout. Module stops waiting for a device after timeout but its pending request only ends with the HTTP timeout.
+      - 0 means no limit.
+    required: false
+    default: 0
+    type: int
+  cache_dir:
+    description:
+      - Directory where devices facts are cached between runs, one file per Cloudvision host.
+      - Devices details are only collected again when inventory data, applied configlets (using their last change date) or image bundles changed.
+      - Designed configuration is never cached and is always collected when requested.
+      - Cache is disabled when not set.
+    required: false
+    type: path
+  facts_file:
+    description:
+      - Write facts to this local file instead of returning them as ansible_facts.
+      - Module only returns the file path and number of entries per fact.
+      - Use .json for a single JSON document or .jsonl for one entry per line, add .gz to compress.
+      - File can be given to cv_device, cv_container and cv_configlet with cvp_facts_file option.
+    required: false
+    type: path
+  fields:
+    description:
+      - Fields to keep for each fact type, as a list of field names per fact type (devices, containers, configlets, tasks).
+      - Data only used by removed fields is not collected from Cloudvision.
+    required: false
+    type: dict
+  exclude_fields:
+    description:
+      - Fields to remove for each fact type, as a list of field names per fact type (devices, containers, configlets, tasks).
+      - Data only used by removed fields is not collected from Cloudvision.
+    required: false
+    type: dict
+  filters:
+    description:
+      - Regular expressions to select entries per fact type, as a list of patterns per fact type.
+      - Patterns must match the whole name (hostname for devices, name for containers and configlets, workOrderId for tasks).
+      - Entries not selected are not collected from Cloudvision.
+    required: false
+    type: dict
+  config_dir:
+    description:
+      - With gather_subset config, save designed configuration of each device to its own file in this directory.
+      - Facts only contain the path of the file in configFile field instead of the configuration in config field.
+      - Configurations are collected concurrently using parallelism and device_timeout options.
+    required: false
+    type: path
+  config_compress:
+    description: Compress configuration files saved in config_dir with gzip.
+    required: false
+    default: false
+    type: bool
 '''
 
 EXAMPLES = r'''
@@ -95,17 +158,64 @@ EXAMPLES = r'''
           containers
       register: FACTS_CONTAINERS
 
+    - name: '#05 - Collect devices facts with 20 workers and 60 seconds per device'
+      cv_facts:
+        facts:
+          devices
+        parallelism: 20
+        device_timeout: 60
+      register: FACTS_DEVICES
+
+    - name: '#06 - Collect devices facts using a local cache'
+      cv_facts:
+        facts:
+          devices
+        cache_dir: ~/.cache/arista_cvp
+      register: FACTS_DEVICES
+
+    - name: '#07 - Collect ALL facts in a compressed file'
+      cv_facts:
+        facts_file: '{{ playbook_dir }}/cvp_facts.jsonl.gz'
+      register: FACTS_FILE
+
+    - name: '#08 - Configure devices using facts file'
+      cv_device:
+        devices: '{{ CVP_DEVICES }}'
+        cvp_facts_file: '{{ FACTS_FILE.facts_file }}'
+
+    - name: '#09 - Collect only name, MAC address and container of leaf devices'
+      cv_facts:
+        facts:
+          devices
+        fields:
+          devices: ['hostname', 'systemMacAddress', 'parentContainerName']
+        filters:
+          devices: ['leaf.*']
+      register: FACTS_LEAFS
+
     - name: '#10 - Collect ALL facts from {{inventory_hostname}}'
       cv_facts:
       register: FACTS
+
+    - name: '#11 - Backup devices configuration to compressed files'
+      cv_facts:
+        gather_subset:
+          config
+        facts:
+          devices
+        parallelism: 20
+        config_dir: '{{ playbook_dir }}/configs'
+        config_compress: true
+      register: FACTS_CONFIGS
 '''
 
+import re
 import logging
 import traceback  # noqa # pylint: disable=unused-import
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible.module_utils.basic import AnsibleModule
-import ansible_collections.arista.cvp.plugins.module_utils.tools_inventory as tools_inventory
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import CvFactsTools, CvFactsCache, facts_to_file, FACTS_NAME_FIELDS
 
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_facts')
@@ -131,45 +241,12 @@ def facts_devices(module, facts):
         facts with devices content added.
     """
 
-    facts['devices'] = []
-    # Get Inventory Data for All Devices
-    inventory = module.client.api.get_inventory()
-    for device in inventory:
-        MODULE_LOGGER.info('  -> Working on %s', device['hostname'])
-        if 'systemMacAddress' in device and len(device['systemMacAddress']) > 0:
-            device['name'] = device['hostname']
-            # Add designed config for device
-            if 'config' in module.params['gather_subset'] and device['streamingStatus'] == "active":
-                device['config'] = module.client.api.get_device_configuration(device['key'])
-
-            # Add parent container name
-            container = module.client.api.get_container_by_id(device['parentContainerKey'])
-            device['parentContainerName'] = container['name']
-
-            # Add Device Specific Configlets
-            configlets = module.client.api.get_configlets_by_device_id(device['key'])
-            device['deviceSpecificConfiglets'] = []
-            for configlet in configlets:
-                if int(configlet['containerCount']) == 0:
-                    device['deviceSpecificConfiglets'].append(configlet['name'])
-
-            # Add ImageBundle Info
-            device['imageBundle'] = ""
-            deviceInfo = module.client.api.get_device_image_info(
-                device['key'])  # get_device_image_info() from cvprac
-            if "imageBundleMapper" in deviceInfo:
-                # There should only be one ImageBudle but its id is not decernable
-                # If the Image is applied directly to the device its type will be 'netelement'
-                if len(list(deviceInfo['imageBundleMapper'].values())) > 0:
-                    if list(deviceInfo['imageBundleMapper'].values())[0]['type'] == 'netelement':
-                        device['imageBundle'] = deviceInfo['bundleName']
-
-            # Add device to facts list
-            facts['devices'].append(device)
-            MODULE_LOGGER.info('    -> Device added to facts')
-        else:
-            MODULE_LOGGER.error('    ! Device is on Cloudvision but System Mac Address is missing ... skipped')
-
+    facts['devices'] = module.facts_tools.facts_devices(gather_config='config' in module.params['gather_subset'])
+    for hostname in module.facts_tools.timed_out:
+        module.warn('Device {0} not collected in {1} seconds and removed from facts'.format(hostname, module.params['device_timeout']))
+    for hostname in module.facts_tools.config_timed_out:
+        module.warn('Configuration of device {0} not saved in {1} seconds'.format(hostname, module.params['device_timeout']))
+    MODULE_LOGGER.info('All devices facts collected')
     return facts
 
 
@@ -239,57 +316,10 @@ def facts_configlets(module, facts):
     dict
         facts with configlets content added.
     """
-    facts['configlets'] = []
     MODULE_LOGGER.info('Collecting facts v2')
-    configlets_and_mappers = module.client.api.get_configlets_and_mappers()[
-        'data']
-    # Load data to match ID with human readable name
-    inventory = list()
-    containers = list()
-    if 'devices' in facts:
-        MODULE_LOGGER.info('Devices part of facts, using cached version')
-        inventory = facts['devices']
-    else:
-        MODULE_LOGGER.warning(
-            'Devices not part of facts, collecting CV version')
-        inventory = module.client.api.get_inventory()
-    if 'containers' in facts:
-        MODULE_LOGGER.info('Containers part of facts, using cached version')
-        containers = facts['containers']
-    else:
-        MODULE_LOGGER.warning(
-            'Containers not part of facts, collecting CV version')
-        containers = module.client.api.get_containers()['data']
-
-    # Create list of configlets
-    if 'configlets' in configlets_and_mappers:
-        for configlet in configlets_and_mappers['configlets']:
-            configlet['devices'] = list()
-            configlet['containers'] = list()
-            # Parse mapper section to locate potential mappings to devices and containers.
-            MODULE_LOGGER.info('building list of mapping with devices and containers for configlet %s', str(configlet['name']))
-            for mapper in configlets_and_mappers['configletMappers']:
-                # If mapper is tied to our configlet
-                if mapper['configletId'] == configlet['key']:
-                    # If mapper is for device
-                    if mapper['type'] == 'netelement':
-                        device_hostname = tools_inventory.find_hostname_by_mac(
-                            inventory=inventory, mac_address=mapper['objectId'])
-                        if device_hostname is not None:
-                            MODULE_LOGGER.debug('found mapping to device %s', str(device_hostname))
-                            configlet['devices'].append(device_hostname)
-                    # If mapper is for container
-                    if mapper['type'] == 'container':
-                        container_name = tools_inventory.find_containerName_by_containerId(containers_list=containers,
-                                                                                           container_id=mapper['objectId'])
-                        if container_name is not None:
-                            MODULE_LOGGER.debug(
-                                'found mapping to container %s', str(container_name))
-                            configlet['containers'].append(container_name)
-            facts['configlets'].append(configlet)
-    else:
-        MODULE_LOGGER.error('No configlet found on CVP')
-    MODULE_LOGGER.info('All configlets facts collected')
+    # Device and container names are resolved from data shared with other facts,
+    # devices and containers facts may be filtered or projected.
+    facts['configlets'] = module.facts_tools.facts_configlets()
     return facts
 
 
@@ -312,33 +342,7 @@ def facts_containers(module, facts):
         facts with containers content added.
     """
 
-    facts['containers'] = []
-
-    # Get List of all Containers
-    containers = module.client.api.get_containers()['data']
-    for container in containers:
-        MODULE_LOGGER.debug('  -> Working on %s', container['name'])
-        container['devices'] = []
-        # Get list of devices attached to container.
-        applied_devices = module.client.api.get_devices_in_container(container['key'])
-        for device in applied_devices:
-            container['devices'].append(device['fqdn'])
-
-        # Get list of configlets attached to container.
-        container['configlets'] = []
-        applied_configlets = module.client.api.get_configlets_by_container_id(container['key'])['configletList']
-        for configlet in applied_configlets:
-            container['configlets'].append(configlet['name'])
-
-        # Add applied Images
-        container['imageBundle'] = ""
-        applied_images = module.client.api.get_image_bundle_by_container_id(container['key'])['imageBundleList']
-        if len(applied_images) > 0:
-            container['imageBundle'] = applied_images[0]['name']
-
-        # Add container to facts list
-        facts['containers'].append(container)
-
+    facts['containers'] = module.facts_tools.facts_containers()
     return facts
 
 
@@ -386,7 +390,9 @@ def facts_tasks(module, facts):
 
     for task in tasks:
         MODULE_LOGGER.debug('  -> Working on %s', task)
-        facts['tasks'].append(task)
+        if module.facts_tools.is_selected(fact='tasks', entry=task):
+            facts['tasks'].append(task)
+    facts['tasks'] = module.facts_tools.project(fact='tasks', entries=facts['tasks'])
     return facts
 
 
@@ -411,6 +417,20 @@ def facts_builder(module):
     # Get version data for CVP
     MODULE_LOGGER.info('** Collecting CVP Information (version)')
     facts['cvp_info'] = module.client.api.get_cvp_info()
+    # Shared by facts functions to load inventory, containers and configlets only once
+    module.facts_cache = None
+    if module.params['cache_dir'] is not None:
+        module.facts_cache = CvFactsCache(cache_dir=module.params['cache_dir'],
+                                          cache_key=','.join(module.client.nodes))
+    module.facts_tools = CvFactsTools(cv_connection=module.client,
+                                      parallelism=module.params['parallelism'],
+                                      timeout=module.params['device_timeout'],
+                                      cache=module.facts_cache,
+                                      fields=module.params['fields'],
+                                      exclude_fields=module.params['exclude_fields'],
+                                      filters=module.params['filters'],
+                                      config_dir=module.params['config_dir'],
+                                      config_compress=module.params['config_compress'])
 
     # Extract devices facts
     if 'all' in module.params['facts'] or 'devices' in module.params['facts']:
@@ -464,11 +484,52 @@ def main():
                             'containers',
                             'devices',
                             'tasks'],
-                   default='all'))
+                   default='all'),
+        parallelism=dict(type='int',
+                         required=False,
+                         default=1),
+        device_timeout=dict(type='int',
+                            required=False,
+                            default=0),
+        cache_dir=dict(type='path',
+                       required=False,
+                       default=None),
+        facts_file=dict(type='path',
+                        required=False,
+                        default=None),
+        fields=dict(type='dict',
+                    required=False,
+                    default=None),
+        exclude_fields=dict(type='dict',
+                            required=False,
+                            default=None),
+        filters=dict(type='dict',
+                     required=False,
+                     default=None),
+        config_dir=dict(type='path',
+                        required=False,
+                        default=None),
+        config_compress=dict(type='bool',
+                             required=False,
+                             default=False))
 
     module = AnsibleModule(argument_spec=argument_spec,
                            supports_check_mode=True)
 
+    # Validate projection and filters options
+    for option in ['fields', 'exclude_fields', 'filters']:
+        for fact, values in (module.params[option] or dict()).items():
+            if fact not in FACTS_NAME_FIELDS:
+                module.fail_json(msg='Unsupported fact type {0} in {1}, expecting one of {2}'.format(fact, option, ', '.join(FACTS_NAME_FIELDS)))
+            if not isinstance(values, list):
+                module.fail_json(msg='{0} of {1} must be a list'.format(option, fact))
+    for fact, patterns in (module.params['filters'] or dict()).items():
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as error:
+                module.fail_json(msg='Invalid filter {0} for {1}: {2}'.format(pattern, fact, str(error)))
+
     # TODO: Test CVPRAC version as well
     if not tools_cv.HAS_CVPRAC:
         module.fail_json(msg='cvprac required for this module')
@@ -481,7 +542,19 @@ def main():
         module.client = tools_cv.cv_connect(module)
 
         # Get Facts from CVP
-        result['ansible_facts'] = facts_builder(module)
+        facts = facts_builder(module)
+        if module.params['facts_file'] is not None:
+            # Only return path and summary, facts stay on disk
+            try:
+                result['facts_summary'] = facts_to_file(facts=facts, path=module.params['facts_file'])
+            except (OSError, TypeError, ValueError) as error:
+                module.fail_json(msg='Cannot write facts to {0}: {1}'.format(module.params['facts_file'], str(error)))
+            result['facts_file'] = module.params['facts_file']
+        else:
+            result['ansible_facts'] = facts
+        if module.facts_cache is not None:
+            result['facts_cache'] = module.facts_cache.summary
+        tools_cv.cv_report_retries(client=module.client, result=result)
 
     # Standard Ansible outputs
     module.exit_json(**result)
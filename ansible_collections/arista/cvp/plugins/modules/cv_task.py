@@ -76,11 +76,11 @@ EXAMPLES = '''
     wait: 60
 '''
 
-import time
 import logging
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import CvTaskWaiter
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_tasks')
 MODULE_LOGGER.info('Start cv_tasks module execution')
@@ -122,13 +122,6 @@ def state_is_different(task, target):
     return get_state(task) != target
 
 
-def update_all_tasks(cvp, data):
-    new_data = dict()
-    for task_id in data.keys():
-        new_data[task_id] = cvp.get_task_by_id(task_id)
-    return new_data
-
-
 def task_action(module):
     '''
     TODO.
@@ -156,15 +149,9 @@ def task_action(module):
             changed = True
             data[get_id(task)] = task
 
-    start = time.time()
-    now = time.time()
-    while (now - start) < wait:
-        data = update_all_tasks(cvp, data)
-        if all([terminal(get_state(t)) for t in data.values()]):
-            break
-        now = time.time()
-
-    if wait:
+    if wait and len(data) > 0:
+        waiter = CvTaskWaiter(cv_connection=module.client, timeout=wait)
+        data = waiter.wait(task_ids=list(data.keys()))
         for i, task in data.items():
             if not terminal(get_state(task)):
                 warnings.append("Task {0} has not completed in {1} seconds".format(i, wait))
@@ -196,6 +183,7 @@ def main():
 
         if warnings:
             [module.warn(w) for w in warnings]
+        tools_cv.cv_report_retries(client=module.client, result=result)
 
     module.exit_json(**result)
 
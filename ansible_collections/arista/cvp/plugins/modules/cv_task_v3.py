@@ -46,6 +46,28 @@ options:
     choices:
       - executed
       - cancelled
+  wait:
+    description: Time in seconds to wait for actioned tasks to reach a terminal state (Completed, Cancelled or Failed)
+    required: false
+    default: 0
+    type: int
+  max_concurrent:
+    description: Maximum number of tasks executed or cancelled concurrently. Results keep the order of the tasks list.
+    required: false
+    default: 1
+    type: int
+  max_concurrent_per_container:
+    description:
+      - Maximum number of tasks actioned concurrently for devices attached to the same container.
+      - 0 means no limit. Only used when max_concurrent is greater than 1.
+    required: false
+    default: 0
+    type: int
+  poll_interval:
+    description: Initial time in seconds between 2 task status checks. Interval grows exponentially while waiting.
+    required: false
+    default: 1
+    type: float
 '''
 
 EXAMPLES = '''
@@ -58,6 +80,17 @@ EXAMPLES = '''
   arista.cvp.cv_task:
     tasks: ['666', '667']
     state: cancelled
+
+- name: Execute a list of tasks and wait for completion for 600 seconds
+  arista.cvp.cv_task_v3:
+    tasks: "{{ cvp_configlets.taskIds }}"
+    wait: 600
+
+- name: Execute tasks with 10 workers, at most 2 devices per container at a time
+  arista.cvp.cv_task_v3:
+    tasks: "{{ cvp_configlets.taskIds }}"
+    max_concurrent: 10
+    max_concurrent_per_container: 2
 '''
 
 import logging
@@ -102,7 +135,19 @@ def main():
         state=dict(type='str',
                    required=False,
                    default='executed',
-                   choices=['executed', 'cancelled'])
+                   choices=['executed', 'cancelled']),
+        wait=dict(type='int',
+                  required=False,
+                  default=0),
+        poll_interval=dict(type='float',
+                           required=False,
+                           default=1),
+        max_concurrent=dict(type='int',
+                            required=False,
+                            default=1),
+        max_concurrent_per_container=dict(type='int',
+                                          required=False,
+                                          default=0)
     )
 
     # Make module global to use it in all functions when required
@@ -121,9 +166,14 @@ def main():
 
     task_manager = CvTaskTools(cv_connection=cv_client, ansible_module=ansible_module)
     ansible_response: CvAnsibleResponse = task_manager.tasker(taskIds_list=ansible_module.params['tasks'],
-                                                              state=ansible_module.params['state'])
+                                                              state=ansible_module.params['state'],
+                                                              wait=ansible_module.params['wait'],
+                                                              poll_interval=ansible_module.params['poll_interval'],
+                                                              max_concurrent=ansible_module.params['max_concurrent'],
+                                                              max_concurrent_per_container=ansible_module.params['max_concurrent_per_container'])
 
     result = ansible_response.content
+    tools_cv.cv_report_retries(client=cv_client, result=result)
 
     ansible_module.exit_json(**result)
 
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable = duplicate-code
+# flake8: noqa: R0801
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+In-memory Cloudvision API used by generic tests (no Cloudvision required).
+
+Only read methods used by collection tools are implemented. Every call is
+recorded in `calls` to let tests validate number of API round-trips.
+"""
+
+import time
+import threading
+from collections import Counter
+
+CV_INVENTORY = [
+    {
+        'hostname': 'leaf1',
+        'fqdn': 'leaf1.dc1.lab',
+        'systemMacAddress': '50:8d:00:e3:78:aa',
+        'serialNumber': 'SN-LEAF1',
+        'key': '50:8d:00:e3:78:aa',
+        'parentContainerKey': 'container_leafs',
+        'containerName': 'LEAFS',
+        'streamingStatus': 'active',
+    },
+    {
+        'hostname': 'spine1',
+        'fqdn': 'spine1.dc1.lab',
+        'systemMacAddress': '50:8d:00:e3:78:bb',
+        'serialNumber': 'SN-SPINE1',
+        'key': '50:8d:00:e3:78:bb',
+        'parentContainerKey': 'container_spines',
+        'containerName': 'SPINES',
+        'streamingStatus': 'active',
+    },
+]
+
+CV_CONTAINERS = [
+    {'key': 'root', 'name': 'Tenant', 'parentName': None},
+    {'key': 'container_dc1', 'name': 'DC1', 'parentName': 'Tenant'},
+    {'key': 'container_leafs', 'name': 'LEAFS', 'parentName': 'DC1'},
+    {'key': 'container_spines', 'name': 'SPINES', 'parentName': 'DC1'},
+]
+
+CV_CONFIGLETS = [
+    {'key': 'configlet_base', 'name': 'BASE', 'config': 'hostname x\n', 'note': 'Managed by Ansible', 'containerCount': 1},
+    {'key': 'configlet_leaf1', 'name': 'LEAF1', 'config': 'interface Ethernet1\n', 'note': '', 'containerCount': 0},
+    {'key': 'configlet_spine1', 'name': 'SPINE1', 'config': 'interface Ethernet2\n', 'note': '', 'containerCount': 0},
+]
+
+CV_TASKS = [
+    {'workOrderId': '10', 'workOrderUserDefinedStatus': 'Pending', 'workOrderState': 'ACTIVE',
+     'workOrderDetails': {'netElementId': '50:8d:00:e3:78:aa'}},
+    {'workOrderId': '11', 'workOrderUserDefinedStatus': 'Pending', 'workOrderState': 'ACTIVE',
+     'workOrderDetails': {'netElementId': '50:8d:00:e3:78:bb'}},
+    {'workOrderId': '12', 'workOrderUserDefinedStatus': 'Completed', 'workOrderState': 'COMPLETED'},
+]
+
+CV_MAPPERS = [
+    {'configletId': 'configlet_base', 'objectId': 'container_dc1', 'type': 'container'},
+    {'configletId': 'configlet_leaf1', 'objectId': '50:8d:00:e3:78:aa', 'type': 'netelement'},
+    {'configletId': 'configlet_spine1', 'objectId': '50:8d:00:e3:78:bb', 'type': 'netelement'},
+]
+
+
+class CvApiStub():
+    """
+    CvApiStub Fake cvprac api attribute serving static data
+    """
+
+    def __init__(self, inventory=None, containers=None, configlets=None, mappers=None, tasks=None, task_duration=0):
+        self.inventory = [dict(x) for x in (inventory if inventory is not None else CV_INVENTORY)]
+        self.containers = [dict(x) for x in (containers if containers is not None else CV_CONTAINERS)]
+        self.configlets = [dict(x) for x in (configlets if configlets is not None else CV_CONFIGLETS)]
+        self.mappers = [dict(x) for x in (mappers if mappers is not None else CV_MAPPERS)]
+        self.tasks = [dict(x) for x in (tasks if tasks is not None else CV_TASKS)]
+        # Number of status reads before an executed task is completed
+        self.task_duration = task_duration
+        self.__task_reads = Counter()
+        self.calls = Counter()
+        self.staged_actions = 0
+        # Container actions staged by _add_temp_action, applied by _save_topology_v2
+        self.temp_actions = list()
+        self.__lock = threading.Lock()
+        # Time in seconds to wait before answering device specific calls
+        self.device_delay = dict()
+        # cvprac timeout of HTTP requests, recorded by device specific calls
+        self.request_timeout = 30
+        self.request_timeouts = list()
+        # Image bundle names applied to containers, indexed by container key
+        self.container_images = dict()
+
+    def get_inventory(self, start=0, end=0, query='', provisioned=True):
+        self.calls['get_inventory'] += 1
+        return [dict(x) for x in self.inventory]
+
+    def get_containers(self, start=0, end=0):
+        self.calls['get_containers'] += 1
+        return {'data': [dict(x) for x in self.containers], 'total': len(self.containers)}
+
+    def get_configlets_and_mappers(self):
+        self.calls['get_configlets_and_mappers'] += 1
+        return {'data': {'configlets': [dict(x) for x in self.configlets],
+                         'configletMappers': [dict(x) for x in self.mappers]}}
+
+    def get_device_by_name(self, fqdn, search_by_hostname=False):
+        self.calls['get_device_by_name'] += 1
+        for device in self.inventory:
+            value = device['fqdn'].split('.')[0] if search_by_hostname else device['fqdn']
+            if value == fqdn:
+                return dict(device)
+        return {}
+
+    def get_device_by_mac(self, device_mac):
+        self.calls['get_device_by_mac'] += 1
+        return next((dict(x) for x in self.inventory if x['systemMacAddress'] == device_mac), {})
+
+    def get_device_by_serial(self, device_serial):
+        self.calls['get_device_by_serial'] += 1
+        return next((dict(x) for x in self.inventory if x['serialNumber'] == device_serial), {})
+
+    def get_container_by_name(self, name):
+        self.calls['get_container_by_name'] += 1
+        return next((dict(x) for x in self.containers if x['name'] == name), None)
+
+    def get_configlet_by_name(self, name):
+        self.calls['get_configlet_by_name'] += 1
+        return next((dict(x) for x in self.configlets if x['name'] == name), None)
+
+    def get_configlets_by_device_id(self, mac, start=0, end=0):
+        self.calls['get_configlets_by_device_id'] += 1
+        keys = [x['configletId'] for x in self.mappers if x['objectId'] == mac]
+        return [dict(x) for x in self.configlets if x['key'] in keys]
+
+    def get_container_by_id(self, key):
+        self.calls['get_container_by_id'] += 1
+        return next((dict(x) for x in self.containers if x['key'] == key), None)
+
+    def get_device_configuration(self, mac):
+        self.calls['get_device_configuration'] += 1
+        return '! config of {0}\n'.format(mac)
+
+    def get_device_image_info(self, mac):
+        self.calls['get_device_image_info'] += 1
+        self.request_timeouts.append(self.request_timeout)
+        if self.device_delay.get(mac):
+            time.sleep(self.device_delay[mac])
+        return {'bundleName': 'EOS-4.25', 'imageBundleMapper': {'bundle_1': {'type': 'netelement'}}}
+
+    def get_image_bundles(self, start=0, end=0):
+        self.calls['get_image_bundles'] += 1
+        names = sorted(set(self.container_images.values()))
+        return {'data': [{'name': x, 'appliedContainersCount': list(self.container_images.values()).count(x)} for x in names]}
+
+    def get_image_bundle_by_container_id(self, container_id, start=0, end=0, scope='false'):
+        self.calls['get_image_bundle_by_container_id'] += 1
+        if container_id in self.container_images:
+            return {'imageBundleList': [{'name': self.container_images[container_id]}]}
+        return {'imageBundleList': []}
+
+    def apply_configlets_to_device(self, app_name, dev, new_configlets, create_task=True, reorder_configlets=False):
+        self.calls['apply_configlets_to_device'] += 1
+        self.mappers = [x for x in self.mappers if x['objectId'] != dev['systemMacAddress']]
+        self.mappers += [{'configletId': x['key'], 'objectId': dev['systemMacAddress'], 'type': 'netelement'} for x in new_configlets]
+        return {'data': {'status': 'success', 'taskIds': ['task_' + dev['hostname']]}}
+
+
+    def add_configlet(self, name, config):
+        self.calls['add_configlet'] += 1
+        key = 'configlet_' + name.lower()
+        self.configlets.append({'key': key, 'name': name, 'config': config, 'note': '', 'containerCount': 0})
+        return key
+
+    def update_configlet(self, config, key, name, wait_task_ids=False):
+        self.calls['update_configlet'] += 1
+        for configlet in self.configlets:
+            if configlet['key'] == key:
+                configlet['config'] = config
+        return {'data': 'Configlet ' + name + ' successfully updated', 'taskIds': []}
+
+    def add_note_to_configlet(self, key, note):
+        self.calls['add_note_to_configlet'] += 1
+        for configlet in self.configlets:
+            if configlet['key'] == key:
+                configlet['note'] = note
+        return {'data': 'success'}
+
+    def delete_configlet(self, name, key):
+        self.calls['delete_configlet'] += 1
+        self.configlets = [x for x in self.configlets if x['key'] != key]
+        return {'data': 'success'}
+
+    def filter_topology(self, node_id='root', fmt='topology', start=0, end=0):
+        self.calls['filter_topology'] += 1
+        container = next((x for x in self.containers if x['key'] == node_id), {})
+        return {'topology': {'key': container.get('key'), 'name': container.get('name'),
+                             'childContainerCount': len([x for x in self.containers if x['parentName'] == container.get('name')]),
+                             'childNetElementCount': len([x for x in self.inventory if x['parentContainerKey'] == node_id])}}
+
+    def add_container(self, container_name, parent_name, parent_key):
+        self.calls['add_container'] += 1
+        self.containers.append({'key': 'container_' + container_name.lower(), 'name': container_name, 'parentName': parent_name})
+        return {'data': {'status': 'success', 'taskIds': []}}
+
+    def delete_container(self, container_name, container_key, parent_name, parent_key):
+        self.calls['delete_container'] += 1
+        self.containers = [x for x in self.containers if x['key'] != container_key]
+        return {'data': {'status': 'success', 'taskIds': []}}
+
+    def _add_temp_action(self, data):
+        self.calls['add_temp_action'] += 1
+        with self.__lock:
+            self.temp_actions.extend(data['data'])
+
+    def _save_topology_v2(self, data):
+        self.calls['save_topology_v2'] += 1
+        with self.__lock:
+            temp_actions, self.temp_actions = self.temp_actions, []
+        for action in temp_actions:
+            if action['action'] == 'add':
+                self.containers.append({'key': 'container_' + action['nodeName'].lower(), 'name': action['nodeName'],
+                                        'parentName': action['toName']})
+            elif action['action'] == 'delete':
+                self.containers = [x for x in self.containers if x['key'] != action['nodeId']]
+        return self.__save_topology()
+
+    def apply_configlets_to_container(self, app_name, container, new_configlets, create_task=True):
+        self.calls['apply_configlets_to_container'] += 1
+        return self.__container_action(create_task=create_task)
+
+    def remove_configlets_from_container(self, app_name, container, del_configlets, create_task=True):
+        self.calls['remove_configlets_from_container'] += 1
+        return self.__container_action(create_task=create_task)
+
+    def __container_action(self, create_task):
+        self.staged_actions += 1
+        if not create_task:
+            return {'data': [{'info': 'staged action'}]}
+        return self.__save_topology()
+
+    def __save_topology(self):
+        self.calls['save_topology'] += 1
+        task_ids = ['task_{}'.format(self.calls['task'] + x) for x in range(self.staged_actions)]
+        self.calls['task'] += self.staged_actions
+        self.staged_actions = 0
+        return {'data': {'status': 'success', 'taskIds': task_ids}}
+
+    def __read_task(self, task):
+        if task['workOrderUserDefinedStatus'] == 'In-Progress':
+            self.__task_reads[task['workOrderId']] += 1
+            if self.__task_reads[task['workOrderId']] > self.task_duration:
+                task['workOrderUserDefinedStatus'] = 'Completed'
+        return dict(task)
+
+    def get_task_by_id(self, task_id):
+        self.calls['get_task_by_id'] += 1
+        return next((self.__read_task(x) for x in self.tasks if x['workOrderId'] == str(task_id)), None)
+
+    def get_tasks(self, start=0, end=0):
+        self.calls['get_tasks'] += 1
+        return {'data': [self.__read_task(x) for x in self.tasks], 'total': len(self.tasks)}
+
+    def get_tasks_by_status(self, status, start=0, end=0):
+        self.calls['get_tasks_by_status'] += 1
+        tasks = [self.__read_task(x) for x in self.tasks if x['workOrderUserDefinedStatus'].upper() == status.upper()]
+        return [x for x in tasks if x['workOrderUserDefinedStatus'].upper() == status.upper()]
+
+    def add_note_to_task(self, task_id, note):
+        self.calls['add_note_to_task'] += 1
+        return {'data': 'success'}
+
+    def execute_task(self, task_id):
+        self.calls['execute_task'] += 1
+        for task in self.tasks:
+            if task['workOrderId'] == str(task_id):
+                task['workOrderUserDefinedStatus'] = 'In-Progress'
+        return {'data': 'success'}
+
+    def cancel_task(self, task_id):
+        self.calls['cancel_task'] += 1
+        for task in self.tasks:
+            if task['workOrderId'] == str(task_id):
+                task['workOrderUserDefinedStatus'] = 'Cancelled'
+        return {'data': 'success'}
+
+
+class CvClientStub():
+    """
+    CvClientStub Fake CvpClient exposing an api attribute
+    """
+
+    def __init__(self, **kwargs):
+        self.nodes = ['cvp.lab']
+        self.port = 443
+        self.session = None
+        self.api = CvApiStub(**kwargs)
+
+
+class AnsibleModuleStub():
+    """
+    AnsibleModuleStub Fake AnsibleModule exposing check_mode and fail_json
+    """
+
+    def __init__(self, check_mode=False, params=None, diff=False):
+        self.check_mode = check_mode
+        self._diff = diff
+        self.warnings = list()
+        self.failures = list()
+        self.params = params if params is not None else dict()
+
+    def fail_json(self, msg, **kwargs):
+        self.failures.append(msg)
+        raise AssertionError(msg)
+
+    def warn(self, warning):
+        self.warnings.append(warning)
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.container_tools import ContainerInput
+
+
+TOPOLOGY_UNORDERED = {
+    'LEAF1': {'parentContainerName': 'LEAFS'},
+    'LEAFS': {'parentContainerName': 'DC1'},
+    'SPINES': {'parentContainerName': 'DC1'},
+    'DC1': {'parentContainerName': 'Tenant'},
+}
+
+TOPOLOGY_ORPHAN = {
+    'POD1-LEAF1': {'parentContainerName': 'POD1'},
+    'POD1': {'parentContainerName': 'EXISTING-ON-CV'},
+    'DC1': {'parentContainerName': 'Tenant'},
+}
+
+TOPOLOGY_CYCLE = {
+    'DC1': {'parentContainerName': 'Tenant'},
+    'LOOP1': {'parentContainerName': 'LOOP2'},
+    'LOOP2': {'parentContainerName': 'LOOP1'},
+}
+
+
+def is_ordered(topology: dict, ordered_list: list):
+    """Check every container is listed after its parent when parent is part of topology"""
+    for container_name, container in topology.items():
+        if container['parentContainerName'] in ordered_list:
+            if ordered_list.index(container_name) < ordered_list.index(container['parentContainerName']):
+                return False
+    return True
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestContainerInputOrder():
+
+    def test_ordered_list(self):
+        inventory = ContainerInput(user_topology=TOPOLOGY_UNORDERED)
+        assert inventory.ordered_list_containers == ['DC1', 'LEAFS', 'SPINES', 'LEAF1']
+        assert inventory.orphan_containers == []
+        assert inventory.cyclic_containers == []
+
+    def test_ordered_list_cached(self):
+        inventory = ContainerInput(user_topology=TOPOLOGY_UNORDERED)
+        assert inventory.ordered_list_containers is inventory.ordered_list_containers
+
+    def test_ordered_list_orphan(self):
+        inventory = ContainerInput(user_topology=TOPOLOGY_ORPHAN)
+        assert inventory.orphan_containers == ['POD1']
+        assert inventory.ordered_list_containers[0] == 'DC1'
+        assert is_ordered(topology=TOPOLOGY_ORPHAN, ordered_list=inventory.ordered_list_containers)
+        logging.info('Orphan container and its children are listed: %s', str(inventory.ordered_list_containers))
+
+    def test_ordered_list_cycle(self):
+        inventory = ContainerInput(user_topology=TOPOLOGY_CYCLE)
+        assert inventory.cyclic_containers == ['LOOP1', 'LOOP2']
+        assert inventory.ordered_list_containers == ['DC1', 'LOOP1', 'LOOP2']
+
+    def test_ordered_list_large(self):
+        topology = {'CNT-{}'.format(x): {'parentContainerName': 'CNT-{}'.format(x // 4) if x > 0 else 'Tenant'} for x in reversed(range(1500))}
+        inventory = ContainerInput(user_topology=topology)
+        assert len(inventory.ordered_list_containers) == 1500
+        assert inventory.ordered_list_containers[0] == 'CNT-0'
+        assert is_ordered(topology=topology, ordered_list=inventory.ordered_list_containers)
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import pytest
+from requests.exceptions import ConnectTimeout, ReadTimeout
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from cvprac.cvp_client_errors import CvpApiError, CvpRequestError
+from ansible_collections.arista.cvp.plugins.module_utils.api_retry import CvApiRetry, is_idempotent, is_retryable, RETRIES_ENV
+from ansible_collections.arista.cvp.plugins.module_utils.rate_limiter import CvRateLimiter
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import cv_report_retries
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceInventory, CvDeviceTools
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_HOSTNAME
+from lib.cv_client_stub import CvClientStub
+
+BAD_GATEWAY = CvpRequestError('GET: https://cvp.lab/web/inventory/devices : Request Error: Bad Gateway - ')
+THROTTLED = CvpRequestError('POST: https://cvp.lab/web/provisioning : Request Error: Too Many Requests - ')
+
+
+def flaky(function, failures, error):
+    """
+    Wrap a stub method to raise error for the first failures calls
+    """
+    calls = {'count': 0}
+
+    def wrapper(*args, **kwargs):
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            raise error
+        return function(*args, **kwargs)
+    return wrapper
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvApiRetry():
+
+    @pytest.mark.parametrize('method, expected', [
+        ('get_inventory', True),
+        ('filter_topology', True),
+        ('update_configlet', True),
+        ('apply_configlets_to_device', False),
+        ('execute_task', False),
+    ])
+    def test_is_idempotent(self, method, expected):
+        assert is_idempotent(method) == expected
+
+    @pytest.mark.parametrize('error, idempotent, expected', [
+        (BAD_GATEWAY, True, True),
+        (BAD_GATEWAY, False, False),
+        (THROTTLED, False, True),
+        (ConnectTimeout(), False, True),
+        (ReadTimeout(), True, True),
+        (ReadTimeout(), False, False),
+        (ConnectionError('forwarded by broker'), True, True),
+        (CvpRequestError('GET: https://cvp.lab/web : Request Error: Not Found - '), True, False),
+        (CvpRequestError('POST: https://cvp.lab/web : Request Error: Bad Request - Too Many Requests in body - '), False, False),
+        (CvpApiError('Unauthorized'), True, False),
+    ])
+    def test_is_retryable(self, error, idempotent, expected):
+        assert is_retryable(error, idempotent=idempotent) == expected
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.delenv(RETRIES_ENV, raising=False)
+        assert CvApiRetry.from_env() is not None
+        monkeypatch.setenv(RETRIES_ENV, '0')
+        assert CvApiRetry.from_env() is None
+
+    def test_safe_call_retried(self):
+        cv_client = CvClientStub()
+        cv_client.api.get_inventory = flaky(cv_client.api.get_inventory, failures=2, error=BAD_GATEWAY)
+        retry = CvApiRetry(retries=3, backoff=0.01)
+        retry.attach(cv_client)
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME)
+        inventory, missing = tools.resolve_inventory(user_inventory=DeviceInventory(data=[{'fqdn': 'leaf1', 'parentContainerName': 'LEAFS'}]))
+        assert missing == []
+        assert retry.summary == {'retries': 2, 'calls': {'get_inventory': 2}, 'failed': 0}
+
+    def test_unsafe_call_not_retried(self):
+        cv_client = CvClientStub()
+        cv_client.api.apply_configlets_to_device = flaky(cv_client.api.apply_configlets_to_device, failures=1, error=BAD_GATEWAY)
+        retry = CvApiRetry(retries=3, backoff=0.01)
+        retry.attach(cv_client)
+        with pytest.raises(CvpRequestError):
+            cv_client.api.apply_configlets_to_device(app_name='Ansible', dev={}, new_configlets=[])
+        assert retry.summary['retries'] == 0
+
+    def test_retries_exhausted(self):
+        cv_client = CvClientStub()
+        cv_client.api.get_inventory = flaky(cv_client.api.get_inventory, failures=5, error=BAD_GATEWAY)
+        retry = CvApiRetry(retries=2, backoff=0.01)
+        retry.attach(cv_client)
+        with pytest.raises(CvpRequestError):
+            cv_client.api.get_inventory()
+        assert retry.summary == {'retries': 2, 'calls': {'get_inventory': 2}, 'failed': 1}
+
+    def test_retry_with_rate_limiter(self):
+        cv_client = CvClientStub()
+        cv_client.api.get_inventory = flaky(cv_client.api.get_inventory, failures=1, error=BAD_GATEWAY)
+        CvRateLimiter(rate=100).attach(cv_client)
+        retry = CvApiRetry(retries=2, backoff=0.01)
+        retry.attach(cv_client)
+        assert len(cv_client.api.get_inventory()) == 2
+        assert retry.summary['retries'] == 1
+
+    def test_request_timeout_forwarded(self):
+        cv_client = CvClientStub()
+        api = cv_client.api
+        CvRateLimiter(rate=100).attach(cv_client)
+        CvApiRetry(retries=2, backoff=0.01).attach(cv_client)
+        cv_client.api.request_timeout = 5
+        assert api.request_timeout == 5
+        assert cv_client.api.request_timeout == 5
+
+    @pytest.mark.parametrize('failures, expected', [(0, False), (1, True)])
+    def test_report_retries(self, failures, expected):
+        cv_client = CvClientStub()
+        cv_client.api.get_inventory = flaky(cv_client.api.get_inventory, failures=failures, error=BAD_GATEWAY)
+        CvApiRetry(retries=2, backoff=0.01).attach(cv_client)
+        cv_client.api.get_inventory()
+        result = dict(changed=False)
+        cv_report_retries(client=cv_client, result=result)
+        assert ('api_retries' in result) == expected
@@ -0,0 +1,90 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from cvprac.cvp_client import CvpClient
+from ansible_collections.arista.cvp.plugins.module_utils.connection_pool import CvConnectionPool, POOL_ENV
+from ansible_collections.arista.cvp.plugins.module_utils.token_cache import CvTokenCache
+
+
+def login_client():
+    """
+    Build a CvpClient with a fake login recording session used for login
+    """
+    client = CvpClient()
+    client.login_sessions = list()
+
+    def login():
+        client.login_sessions.append(client.session)
+    client._login = login
+    return client
+
+
+def connect(client):
+    client.connect(nodes=['cvp.lab'], username='ansible', password='ansible')
+    return client
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvConnectionPool():
+
+    def test_from_env_not_set(self, monkeypatch):
+        for variable, _ in POOL_ENV.values():
+            monkeypatch.delenv(variable, raising=False)
+        assert CvConnectionPool.from_env() is None
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv('ANSIBLE_CVP_POOL_MAXSIZE', '32')
+        monkeypatch.setenv('ANSIBLE_CVP_POOL_CONNECTIONS', 'many')
+        monkeypatch.setenv('ANSIBLE_CVP_KEEPALIVE', 'no')
+        pool = CvConnectionPool.from_env()
+        assert pool.pool_maxsize == 32
+        assert pool.pool_connections == 10
+        assert pool.keepalive is False
+
+    def test_pool_applied(self):
+        client = login_client()
+        CvConnectionPool(pool_connections=2, pool_maxsize=32, pool_block=True).attach(client)
+        connect(client)
+        adapter = client.session.get_adapter('https://cvp.lab/web')
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+        assert client.session.headers['Connection'] == 'keep-alive'
+
+    def test_pool_applied_after_relogin(self):
+        client = login_client()
+        CvConnectionPool(pool_maxsize=32, keepalive=False).attach(client)
+        connect(client)
+        # cvprac creates a new session before login when Cloudvision rejects the session
+        client._reset_session()
+        assert len(client.login_sessions) == 2
+        assert client.login_sessions[0] is not client.login_sessions[1]
+        assert client.session.get_adapter('https://cvp.lab/web')._pool_maxsize == 32
+        assert client.session.headers['Connection'] == 'close'
+
+    def test_pool_applied_with_cached_session(self, tmp_path):
+        cache = CvTokenCache(cache_dir=str(tmp_path), host='cvp.lab', port=443, user='ansible', secret='ansible')
+        cache.save(cookies={'session_id': 'session-1'}, headers={'APP_SESSION_ID': 'session-1'})
+        client = login_client()
+        cache.attach(client)
+        CvConnectionPool(pool_maxsize=32).attach(client)
+        connect(client)
+        assert cache.restored
+        assert client.login_sessions == []
+        assert client.session.get_adapter('https://cvp.lab/web')._pool_maxsize == 32
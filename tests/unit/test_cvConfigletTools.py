@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.configlet_tools import CvConfigletTools, CONFIGLET_BULK_THRESHOLD
+from lib.cv_client_stub import CvClientStub, AnsibleModuleStub
+
+
+def user_configlets(count: int):
+    """Build a list of configlets with BASE, LEAF1 and new configlets"""
+    configlets = [
+        {'name': 'BASE', 'config': 'hostname x\n'},
+        {'name': 'LEAF1', 'config': 'interface Ethernet10\n'},
+    ]
+    configlets += [{'name': 'NEW-{}'.format(x), 'config': 'alias {}\n'.format(x)} for x in range(count - len(configlets))]
+    return configlets
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvConfigletToolsApply():
+
+    @pytest.mark.parametrize('count', [3, CONFIGLET_BULK_THRESHOLD + 5])
+    def test_apply_present(self, count):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.apply(configlet_list=user_configlets(count), present=True, note='Managed by Ansible')
+        assert cv_client.api.calls['add_configlet'] == count - 2
+        assert cv_client.api.calls['update_configlet'] == 1
+        assert response.content['configlets_updated']['configlets_updated_list'] == ['LEAF1']
+        logging.info('Configlets applied with calls: %s', str(cv_client.api.calls))
+
+    def test_apply_bulk_fetch(self):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub(check_mode=True))
+        tools.apply(configlet_list=user_configlets(CONFIGLET_BULK_THRESHOLD + 5), present=True)
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 1
+        assert cv_client.api.calls['get_configlet_by_name'] == 0
+
+    def test_apply_per_name_fetch(self):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub(check_mode=True))
+        tools.apply(configlet_list=user_configlets(3), present=True)
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 0
+        assert cv_client.api.calls['get_configlet_by_name'] == 3
+
+    def test_single_lookup_per_name(self):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        assert tools.is_present(configlet_name='LEAF1') is True
+        assert tools.get_configlet_data_cv(configlet_name='LEAF1')['key'] == 'configlet_leaf1'
+        assert cv_client.api.calls['get_configlet_by_name'] == 2
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 0
+
+    def test_apply_absent(self):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.apply(configlet_list=user_configlets(3), present=False)
+        assert cv_client.api.calls['delete_configlet'] == 2
+        assert response.content['configlets_deleted']['configlets_deleted_list'] == ['BASE', 'LEAF1']
+
+
+@pytest.mark.generic
+class TestCvConfigletToolsCompare():
+
+    def test_compare_identical(self):
+        tools = CvConfigletTools(cv_connection=CvClientStub())
+        assert tools._compare(fromText='hostname x\n', toText='hostname x\n') == [False, []]
+
+    def test_compare_changed(self):
+        tools = CvConfigletTools(cv_connection=CvClientStub())
+        changed, diff = tools._compare(fromText='hostname x\n', toText='hostname y\n')
+        assert changed is True
+        assert '-hostname x\n' in diff and '+hostname y\n' in diff
+        assert tools._compare(fromText='hostname x\n', toText='hostname y\n', with_diff=False) == [True, []]
+
+    @pytest.mark.parametrize('diff_mode, diff_budget, expected', [(False, 0, False), (True, 0, True), (False, None, True), (False, 1, True)])
+    def test_apply_diff_budget(self, diff_mode, diff_budget, expected):
+        cv_client = CvClientStub()
+        tools = CvConfigletTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub(check_mode=True, diff=diff_mode),
+                                 diff_budget=diff_budget)
+        response = tools.apply(configlet_list=user_configlets(3), present=True, note='Managed by Ansible')
+        changed, diff = response.content['configlets_updated']['diff']['LEAF1']
+        assert changed is True
+        assert (len(diff) > 0) is expected
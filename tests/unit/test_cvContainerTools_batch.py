@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import time
+import logging
+import threading
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.container_tools import ContainerInput, CvContainerTools
+from cvprac.cvp_client_errors import CvpApiError
+from lib.cv_client_stub import CvClientStub, AnsibleModuleStub
+
+
+USER_TOPOLOGY = {
+    'DC1': {'parentContainerName': 'Tenant', 'configlets': ['LEAF1']},
+    'LEAFS': {'parentContainerName': 'DC1', 'configlets': ['BASE']},
+    'SPINES': {'parentContainerName': 'DC1', 'configlets': ['BASE']},
+}
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvContainerToolsBatch():
+
+    @pytest.mark.parametrize('batch_mode, commits', [(False, 4), (True, 3)])
+    def test_build_topology_strict(self, batch_mode, commits):
+        cv_client = CvClientStub()
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY), apply_mode='strict', batch_mode=batch_mode)
+        assert cv_client.api.calls['apply_configlets_to_container'] == 3
+        assert cv_client.api.calls['remove_configlets_from_container'] == 1
+        assert cv_client.api.calls['save_topology'] == commits
+        content = response.content
+        assert content['configlets_attached']['configlets_attached_list'] == ['DC1:LEAF1', 'LEAFS:BASE', 'SPINES:BASE']
+        assert content['configlets_detached']['configlets_detached_list'] == ['DC1:BASE']
+        assert len(content['taskIds']) == 4
+        logging.info('Topology built with %s commits', commits)
+
+    def test_batch_saved_after_last_action(self):
+        cv_client = CvClientStub()
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        get_container_info = tools.get_container_info
+        # Last action does not send any API call
+        tools.get_container_info = lambda container_name: None if container_name == 'SPINES' else get_container_info(container_name)
+        response = tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY), batch_mode=True)
+        assert cv_client.api.calls['apply_configlets_to_container'] == 2
+        assert cv_client.api.calls['save_topology'] == 1
+        assert cv_client.api.staged_actions == 0
+        assert response.content['changed'] is True
+        assert len(response.content['taskIds']) == 2
+
+    def test_batch_save_error(self):
+        cv_client = CvClientStub()
+        cv_client.api._save_topology_v2 = lambda data: None
+        ansible_module = AnsibleModuleStub()
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=ansible_module)
+        with pytest.raises(AssertionError):
+            tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY), batch_mode=True)
+        assert ansible_module.failures == ['Error saving topology for 3 staged changes']
+
+
+USER_TOPOLOGY_REGION = {
+    'REGION': {'parentContainerName': 'Tenant'},
+    'POD1': {'parentContainerName': 'REGION'},
+    'POD2': {'parentContainerName': 'REGION'},
+    'POD1-LEAFS': {'parentContainerName': 'POD1'},
+    'POD2-LEAFS': {'parentContainerName': 'POD2'},
+}
+
+
+@pytest.mark.generic
+class TestCvContainerToolsParallel():
+
+    def test_levels_containers(self):
+        assert ContainerInput(user_topology=USER_TOPOLOGY_REGION).levels_containers == [['REGION'], ['POD1', 'POD2'], ['POD1-LEAFS', 'POD2-LEAFS']]
+
+    @pytest.mark.parametrize('parallelism, staged, saves', [(1, 0, 0), (4, 5, 3)])
+    def test_build_topology(self, parallelism, staged, saves):
+        cv_client = CvClientStub()
+        user_topology = ContainerInput(user_topology=USER_TOPOLOGY_REGION)
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub(), parallelism=parallelism)
+        response = tools.build_topology(user_topology=user_topology)
+        assert response.content['container_added']['container_added_list'] == user_topology.ordered_list_containers
+        assert cv_client.api.calls['add_container'] == 5 - staged
+        assert cv_client.api.calls['add_temp_action'] == staged
+        assert cv_client.api.calls['save_topology_v2'] == saves
+
+        response = tools.build_topology(user_topology=user_topology, present=False)
+        assert response.content['container_deleted']['container_deleted_list'] == list(reversed(user_topology.ordered_list_containers))
+        assert cv_client.api.calls['delete_container'] == 5 - staged
+        assert cv_client.api.calls['add_temp_action'] == 2 * staged
+        assert cv_client.api.calls['save_topology_v2'] == 2 * saves
+        assert [x['name'] for x in cv_client.api.containers] == ['Tenant', 'DC1', 'LEAFS', 'SPINES']
+        logging.info('Topology built and removed with %s workers', parallelism)
+
+    def test_topology_staged_by_level(self):
+        cv_client = CvClientStub()
+        add_temp_action = cv_client.api._add_temp_action
+        state = {'running': 0, 'concurrent': 0}
+        lock = threading.Lock()
+
+        def slow_add_temp_action(data):
+            with lock:
+                state['running'] += 1
+                state['concurrent'] = max(state['concurrent'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+            return add_temp_action(data)
+        cv_client.api._add_temp_action = slow_add_temp_action
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub(), parallelism=4)
+        tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY_REGION))
+        assert len(cv_client.api.containers) == 9
+        assert cv_client.api.calls['add_container'] == 0
+        assert cv_client.api.calls['save_topology_v2'] == 3
+        assert state['concurrent'] == 2
+
+    def test_build_topology_error(self):
+        cv_client = CvClientStub()
+        add_container = cv_client.api.add_container
+
+        def failing_add_container(**kwargs):
+            if kwargs['container_name'] == 'POD1':
+                raise CvpApiError('Container POD1 rejected')
+            return add_container(**kwargs)
+        cv_client.api.add_container = failing_add_container
+        ansible_module = AnsibleModuleStub()
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=ansible_module)
+        with pytest.raises(AssertionError):
+            tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY_REGION))
+        assert len(ansible_module.failures) == 1
+        assert 'Error creating container POD1' in ansible_module.failures[0]
+        assert 'POD1-LEAFS' not in [x['name'] for x in cv_client.api.containers]
+
+    def test_build_topology_staging_error(self):
+        cv_client = CvClientStub()
+        add_temp_action = cv_client.api._add_temp_action
+
+        def failing_add_temp_action(data):
+            # cvprac only logs errors of staging calls
+            if data['data'][0]['nodeName'] != 'POD1':
+                add_temp_action(data)
+        cv_client.api._add_temp_action = failing_add_temp_action
+        ansible_module = AnsibleModuleStub()
+        tools = CvContainerTools(cv_connection=cv_client, ansible_module=ansible_module, parallelism=4)
+        with pytest.raises(AssertionError):
+            tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY_REGION))
+        assert ansible_module.failures == ['Error saving add of container POD1 on CV']
+        assert 'POD2' in [x['name'] for x in cv_client.api.containers]
+        assert 'POD1-LEAFS' not in [x['name'] for x in cv_client.api.containers]
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceInventory, CvDeviceTools
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_FQDN, FIELD_HOSTNAME, FIELD_SERIAL
+from lib.cv_client_stub import CvClientStub, AnsibleModuleStub
+
+
+USER_DEVICES = [
+    {'fqdn': 'leaf1', 'parentContainerName': 'LEAFS', 'configlets': ['LEAF1']},
+    {'fqdn': 'spine1', 'parentContainerName': 'SPINES', 'configlets': ['SPINE1']},
+]
+
+USER_DEVICES_BASE = [
+    {'fqdn': 'leaf1', 'parentContainerName': 'LEAFS', 'configlets': ['LEAF1', 'BASE']},
+    {'fqdn': 'spine1', 'parentContainerName': 'SPINES', 'configlets': ['SPINE1', 'BASE']},
+]
+
+USER_DEVICES_FQDN = [
+    {'fqdn': 'leaf1.dc1.lab', 'parentContainerName': 'LEAFS'},
+    {'fqdn': 'unknown.dc1.lab', 'parentContainerName': 'LEAFS'},
+]
+
+USER_DEVICES_SERIAL = [
+    {'serialNumber': 'SN-LEAF1', 'parentContainerName': 'LEAFS'},
+    {'serialNumber': 'SN-SPINE1', 'parentContainerName': 'SPINES'},
+]
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvDeviceToolsResolve():
+
+    def test_resolve_by_hostname(self):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME)
+        inventory, missing = tools.resolve_inventory(user_inventory=DeviceInventory(data=USER_DEVICES))
+        assert missing == []
+        assert [x.system_mac for x in inventory.devices] == ['50:8d:00:e3:78:aa', '50:8d:00:e3:78:bb']
+        assert [x.serial_number for x in inventory.devices] == ['SN-LEAF1', 'SN-SPINE1']
+        assert cv_client.api.calls['get_inventory'] == 1
+        assert cv_client.api.calls['get_device_by_name'] == 0
+        logging.info('Inventory resolved with a single API call')
+
+    def test_resolve_missing_device(self):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_FQDN)
+        inventory, missing = tools.resolve_inventory(user_inventory=DeviceInventory(data=USER_DEVICES_FQDN))
+        assert missing == ['unknown.dc1.lab']
+        assert [x.fqdn for x in inventory.devices] == ['leaf1.dc1.lab']
+
+    def test_resolve_by_serial(self):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_SERIAL)
+        inventory, missing = tools.resolve_inventory(user_inventory=DeviceInventory(data=USER_DEVICES_SERIAL))
+        assert missing == []
+        assert [x.fqdn for x in inventory.devices] == ['leaf1.dc1.lab', 'spine1.dc1.lab']
+        assert [x.system_mac for x in inventory.devices] == ['50:8d:00:e3:78:aa', '50:8d:00:e3:78:bb']
+        assert cv_client.api.calls['get_device_by_serial'] == 0
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsParallel():
+
+    @pytest.mark.parametrize('parallelism', [1, 4])
+    def test_apply_configlets(self, parallelism):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME, parallelism=parallelism)
+        inventory, _ = tools.resolve_inventory(user_inventory=DeviceInventory(data=USER_DEVICES_BASE))
+        results = tools.apply_configlets(user_inventory=inventory)
+        assert [x.name for x in results] == ['leaf1_configlet_attached', 'spine1_configlet_attached']
+        assert [x.taskIds for x in results] == [['task_leaf1'], ['task_spine1']]
+        assert cv_client.api.calls['apply_configlets_to_device'] == 2
+        assert cv_client.api.calls['get_inventory'] == 1
+        logging.info('Configlets applied with %s workers', parallelism)
+
+    @pytest.mark.parametrize('parallelism', [1, 4])
+    def test_apply_configlets_error(self, parallelism):
+        cv_client = CvClientStub()
+        module = AnsibleModuleStub()
+        tools = CvDeviceTools(cv_connection=cv_client, ansible_module=module, search_by=FIELD_HOSTNAME, parallelism=parallelism)
+        user_devices = [{'fqdn': 'leaf1', 'parentContainerName': 'LEAFS', 'configlets': ['UNKNOWN']},
+                        {'fqdn': 'spine1', 'parentContainerName': 'SPINES', 'configlets': ['UNKNOWN']}]
+        inventory, _ = tools.resolve_inventory(user_inventory=DeviceInventory(data=user_devices))
+        with pytest.raises(AssertionError, match='UNKNOWN'):
+            tools.apply_configlets(user_inventory=inventory)
+        assert len(module.failures) == 1
+        assert cv_client.api.calls['apply_configlets_to_device'] == 0
+
+    def test_apply_configlets_stop_after_error(self):
+        cv_client = CvClientStub()
+        module = AnsibleModuleStub()
+        tools = CvDeviceTools(cv_connection=cv_client, ansible_module=module, search_by=FIELD_HOSTNAME)
+        user_devices = [{'fqdn': 'leaf1', 'parentContainerName': 'LEAFS', 'configlets': ['UNKNOWN']},
+                        {'fqdn': 'spine1', 'parentContainerName': 'SPINES', 'configlets': ['SPINE1', 'BASE']}]
+        inventory, _ = tools.resolve_inventory(user_inventory=DeviceInventory(data=user_devices))
+        with pytest.raises(AssertionError):
+            tools.apply_configlets(user_inventory=inventory)
+        assert cv_client.api.calls['apply_configlets_to_device'] == 0
+
+    def test_apply_configlets_no_change(self):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME, parallelism=4)
+        inventory, _ = tools.resolve_inventory(user_inventory=DeviceInventory(data=USER_DEVICES))
+        assert tools.apply_configlets(user_inventory=inventory) == []
+        assert cv_client.api.calls['apply_configlets_to_device'] == 0
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsReorder():
+
+    @pytest.mark.parametrize('configlets, expected', [
+        (['BASE'], ['configlet_leaf1', 'configlet_base']),
+        (['BASE', 'LEAF1'], ['configlet_base', 'configlet_leaf1']),
+        (['LEAF1', 'BASE'], ['configlet_leaf1', 'configlet_base']),
+    ])
+    def test_apply_configlets_order(self, configlets, expected):
+        cv_client = CvClientStub()
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME)
+        user_devices = [{'fqdn': 'leaf1', 'parentContainerName': 'LEAFS', 'configlets': configlets}]
+        inventory, _ = tools.resolve_inventory(user_inventory=DeviceInventory(data=user_devices))
+        tools.apply_configlets(user_inventory=inventory)
+        assert [x['configletId'] for x in cv_client.api.mappers if x['objectId'] == '50:8d:00:e3:78:aa'] == expected
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 1
+        assert cv_client.api.calls['get_configlet_by_name'] == 0
@@ -0,0 +1,368 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import gzip
+import os
+import time
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import CvFactsTools, CvFactsCache
+from ansible_collections.arista.cvp.plugins.module_utils.facts_tools import facts_to_file, facts_from_file, load_cvp_facts
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
+from lib.cv_client_stub import CvClientStub, AnsibleModuleStub
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvFactsToolsDevices():
+
+    @pytest.mark.parametrize('parallelism', [1, 4])
+    def test_facts_devices(self, parallelism):
+        cv_client = CvClientStub()
+        facts_tools = CvFactsTools(cv_connection=cv_client, parallelism=parallelism)
+        devices = facts_tools.facts_devices()
+        assert [x['name'] for x in devices] == ['leaf1', 'spine1']
+        assert [x['parentContainerName'] for x in devices] == ['LEAFS', 'SPINES']
+        assert [x['deviceSpecificConfiglets'] for x in devices] == [['LEAF1'], ['SPINE1']]
+        assert [x['imageBundle'] for x in devices] == ['EOS-4.25', 'EOS-4.25']
+        assert 'config' not in devices[0]
+        assert cv_client.api.calls['get_containers'] == 1
+        assert cv_client.api.calls['get_container_by_id'] == 0
+        assert cv_client.api.calls['get_configlets_by_device_id'] == 2
+        logging.info('Devices facts collected with %s workers', parallelism)
+
+    def test_facts_devices_config(self):
+        cv_client = CvClientStub()
+        devices = CvFactsTools(cv_connection=cv_client, parallelism=2).facts_devices(gather_config=True)
+        assert devices[0]['config'] == '! config of 50:8d:00:e3:78:aa\n'
+        assert cv_client.api.calls['get_device_configuration'] == 2
+
+    def test_facts_devices_unknown_container(self):
+        inventory = [{'hostname': 'leaf9', 'fqdn': 'leaf9', 'systemMacAddress': '50:8d:00:e3:78:99', 'key': '50:8d:00:e3:78:99',
+                      'parentContainerKey': 'undefined_container', 'streamingStatus': 'active'}]
+        containers = [{'key': 'root', 'name': 'Tenant', 'parentName': None},
+                      {'key': 'undefined_container', 'name': 'Undefined', 'parentName': 'Tenant'}]
+        cv_client = CvClientStub(inventory=inventory)
+        cv_client.api.containers = containers[:1]
+        facts_tools = CvFactsTools(cv_connection=cv_client)
+        cv_client.api.get_container_by_id = lambda key: containers[1]
+        assert facts_tools.facts_devices()[0]['parentContainerName'] == 'Undefined'
+
+    def test_facts_devices_timeout(self):
+        cv_client = CvClientStub()
+        cv_client.api.device_delay = {'50:8d:00:e3:78:aa': 1}
+        facts_tools = CvFactsTools(cv_connection=cv_client, parallelism=2, timeout=0.1)
+        devices = facts_tools.facts_devices()
+        assert [x['name'] for x in devices] == ['spine1']
+        assert facts_tools.timed_out == ['leaf1']
+        assert cv_client.api.request_timeouts == [0.1, 0.1]
+        assert cv_client.api.request_timeout == 30
+
+    def test_facts_devices_timeout_abandoned_worker(self):
+        cv_client = CvClientStub()
+        cv_client.api.device_delay = {'50:8d:00:e3:78:aa': 0.3}
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        devices = CvFactsTools(cv_connection=cv_client, parallelism=2, timeout=0.1, snapshot=snapshot).facts_devices()
+        # Wait for abandoned worker to complete
+        time.sleep(0.4)
+        assert [x['name'] for x in devices] == ['spine1']
+        assert all('imageBundle' not in device and 'name' not in device for device in snapshot.devices)
+
+
+@pytest.mark.generic
+class TestCvFactsCache():
+
+    def collect(self, cv_client, cache_dir, gather_config=False):
+        cache = CvFactsCache(cache_dir=str(cache_dir), cache_key='cvp.lab')
+        devices = CvFactsTools(cv_connection=cv_client, cache=cache).facts_devices(gather_config=gather_config)
+        return devices, cache
+
+    def test_cache_hit(self, tmp_path):
+        cv_client = CvClientStub()
+        devices_first, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary['devices_refreshed'] == 2
+        assert oct(os.stat(cache.path).st_mode & 0o777) == oct(0o600)
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary['devices_cached'] == 2
+        assert cv_client.api.calls['get_configlets_by_device_id'] == 2
+        assert cv_client.api.calls['get_device_image_info'] == 2
+        assert devices == devices_first
+        logging.info('Devices facts served from %s', cache.path)
+
+    def test_cache_volatile_field(self, tmp_path):
+        cv_client = CvClientStub()
+        self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        cv_client.api.inventory[0]['lastSyncUp'] = 1234
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary['devices_cached'] == 2
+        assert devices[0]['lastSyncUp'] == 1234
+
+    def test_cache_inventory_changed(self, tmp_path):
+        cv_client = CvClientStub()
+        self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        cv_client.api.inventory[1]['parentContainerKey'] = 'container_leafs'
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary == {'path': cache.path, 'devices_cached': 1, 'devices_refreshed': 1}
+        assert devices[1]['parentContainerName'] == 'LEAFS'
+
+    def test_cache_configlet_changed(self, tmp_path):
+        cv_client = CvClientStub()
+        self.collect(cv_client=cv_client, cache_dir=tmp_path, gather_config=True)
+        # BASE is applied to DC1, parent of both devices containers
+        cv_client.api.configlets[0]['dateTimeInLongFormat'] = 1600000000000
+        _, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path, gather_config=True)
+        assert cache.summary['devices_refreshed'] == 2
+        assert cv_client.api.calls['get_device_configuration'] == 4
+
+    def test_cache_configlet_container_count(self, tmp_path):
+        cv_client = CvClientStub()
+        devices, _ = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert devices[0]['deviceSpecificConfiglets'] == ['LEAF1']
+        # LEAF1 is also applied to a container unrelated to leaf1 and is no longer device specific
+        cv_client.api.configlets[1]['containerCount'] = 1
+        cv_client.api.mappers.append({'configletId': 'configlet_leaf1', 'objectId': 'container_spines', 'type': 'container'})
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary['devices_refreshed'] == 2
+        assert devices[0]['deviceSpecificConfiglets'] == []
+
+    def test_cache_gather_config(self, tmp_path):
+        cv_client = CvClientStub()
+        self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path, gather_config=True)
+        assert cache.summary['devices_cached'] == 2
+        assert 'config' in devices[0]
+        assert cv_client.api.calls['get_device_configuration'] == 2
+
+    def test_cache_config_not_cached(self, tmp_path):
+        cv_client = CvClientStub()
+        self.collect(cv_client=cv_client, cache_dir=tmp_path, gather_config=True)
+        # Running-config changed on device without any change on Cloudvision
+        cv_client.api.get_device_configuration = lambda key: '! drifted config of {0}\n'.format(key)
+        devices, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path, gather_config=True)
+        assert cache.summary['devices_cached'] == 2
+        assert devices[0]['config'] == '! drifted config of 50:8d:00:e3:78:aa\n'
+        with open(cache.path, 'r', encoding='utf-8') as cache_file:
+            assert '! config of' not in cache_file.read()
+
+    def test_cache_corrupted(self, tmp_path):
+        cv_client = CvClientStub()
+        (tmp_path / 'cvp.lab.json').write_text('{not json')
+        _, cache = self.collect(cv_client=cv_client, cache_dir=tmp_path)
+        assert cache.summary['devices_refreshed'] == 2
+
+
+@pytest.mark.generic
+class TestFactsFile():
+
+    FACTS = {'cvp_info': {'version': '2020.2.3'},
+             'devices': [{'name': 'leaf1'}, {'name': 'spine1'}],
+             'tasks': []}
+
+    @pytest.mark.parametrize('filename', ['facts.json', 'facts.json.gz', 'facts.jsonl', 'facts.jsonl.gz'])
+    def test_facts_file(self, tmp_path, filename):
+        path = str(tmp_path / filename)
+        summary = facts_to_file(facts=self.FACTS, path=path)
+        assert summary == {'cvp_info': 1, 'devices': 2, 'tasks': 0}
+        assert facts_from_file(path=path) == self.FACTS
+        assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+        logging.info('Facts written and read from %s', filename)
+
+    def test_facts_file_jsonl_lines(self, tmp_path):
+        path = tmp_path / 'facts.jsonl'
+        facts_to_file(facts=self.FACTS, path=str(path))
+        assert len(path.read_text().splitlines()) == 5
+
+    def test_load_cvp_facts(self, tmp_path):
+        path = str(tmp_path / 'facts.jsonl.gz')
+        facts_to_file(facts=self.FACTS, path=path)
+        module = AnsibleModuleStub(params={'cvp_facts': None, 'cvp_facts_file': path})
+        load_cvp_facts(module=module)
+        assert module.params['cvp_facts'] == self.FACTS
+
+    def test_load_cvp_facts_missing(self, tmp_path):
+        module = AnsibleModuleStub(params={'cvp_facts': None, 'cvp_facts_file': str(tmp_path / 'missing.json')})
+        with pytest.raises(AssertionError):
+            load_cvp_facts(module=module)
+
+
+@pytest.mark.generic
+class TestParallelMapTimeout():
+
+    @pytest.mark.parametrize('max_workers', [1, 3])
+    def test_no_timeout_reached(self, max_workers):
+        assert parallel_map(function=lambda x: x * 2, items=[1, 2, 3], max_workers=max_workers, timeout=10) == [2, 4, 6]
+
+    def test_on_timeout(self):
+        def function(item):
+            if item == 2:
+                time.sleep(1)
+            return item
+        assert parallel_map(function=function, items=[1, 2, 3], max_workers=3, timeout=0.1, on_timeout=lambda x: -x) == [1, -2, 3]
+
+    def test_exception(self):
+        with pytest.raises(ZeroDivisionError):
+            parallel_map(function=lambda x: 1 / x, items=[1, 0], max_workers=2, timeout=10)
+
+
+@pytest.mark.generic
+class TestCvFactsToolsConfiglets():
+
+    def test_facts_configlets(self):
+        cv_client = CvClientStub()
+        configlets = CvFactsTools(cv_connection=cv_client).facts_configlets()
+        assert [x['name'] for x in configlets] == ['BASE', 'LEAF1', 'SPINE1']
+        assert [x['devices'] for x in configlets] == [[], ['leaf1'], ['spine1']]
+        assert [x['containers'] for x in configlets] == [['DC1'], [], []]
+        assert cv_client.api.calls['get_inventory'] == 1
+        assert cv_client.api.calls['get_containers'] == 1
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 1
+
+    def test_facts_configlets_from_facts(self):
+        cv_client = CvClientStub()
+        facts_tools = CvFactsTools(cv_connection=cv_client)
+        inventory = facts_tools.facts_devices()
+        containers = [{'Key': 'container_dc1', 'Name': 'DC1'}]
+        configlets = facts_tools.facts_configlets(inventory=inventory, containers=containers)
+        assert [x['devices'] for x in configlets] == [[], ['leaf1'], ['spine1']]
+        assert [x['containers'] for x in configlets] == [['DC1'], [], []]
+        assert cv_client.api.calls['get_inventory'] == 1
+
+    def test_facts_configlets_unknown_objects(self):
+        mappers = [{'configletId': 'configlet_base', 'objectId': 'container_unknown', 'type': 'container'},
+                   {'configletId': 'configlet_base', 'objectId': '50:8d:00:e3:78:aa', 'type': 'netelement'},
+                   {'configletId': 'configlet_base', 'objectId': '50:8d:00:e3:78:00', 'type': 'netelement'},
+                   {'configletId': 'configlet_unknown', 'objectId': '50:8d:00:e3:78:bb', 'type': 'netelement'}]
+        configlets = CvFactsTools(cv_connection=CvClientStub(mappers=mappers)).facts_configlets()
+        assert [x['devices'] for x in configlets] == [['leaf1'], [], []]
+        assert [x['containers'] for x in configlets] == [[], [], []]
+
+
+@pytest.mark.generic
+class TestCvFactsToolsContainers():
+
+    def test_facts_containers(self):
+        cv_client = CvClientStub()
+        containers = CvFactsTools(cv_connection=cv_client).facts_containers()
+        assert [x['name'] for x in containers] == ['Tenant', 'DC1', 'LEAFS', 'SPINES']
+        assert [x['devices'] for x in containers] == [[], [], ['leaf1.dc1.lab'], ['spine1.dc1.lab']]
+        assert [x['configlets'] for x in containers] == [[], ['BASE'], [], []]
+        assert [x['imageBundle'] for x in containers] == ['', '', '', '']
+        assert cv_client.api.calls['get_image_bundles'] == 1
+        assert cv_client.api.calls['get_image_bundle_by_container_id'] == 0
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 1
+
+    def test_facts_containers_configlets_order(self):
+        configlets = [{'key': 'configlet_' + x.lower(), 'name': x, 'containerCount': 1} for x in ['BASE', 'AAA', 'NTP']]
+        mappers = [{'configletId': 'configlet_ntp', 'objectId': 'container_dc1', 'type': 'container', 'order': 3},
+                   {'configletId': 'configlet_base', 'objectId': 'container_dc1', 'type': 'container', 'order': 1},
+                   {'configletId': 'configlet_aaa', 'objectId': 'container_dc1', 'type': 'container', 'order': 2}]
+        cv_client = CvClientStub(configlets=configlets, mappers=mappers)
+        containers = CvFactsTools(cv_connection=cv_client).facts_containers()
+        assert [x['configlets'] for x in containers] == [[], ['BASE', 'AAA', 'NTP'], [], []]
+
+    @pytest.mark.parametrize('parallelism', [1, 4])
+    def test_facts_containers_images(self, parallelism):
+        cv_client = CvClientStub()
+        cv_client.api.container_images = {'container_leafs': 'EOS-4.25'}
+        containers = CvFactsTools(cv_connection=cv_client, parallelism=parallelism).facts_containers()
+        assert [x['imageBundle'] for x in containers] == ['', '', 'EOS-4.25', '']
+        assert cv_client.api.calls['get_image_bundle_by_container_id'] == 4
+
+    def test_facts_containers_bulk_unavailable(self):
+        cv_client = CvClientStub()
+        cv_client.api.get_image_bundles = lambda start=0, end=0: {'errorCode': '112498'}
+        containers = CvFactsTools(cv_connection=cv_client).facts_containers()
+        assert [x['imageBundle'] for x in containers] == ['', '', '', '']
+        assert cv_client.api.calls['get_image_bundle_by_container_id'] == 4
+
+
+@pytest.mark.generic
+class TestCvFactsToolsProjection():
+
+    def test_devices_fields(self):
+        cv_client = CvClientStub()
+        facts_tools = CvFactsTools(cv_connection=cv_client, fields={'devices': ['hostname', 'systemMacAddress', 'parentContainerName']})
+        devices = facts_tools.facts_devices(gather_config=True)
+        assert devices == [{'hostname': 'leaf1', 'systemMacAddress': '50:8d:00:e3:78:aa', 'parentContainerName': 'LEAFS'},
+                           {'hostname': 'spine1', 'systemMacAddress': '50:8d:00:e3:78:bb', 'parentContainerName': 'SPINES'}]
+        assert cv_client.api.calls['get_configlets_by_device_id'] == 0
+        assert cv_client.api.calls['get_device_image_info'] == 0
+        assert cv_client.api.calls['get_device_configuration'] == 0
+        logging.info('Devices facts collected without per device calls')
+
+    def test_devices_exclude_fields(self):
+        cv_client = CvClientStub()
+        facts_tools = CvFactsTools(cv_connection=cv_client, exclude_fields={'devices': ['imageBundle', 'streamingStatus']})
+        devices = facts_tools.facts_devices()
+        assert 'imageBundle' not in devices[0] and 'streamingStatus' not in devices[0]
+        assert devices[0]['deviceSpecificConfiglets'] == ['LEAF1']
+        assert cv_client.api.calls['get_device_image_info'] == 0
+
+    @pytest.mark.parametrize('patterns, expected', [(['leaf.*'], ['leaf1']), (['spine1', 'leaf1'], ['leaf1', 'spine1']), (['leaf'], [])])
+    def test_devices_filters(self, patterns, expected):
+        cv_client = CvClientStub()
+        devices = CvFactsTools(cv_connection=cv_client, filters={'devices': patterns}).facts_devices()
+        assert [x['hostname'] for x in devices] == expected
+        assert cv_client.api.calls['get_configlets_by_device_id'] == len(expected)
+
+    def test_configlets_projection(self):
+        cv_client = CvClientStub()
+        facts_tools = CvFactsTools(cv_connection=cv_client, fields={'configlets': ['name', 'devices']}, filters={'configlets': ['LEAF.*', 'SPINE.*'],
+                                                                                                                'devices': ['spine.*']})
+        facts_tools.facts_devices()
+        configlets = facts_tools.facts_configlets()
+        assert configlets == [{'name': 'LEAF1', 'devices': ['leaf1']}, {'name': 'SPINE1', 'devices': ['spine1']}]
+
+    def test_containers_projection(self):
+        cv_client = CvClientStub()
+        cv_client.api.container_images = {'container_leafs': 'EOS-4.25'}
+        facts_tools = CvFactsTools(cv_connection=cv_client, exclude_fields={'containers': ['imageBundle']}, filters={'containers': ['LEAFS']})
+        containers = facts_tools.facts_containers()
+        assert [x['name'] for x in containers] == ['LEAFS']
+        assert 'imageBundle' not in containers[0]
+        assert cv_client.api.calls['get_image_bundles'] == 0
+        assert cv_client.api.calls['get_image_bundle_by_container_id'] == 0
+
+
+@pytest.mark.generic
+class TestCvFactsToolsConfigFiles():
+
+    @pytest.mark.parametrize('compress, suffix', [(False, '.cfg'), (True, '.cfg.gz')])
+    def test_config_files(self, tmp_path, compress, suffix):
+        cv_client = CvClientStub()
+        config_dir = tmp_path / 'configs'
+        facts_tools = CvFactsTools(cv_connection=cv_client, parallelism=2, config_dir=str(config_dir), config_compress=compress)
+        devices = facts_tools.facts_devices(gather_config=True)
+        assert [x['configFile'] for x in devices] == [str(config_dir / ('leaf1' + suffix)), str(config_dir / ('spine1' + suffix))]
+        assert 'config' not in devices[0]
+        opener = gzip.open if compress else open
+        with opener(devices[0]['configFile'], 'rt') as config_file:
+            assert config_file.read() == '! config of 50:8d:00:e3:78:aa\n'
+        assert oct(os.stat(devices[0]['configFile']).st_mode & 0o777) == oct(0o600)
+        assert cv_client.api.calls['get_device_configuration'] == 2
+        assert sorted(os.listdir(str(config_dir))) == sorted(['leaf1' + suffix, 'spine1' + suffix])
+
+    def test_config_files_not_streaming(self, tmp_path):
+        cv_client = CvClientStub()
+        cv_client.api.inventory[1]['streamingStatus'] = 'inactive'
+        devices = CvFactsTools(cv_connection=cv_client, config_dir=str(tmp_path)).facts_devices(gather_config=True)
+        assert 'configFile' in devices[0] and 'configFile' not in devices[1]
+
+    def test_config_files_without_gather_config(self, tmp_path):
+        cv_client = CvClientStub()
+        devices = CvFactsTools(cv_connection=cv_client, config_dir=str(tmp_path)).facts_devices()
+        assert 'configFile' not in devices[0]
+        assert cv_client.api.calls['get_device_configuration'] == 0
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.snapshot_tools import CvSnapshot
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_FQDN, FIELD_HOSTNAME, FIELD_SERIAL, FIELD_SYSMAC
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map
+from lib.cv_client_stub import CvClientStub, CV_INVENTORY
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvSnapshot():
+
+    @pytest.mark.parametrize('search_by, field', [(FIELD_FQDN, 'fqdn'), (FIELD_SYSMAC, 'systemMacAddress'), (FIELD_SERIAL, 'serialNumber')])
+    def test_get_device_indexes(self, search_by, field):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        for device in CV_INVENTORY:
+            assert snapshot.get_device(search_value=device[field], search_by=search_by)['key'] == device['key']
+        assert cv_client.api.calls['get_inventory'] == 1
+        logging.info('Devices found using %s with a single inventory call', search_by)
+
+    def test_get_device_by_hostname(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        assert snapshot.get_device(search_value='leaf1', search_by=FIELD_HOSTNAME)['fqdn'] == 'leaf1.dc1.lab'
+        assert snapshot.get_device(search_value='leaf1.dc1.lab', search_by=FIELD_FQDN)['parentContainerId'] == 'container_leafs'
+
+    def test_get_device_missing_fallback(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        assert snapshot.get_device(search_value='unknown', search_by=FIELD_HOSTNAME) == {}
+        assert cv_client.api.calls['get_device_by_name'] == 1
+
+    def test_get_container(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        assert snapshot.get_container_by_name(container_name='LEAFS')['key'] == 'container_leafs'
+        assert snapshot.get_container_by_key(container_key='container_spines')['name'] == 'SPINES'
+        assert snapshot.get_container_by_name(container_name='UNKNOWN') is None
+        assert cv_client.api.calls['get_containers'] == 1
+        assert cv_client.api.calls['get_container_by_name'] == 1
+
+    def test_remove_container(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        snapshot.remove_container(container_name='SPINES')
+        cv_client.api.containers = [x for x in cv_client.api.containers if x['name'] != 'SPINES']
+        assert snapshot.get_container_by_name(container_name='SPINES') is None
+
+    def test_get_configlets(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        assert snapshot.get_configlet_by_name(configlet_name='BASE')['key'] == 'configlet_base'
+        assert snapshot.get_configlet_by_key(configlet_key='configlet_leaf1')['name'] == 'LEAF1'
+        assert [x['name'] for x in snapshot.get_configlets_by_object_id(object_id='container_dc1')] == ['BASE']
+        assert snapshot.get_configlets_by_object_id(object_id='container_leafs') == []
+        assert cv_client.api.calls['get_configlets_and_mappers'] == 1
+
+    def test_set_device_container(self):
+        snapshot = CvSnapshot(cv_connection=CvClientStub())
+        snapshot.set_device_container(system_mac='50:8d:00:e3:78:aa', container={'key': 'container_spines', 'name': 'SPINES'})
+        device = snapshot.get_device(search_value='leaf1', search_by=FIELD_HOSTNAME)
+        assert device['containerName'] == 'SPINES'
+        assert device['parentContainerId'] == 'container_spines'
+
+    def test_devices_not_modified(self):
+        snapshot = CvSnapshot(cv_connection=CvClientStub())
+        assert snapshot.get_device(search_value='leaf1', search_by=FIELD_HOSTNAME)['parentContainerId'] == 'container_leafs'
+        assert all('parentContainerId' not in device for device in snapshot.devices)
+
+    def test_get_device_fallback_concurrent(self):
+        cv_client = CvClientStub()
+        snapshot = CvSnapshot(cv_connection=cv_client)
+        snapshot.devices
+        cv_client.api.inventory = cv_client.api.inventory + [dict(CV_INVENTORY[0], fqdn='leaf2.dc1.lab', hostname='leaf2',
+                                                                   systemMacAddress='50:8d:00:e3:78:cc', serialNumber='SN-LEAF2', key='50:8d:00:e3:78:cc')]
+        results = parallel_map(function=lambda mac: snapshot.get_device(search_value=mac, search_by=FIELD_SYSMAC),
+                               items=['50:8d:00:e3:78:cc'] * 8, max_workers=4)
+        assert all(device['hostname'] == 'leaf2' for device in results)
+        assert snapshot.get_device(search_value='leaf2', search_by=FIELD_HOSTNAME)['parentContainerId'] == 'container_leafs'
@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import threading
+import time
+from collections import Counter
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils import task_tools
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import CvTaskTools, CvTaskWaiter, TASK_BULK_THRESHOLD
+from lib.cv_client_stub import CvClientStub, AnsibleModuleStub
+
+
+class FakeClock():
+    """Fake clock moving forward only when sleeping"""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = list()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(task_tools.time, 'time', fake_clock.time)
+    monkeypatch.setattr(task_tools.time, 'sleep', fake_clock.sleep)
+    return fake_clock
+
+
+def in_progress_tasks(count: int):
+    """Build a list of tasks in progress"""
+    return [{'workOrderId': str(x), 'workOrderUserDefinedStatus': 'In-Progress'} for x in range(count)]
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvTaskWaiter():
+
+    def test_wait_backoff(self, clock):
+        cv_client = CvClientStub(tasks=in_progress_tasks(2), task_duration=4)
+        waiter = CvTaskWaiter(cv_connection=cv_client, timeout=600, jitter=0)
+        tasks_data = waiter.wait(task_ids=['0', '1'])
+        assert [x['workOrderUserDefinedStatus'] for x in tasks_data.values()] == ['Completed', 'Completed']
+        assert waiter.timed_out == []
+        assert clock.sleeps == [1, 2, 4, 8]
+        assert waiter.polls == 5
+        logging.info('Tasks completed after %s polls', waiter.polls)
+
+    def test_wait_timeout(self, clock):
+        cv_client = CvClientStub(tasks=in_progress_tasks(1), task_duration=1000)
+        waiter = CvTaskWaiter(cv_connection=cv_client, timeout=600, max_poll_interval=30)
+        waiter.wait(task_ids=['0'])
+        assert waiter.timed_out == ['0']
+        assert clock.now == pytest.approx(600)
+        assert max(clock.sleeps) <= 30 * 1.1
+        assert cv_client.api.calls['get_task_by_id'] < 40
+
+    def test_wait_task_timeout(self, clock):
+        cv_client = CvClientStub(tasks=in_progress_tasks(2), task_duration=1000)
+        waiter = CvTaskWaiter(cv_connection=cv_client, timeout=600, jitter=0)
+        waiter.wait(task_ids=['0', '1'], task_timeouts={'0': 10})
+        assert waiter.timed_out == ['0', '1']
+        assert clock.now == pytest.approx(600)
+
+    def test_wait_bulk(self, clock):
+        count = TASK_BULK_THRESHOLD + 5
+        cv_client = CvClientStub(tasks=in_progress_tasks(count), task_duration=2)
+        waiter = CvTaskWaiter(cv_connection=cv_client, timeout=600)
+        waiter.wait(task_ids=[str(x) for x in range(count)])
+        assert waiter.timed_out == []
+        assert cv_client.api.calls['get_tasks'] == 0
+        assert cv_client.api.calls['get_tasks_by_status'] == 2 * waiter.polls
+        # Each task is retrieved alone once, when it is no longer in progress
+        assert cv_client.api.calls['get_task_by_id'] == count
+
+
+@pytest.mark.generic
+class TestCvTaskTools():
+
+    def test_tasker_wait(self, clock):
+        cv_client = CvClientStub(task_duration=2)
+        ansible_module = AnsibleModuleStub()
+        tools = CvTaskTools(cv_connection=cv_client, ansible_module=ansible_module)
+        response = tools.tasker(taskIds_list=['10', '11', '12'], wait=60)
+        assert response.content['actions_manager']['actions_manager_list'] == ['task_10', 'task_11']
+        assert cv_client.api.calls['execute_task'] == 2
+        assert ansible_module.warnings == []
+
+    def test_tasker_wait_timeout(self, clock):
+        cv_client = CvClientStub(task_duration=1000)
+        ansible_module = AnsibleModuleStub()
+        tools = CvTaskTools(cv_connection=cv_client, ansible_module=ansible_module)
+        tools.tasker(taskIds_list=['10'], wait=60)
+        assert ansible_module.warnings == ['Task 10 has not completed in 60 seconds']
+
+    def test_tasker_bulk(self):
+        count = TASK_BULK_THRESHOLD + 5
+        tasks = [{'workOrderId': str(x), 'workOrderUserDefinedStatus': 'Pending' if x % 2 else 'Completed'} for x in range(count)]
+        cv_client = CvClientStub(tasks=tasks)
+        tools = CvTaskTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.tasker(taskIds_list=[str(x) for x in range(count)])
+        assert response.content['actions_manager']['actions_manager_list'] == ['task_{}'.format(x) for x in range(count) if x % 2]
+        assert cv_client.api.calls['get_tasks_by_status'] == 1
+        assert cv_client.api.calls['get_task_by_id'] == 0
+        assert cv_client.api.calls['execute_task'] == count // 2
+
+    @pytest.mark.parametrize('max_concurrent', [1, 4])
+    def test_tasker_concurrent(self, max_concurrent):
+        count = 8
+        tasks = [{'workOrderId': str(x), 'workOrderUserDefinedStatus': 'Pending'} for x in range(count)]
+        cv_client = CvClientStub(tasks=tasks)
+        tools = CvTaskTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.tasker(taskIds_list=[str(x) for x in range(count)], max_concurrent=max_concurrent)
+        assert response.content['actions_manager']['actions_manager_list'] == ['task_{}'.format(x) for x in range(count)]
+        assert cv_client.api.calls['execute_task'] == count
+        logging.info('Tasks executed in order with %s workers', max_concurrent)
+
+    def test_tasker_concurrent_per_container(self):
+        count = 6
+        tasks = [{'workOrderId': str(x), 'workOrderUserDefinedStatus': 'Pending',
+                  'workOrderDetails': {'netElementId': '50:8d:00:e3:78:aa' if x % 2 else '50:8d:00:e3:78:bb'}}
+                 for x in range(count)]
+        cv_client = CvClientStub(tasks=tasks)
+        in_flight = Counter()
+        max_in_flight = Counter()
+        lock = threading.Lock()
+        execute_task = cv_client.api.execute_task
+
+        def tracked_execute_task(task_id):
+            container = tasks[int(task_id)]['workOrderDetails']['netElementId']
+            with lock:
+                in_flight[container] += 1
+                max_in_flight[container] = max(max_in_flight[container], in_flight[container])
+            time.sleep(0.01)
+            with lock:
+                in_flight[container] -= 1
+            return execute_task(task_id)
+
+        cv_client.api.execute_task = tracked_execute_task
+        tools = CvTaskTools(cv_connection=cv_client, ansible_module=AnsibleModuleStub())
+        response = tools.tasker(taskIds_list=[str(x) for x in range(count)], max_concurrent=6, max_concurrent_per_container=1)
+        assert response.content['actions_manager']['actions_manager_list'] == ['task_{}'.format(x) for x in range(count)]
+        assert max(max_in_flight.values()) == 1
+        assert cv_client.api.calls['get_inventory'] == 1
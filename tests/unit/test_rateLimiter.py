@@ -0,0 +1,131 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import time
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from cvprac.cvp_client_errors import CvpApiError, CvpRequestError
+from ansible_collections.arista.cvp.plugins.module_utils.rate_limiter import CvRateLimiter, is_throttled, RATE_LIMIT_ENV, RATE_BURST_ENV
+from ansible_collections.arista.cvp.plugins.module_utils.api_retry import CvApiRetry
+from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import parallel_map
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceInventory, CvDeviceTools
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_HOSTNAME
+from lib.cv_client_stub import CvClientStub
+
+THROTTLED = 'GET: https://cvp.lab/web/inventory/devices : Request Error: Too Many Requests - '
+
+
+def flaky(failures, error):
+    """
+    Build a function raising error for the first failures calls
+    """
+    calls = {'count': 0}
+
+    def function():
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            raise error
+        return calls['count']
+    return function
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvRateLimiter():
+
+    @pytest.mark.parametrize('error, expected', [
+        (CvpRequestError(THROTTLED), True),
+        (CvpRequestError('POST: https://cvp.lab/web : Request Error: Service Unavailable - '), True),
+        (CvpRequestError('GET: https://cvp.lab/web : Request Error: Not Found - '), False),
+        (CvpRequestError('GET: https://cvp.lab/web : Request Error: Not Found - configlet Too Many Requests - '), False),
+        (CvpApiError('Unauthorized'), False),
+    ])
+    def test_is_throttled(self, error, expected):
+        assert is_throttled(error) == expected
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.delenv(RATE_LIMIT_ENV, raising=False)
+        assert CvRateLimiter.from_env() is None
+        monkeypatch.setenv(RATE_LIMIT_ENV, 'fast')
+        assert CvRateLimiter.from_env() is None
+        monkeypatch.setenv(RATE_LIMIT_ENV, '20')
+        monkeypatch.setenv(RATE_BURST_ENV, '5')
+        assert CvRateLimiter.from_env().rate == 20
+
+    def test_rate_limited(self):
+        limiter = CvRateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.2
+
+    def test_rate_limited_concurrent(self):
+        limiter = CvRateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        parallel_map(lambda x: limiter.call(lambda: x), list(range(11)), max_workers=4)
+        assert time.monotonic() - start >= 0.18
+
+    def test_throttled_call_raised(self):
+        limiter = CvRateLimiter(rate=20)
+        function = flaky(failures=1, error=CvpRequestError(THROTTLED))
+        with pytest.raises(CvpRequestError):
+            limiter.call(function)
+        assert limiter.summary['throttled'] == 1
+        assert limiter.rate == 10
+        assert limiter.call(function) == 2
+        assert limiter.rate == pytest.approx(10 + 1 / 10)
+
+    def test_rate_recovers(self):
+        limiter = CvRateLimiter(rate=4)
+        with pytest.raises(CvpRequestError):
+            limiter.call(flaky(failures=1, error=CvpRequestError(THROTTLED)))
+        for _ in range(10):
+            limiter.success()
+        assert limiter.rate == 4
+
+    def test_error_raised(self):
+        limiter = CvRateLimiter(rate=20)
+        with pytest.raises(CvpApiError):
+            limiter.call(flaky(failures=1, error=CvpApiError('Unauthorized')))
+        assert limiter.summary['throttled'] == 0
+        assert limiter.rate == 20
+
+    @pytest.mark.parametrize('method, sent', [
+        ('get_inventory', 3),
+        ('add_container', 1),
+    ])
+    def test_unavailable_resent_by_retry(self, method, sent):
+        calls = {'count': 0}
+
+        def function():
+            calls['count'] += 1
+            raise CvpRequestError('POST: https://cvp.lab/web : Request Error: Service Unavailable - ')
+        limiter = CvRateLimiter(rate=100)
+        retry = CvApiRetry(retries=2, backoff=0.01)
+        with pytest.raises(CvpRequestError):
+            retry.call(method, lambda: limiter.call(function))
+        assert calls['count'] == sent
+        assert limiter.summary['throttled'] == sent
+
+    def test_attach(self):
+        cv_client = CvClientStub()
+        limiter = CvRateLimiter(rate=100)
+        limiter.attach(cv_client)
+        tools = CvDeviceTools(cv_connection=cv_client, search_by=FIELD_HOSTNAME)
+        inventory, missing = tools.resolve_inventory(user_inventory=DeviceInventory(data=[{'fqdn': 'leaf1', 'parentContainerName': 'LEAFS'}]))
+        assert missing == []
+        assert cv_client.api.calls['get_inventory'] == 1
+        assert cv_client.api.limiter is limiter
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import os
+import sys
+import time
+import threading
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from cvprac.cvp_client_errors import CvpApiError
+from ansible_collections.arista.cvp.plugins.module_utils.session_broker import CvSessionBroker, broker_idle_timeout, BROKER_ENV
+from lib.cv_client_stub import CvClientStub
+
+
+def start_broker(socket_dir, client, secret='ansible', idle_timeout=5):
+    broker = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret=secret, socket_dir=socket_dir, timeout=5)
+    thread = threading.Thread(target=broker.serve, kwargs={'client': client, 'idle_timeout': idle_timeout}, daemon=True)
+    thread.start()
+    for _ in range(50):
+        if os.path.exists(broker.path):
+            break
+        time.sleep(0.05)
+    return broker, thread
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvSessionBroker():
+
+    @pytest.mark.parametrize('value, expected', [(None, 0), ('300', 300), ('-1', 0), ('yes', 0)])
+    def test_broker_idle_timeout(self, monkeypatch, value, expected):
+        if value is None:
+            monkeypatch.delenv(BROKER_ENV, raising=False)
+        else:
+            monkeypatch.setenv(BROKER_ENV, value)
+        assert broker_idle_timeout() == expected
+
+    def test_no_broker(self, tmp_path):
+        broker = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path))
+        assert broker.connect() is None
+
+    def test_stale_socket_removed(self, tmp_path):
+        broker = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path))
+        with open(broker.path, 'w') as stale:
+            stale.write('')
+        assert broker.connect() is None
+        assert not os.path.exists(broker.path)
+
+    def test_api_calls(self, tmp_path):
+        cv_client = CvClientStub()
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        client = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path)).connect()
+        assert client.nodes == ['cvp.lab']
+        assert client.api.get_configlet_by_name(name='LEAF1')['key'] == 'configlet_leaf1'
+        assert client.api.get_configlet_by_name('LEAF1')['key'] == 'configlet_leaf1'
+        assert cv_client.api.calls['get_configlet_by_name'] == 2
+        assert oct(os.stat(str(tmp_path)).st_mode & 0o777) == oct(0o700)
+
+    def test_api_errors(self, tmp_path):
+        def unauthorized(**kwargs):
+            raise CvpApiError('Unauthorized User')
+        cv_client = CvClientStub()
+        cv_client.api.get_configlet_by_name = unauthorized
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        client = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path)).connect()
+        with pytest.raises(CvpApiError, match='Unauthorized User'):
+            client.api.get_configlet_by_name(name='LEAF1')
+        with pytest.raises(TypeError):
+            client.api.get_container_by_id(unknown='unknown')
+        with pytest.raises(AttributeError):
+            client.api.unknown_method()
+
+    def test_topology_staging(self, tmp_path):
+        cv_client = CvClientStub()
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        client = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path)).connect()
+        client.api._add_temp_action({'data': [{'action': 'add', 'nodeName': 'POD1', 'toName': 'DC1'}]})
+        assert client.api._save_topology_v2([])['data']['status'] == 'success'
+        assert 'POD1' in [x['name'] for x in cv_client.api.containers]
+        with pytest.raises(AttributeError):
+            client.api._container_op()
+
+    @pytest.mark.parametrize('secret', [None, ''])
+    def test_no_secret(self, tmp_path, secret):
+        with pytest.raises(ValueError):
+            CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret=secret, socket_dir=str(tmp_path))
+
+    def test_result_not_serializable(self, tmp_path):
+        cv_client = CvClientStub()
+        cv_client.api.get_configlet_by_name = lambda name: {'key': object()}
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        client = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path)).connect()
+        with pytest.raises(CvpApiError, match='cannot be serialized'):
+            client.api.get_configlet_by_name(name='LEAF1')
+
+    def test_calls_serialized(self, tmp_path):
+        cv_client = CvClientStub()
+        get_configlet_by_name = cv_client.api.get_configlet_by_name
+        state = {'running': 0, 'concurrent': 0}
+        lock = threading.Lock()
+
+        def slow_get_configlet_by_name(name):
+            with lock:
+                state['running'] += 1
+                state['concurrent'] = max(state['concurrent'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+            return get_configlet_by_name(name=name)
+        cv_client.api.get_configlet_by_name = slow_get_configlet_by_name
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        client = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='ansible', socket_dir=str(tmp_path)).connect()
+        threads = [threading.Thread(target=client.api.get_configlet_by_name, kwargs={'name': 'LEAF1'}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cv_client.api.calls['get_configlet_by_name'] == 4
+        assert state['concurrent'] == 1
+
+    def test_wrong_credentials(self, tmp_path):
+        cv_client = CvClientStub()
+        start_broker(socket_dir=str(tmp_path), client=cv_client)
+        broker = CvSessionBroker(host='cvp.lab', port=443, user='ansible', secret='wrong', socket_dir=str(tmp_path))
+        assert broker.connect() is None
+        assert os.path.exists(broker.path)
+
+    def test_idle_timeout(self, tmp_path):
+        broker, thread = start_broker(socket_dir=str(tmp_path), client=CvClientStub(), idle_timeout=1)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert not os.path.exists(broker.path)
+
+    def test_fallback(self, tmp_path):
+        broker, thread = start_broker(socket_dir=str(tmp_path), client=CvClientStub(), idle_timeout=1)
+        direct = CvClientStub()
+        client = broker.connect(fallback=lambda: direct)
+        thread.join(timeout=5)
+        assert client.api.get_configlet_by_name(name='LEAF1')['key'] == 'configlet_leaf1'
+        assert direct.api.calls['get_configlet_by_name'] == 1
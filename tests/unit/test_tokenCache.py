@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# pylint:disable=duplicate-code
+# flake8: noqa: W503
+# flake8: noqa: W1202
+# flake8: noqa: R0801
+
+from __future__ import (absolute_import, division, print_function)
+import os
+import sys
+import json
+import pytest
+from requests.cookies import cookiejar_from_dict
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from cvprac.cvp_client import CvpClient
+from cvprac.cvp_client_errors import CvpApiError
+from ansible_collections.arista.cvp.plugins.module_utils.token_cache import CvTokenCache, TOKEN_CACHE_ENV, TOKEN_CACHE_TTL_ENV
+
+
+def login_client(session_id='session-1', fail=False):
+    """
+    Build a CvpClient with a fake login setting session cookie and header
+    """
+    client = CvpClient()
+    client.logins = 0
+
+    def login():
+        client.logins += 1
+        if fail:
+            raise CvpApiError('Unauthorized')
+        client.cookies = cookiejar_from_dict({'session_id': '{0}-{1}'.format(session_id, client.logins)})
+        client.headers['APP_SESSION_ID'] = '{0}-{1}'.format(session_id, client.logins)
+    client._login = login
+    return client
+
+
+def build_cache(tmp_path, secret='ansible', ttl=3600):
+    return CvTokenCache(cache_dir=str(tmp_path / 'tokens'), host='cvp.lab', port=443, user='ansible', secret=secret, ttl=ttl)
+
+
+def connect(client):
+    client.connect(nodes=['cvp.lab'], username='ansible', password='ansible')
+    return client
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvTokenCache():
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(TOKEN_CACHE_ENV, raising=False)
+        assert CvTokenCache.from_env(host='cvp.lab', port=443, user='ansible', secret='ansible') is None
+        monkeypatch.setenv(TOKEN_CACHE_ENV, str(tmp_path))
+        monkeypatch.setenv(TOKEN_CACHE_TTL_ENV, '60')
+        cache = CvTokenCache.from_env(host='cvp.lab', port=443, user='ansible', secret='ansible')
+        assert os.path.dirname(cache.path) == str(tmp_path)
+
+    def test_login_saved(self, tmp_path):
+        cache = build_cache(tmp_path)
+        client = login_client()
+        cache.attach(client)
+        connect(client)
+        assert client.logins == 1
+        assert not cache.restored
+        assert oct(os.stat(cache.path).st_mode & 0o777) == oct(0o600)
+        assert oct(os.stat(str(tmp_path / 'tokens')).st_mode & 0o777) == oct(0o700)
+        with open(cache.path, 'r', encoding='utf-8') as cache_file:
+            data = json.load(cache_file)
+        assert data['cookies'] == {'session_id': 'session-1-1'}
+        assert data['headers'] == {'APP_SESSION_ID': 'session-1-1'}
+        assert 'ansible' not in json.dumps(data)
+
+    def test_session_restored(self, tmp_path):
+        first = login_client()
+        build_cache(tmp_path).attach(first)
+        connect(first)
+        cache = build_cache(tmp_path)
+        client = login_client()
+        cache.attach(client)
+        connect(client)
+        assert client.logins == 0
+        assert cache.restored
+        assert client.cookies.get('session_id') == 'session-1-1'
+        assert client.headers['APP_SESSION_ID'] == 'session-1-1'
+
+    def test_relogin_after_unauthorized(self, tmp_path):
+        first = login_client()
+        build_cache(tmp_path).attach(first)
+        connect(first)
+        client = login_client(session_id='session-2')
+        build_cache(tmp_path).attach(client)
+        connect(client)
+        # cvprac calls _login again when Cloudvision rejects the session
+        client._login()
+        assert client.logins == 1
+        assert build_cache(tmp_path).load()['headers'] == {'APP_SESSION_ID': 'session-2-1'}
+
+    @pytest.mark.parametrize('secret, ttl', [('changed', 3600), ('ansible', -1)])
+    def test_session_not_reused(self, tmp_path, secret, ttl):
+        first = login_client()
+        build_cache(tmp_path, ttl=ttl).attach(first)
+        connect(first)
+        cache = build_cache(tmp_path, secret=secret)
+        assert cache.load() is None
+        client = login_client()
+        cache.attach(client)
+        connect(client)
+        assert client.logins == 1
+        assert not cache.restored
+
+    def test_failed_login_removes_cache(self, tmp_path):
+        first = login_client()
+        build_cache(tmp_path).attach(first)
+        connect(first)
+        client = login_client(fail=True)
+        cache = build_cache(tmp_path)
+        cache.attach(client)
+        connect(client)
+        with pytest.raises(CvpApiError):
+            client._login()
+        assert not os.path.exists(cache.path)
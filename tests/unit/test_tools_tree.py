@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import json
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils import tools_tree
+
+
+CONTAINERS_DICT = {
+    'MLAG02': {'parent_container': 'Leaves'},
+    'Spines': {'parent_container': 'Fabric'},
+    'MLAG01': {'parent_container': 'Leaves'},
+    'Leaves': {'parent_container': 'Fabric'},
+    'Fabric': {'parent_container': 'Tenant'},
+}
+
+CONTAINERS_LIST = [
+    {'key': 'container_mlag02', 'name': 'MLAG02', 'parentName': 'Leaves'},
+    {'key': 'root', 'name': 'Tenant', 'parentName': None},
+    {'key': 'container_spines', 'name': 'Spines', 'parentName': 'Fabric'},
+    {'key': 'container_mlag01', 'name': 'MLAG01', 'parentName': 'Leaves'},
+    {'key': 'container_leaves', 'name': 'Leaves', 'parentName': 'Fabric'},
+    {'key': 'container_fabric', 'name': 'Fabric', 'parentName': 'Tenant'},
+]
+
+EXPECTED_TREE = {"Tenant": {"children": [{"Fabric": {"children": [{"Leaves": {"children": ["MLAG01", "MLAG02"]}}, "Spines"]}}]}}
+
+EXPECTED_LIST = ['Tenant', 'Fabric', 'Leaves', 'MLAG01', 'MLAG02', 'Spines']
+
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestToolsTree():
+
+    def test_tree_build_from_dict(self):
+        assert json.loads(tools_tree.tree_build_from_dict(containers=CONTAINERS_DICT)) == EXPECTED_TREE
+
+    def test_tree_build_from_list(self):
+        assert json.loads(tools_tree.tree_build_from_list(containers=CONTAINERS_LIST)) == EXPECTED_TREE
+
+    def test_tree_build_relative_root(self):
+        containers = {name: data for name, data in CONTAINERS_DICT.items() if name in ['Leaves', 'MLAG01', 'MLAG02']}
+        tree = tools_tree.tree_build_from_dict(containers=containers, root='Leaves')
+        assert json.loads(tree) == {"Leaves": {"children": ["MLAG01", "MLAG02"]}}
+
+    @pytest.mark.parametrize('containers', [
+        {'Fabric': {'parent_container': 'Tenant'}, 'Orphan': {'parent_container': 'Missing'}},
+        {'Fabric': {'parent_container': 'Tenant'}, 'Loop1': {'parent_container': 'Loop2'}, 'Loop2': {'parent_container': 'Loop1'}},
+    ])
+    def test_tree_build_orphans(self, containers):
+        with pytest.raises(ValueError):
+            tools_tree.tree_build_from_dict(containers=containers)
+
+    @pytest.mark.parametrize('json_data', [EXPECTED_TREE, json.dumps(EXPECTED_TREE)])
+    def test_tree_to_list(self, json_data):
+        assert tools_tree.tree_to_list(json_data=json_data, myList=list()) == EXPECTED_LIST
+
+    def test_tree_to_list_root_only(self):
+        tree = tools_tree.tree_build_from_dict(containers=dict())
+        assert tools_tree.tree_to_list(json_data=tree, myList=list()) == ['Tenant']
+
+    def test_tree_to_list_large(self):
+        containers = {'CNT-{}'.format(x): {'parent_container': 'CNT-{}'.format(x // 4) if x > 0 else 'Tenant'} for x in range(3000)}
+        ordered_list = tools_tree.tree_to_list(json_data=tools_tree.tree_build_from_dict(containers=containers), myList=list())
+        assert len(ordered_list) == 3001
+        assert ordered_list.index('CNT-0') < ordered_list.index('CNT-1') < ordered_list.index('CNT-4')